@@ -0,0 +1,33 @@
+"""
+Optional Numba JIT support.
+
+Numerical kernels decorate themselves with ``njit`` from this module. When
+Numba is installed they are compiled to machine code; otherwise the decorator
+is a no-op and the kernels run as plain Python.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.debug("Numba not available. JIT kernels will run as plain Python.")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        No-op stand-in for ``numba.njit``
+
+        Supports both the bare ``@njit`` and the ``@njit(cache=True, ...)`` forms.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+    prange = range
@@ -0,0 +1,452 @@
+"""
+Numba kernels for the recursive technical indicators.
+
+Each kernel takes plain float arrays and makes a single pass over them, and
+releases the GIL so independent indicators can run on worker threads.
+Without Numba installed they run as plain Python (see ``src.trading._numba``).
+"""
+
+import numpy as np
+
+from src.trading._numba import njit
+
+
+@njit(cache=True, nogil=True)
+def _ema_nb(x, length):
+    """
+    Exponential moving average seeded with the SMA of the first ``length``
+    values, as in pandas-ta. Leading NaNs in ``x`` are skipped.
+    
+    Returns:
+        Array like ``x``; NaN until the seed window is complete
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    
+    start = 0
+    while start < n and np.isnan(x[start]):
+        start += 1
+    seed_end = start + length
+    if length <= 0 or seed_end > n:
+        return out
+    
+    out[seed_end - 1] = np.mean(x[start:seed_end])
+    alpha = 2.0 / (length + 1)
+    for i in range(seed_end, n):
+        out[i] = alpha * x[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rma_averages_nb(x, period):
+    """
+    Wilder's moving average (RMA) of the gains and of the losses of the
+    bar-to-bar changes of ``x``, as pandas-ta's ``rma``: pandas' adjusted
+    ``ewm(alpha=1/period)`` over every change so far.
+    
+    Returns:
+        Tuple of (avg_gain, avg_loss) arrays; NaN before index ``period``
+    """
+    n = x.shape[0]
+    avg_gain = np.full(n, np.nan)
+    avg_loss = np.full(n, np.nan)
+    if period <= 0 or n <= period:
+        return avg_gain, avg_loss
+    
+    decay = 1.0 - 1.0 / period
+    weight = 0.0
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, n):
+        delta = x[i] - x[i - 1]
+        # Normalized update of the weighted mean; weight is the sum of the weights
+        weight = 1.0 + decay * weight
+        gain += ((delta if delta > 0 else 0.0) - gain) / weight
+        loss += ((-delta if delta < 0 else 0.0) - loss) / weight
+        if i >= period:
+            avg_gain[i] = gain
+            avg_loss[i] = loss
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, nogil=True)
+def _rsi_rma_nb(x, period):
+    """
+    Relative Strength Index from RMA-smoothed gains and losses, as pandas-ta's ``rsi``.
+    
+    Returns:
+        Array like ``x``; NaN before index ``period``, 50 on a flat window
+    """
+    avg_gain, avg_loss = _rma_averages_nb(x, period)
+    out = np.full(x.shape[0], np.nan)
+    for i in range(period, x.shape[0]):
+        total = avg_gain[i] + avg_loss[i]
+        out[i] = 100.0 * avg_gain[i] / total if total > 0 else 50.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _macd_nb(x, fast, slow, signal):
+    """
+    MACD line, signal line and histogram, with SMA-seeded EMAs as in pandas-ta.
+    
+    Returns:
+        Tuple of (macd, signal, histogram) arrays like ``x``
+    """
+    macd = _ema_nb(x, fast) - _ema_nb(x, slow)
+    signal_line = _ema_nb(macd, signal)
+    return macd, signal_line, macd - signal_line
+
+
+@njit(cache=True, nogil=True)
+def _adx_atr_nb(high, low, close, period):
+    """
+    Average True Range and the Directional Movement System in one pass, as
+    pandas-ta's ``atr`` and ``adx``: the true range and directional movements
+    from the second bar on, and then DX, are each smoothed with pandas-ta's
+    ``rma`` (pandas' adjusted ``ewm(alpha=1/period)``).
+    
+    Returns:
+        Tuple of (atr, plus_di, minus_di, adx) arrays; ATR and the DIs are NaN
+        before index ``period``, ADX before index ``2 * period - 1``. As in
+        pandas-ta, the DIs are NaN while the ATR is zero, and a bar without
+        directional movement has no DX but still ages the earlier ones.
+    """
+    n = close.shape[0]
+    atr = np.full(n, np.nan)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+    if period <= 0 or n <= period:
+        return atr, plus_di, minus_di, adx
+    
+    decay = 1.0 - 1.0 / period
+    weight = 0.0
+    smoothed_tr = 0.0
+    smoothed_plus = 0.0
+    smoothed_minus = 0.0
+    dx_weight = 0.0
+    dx_mean = 0.0
+    dx_seen = 0
+    for i in range(1, n):
+        # True range and directional movement of this bar
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        
+        # Normalized updates of the weighted means; weight is the sum of the weights
+        weight = 1.0 + decay * weight
+        smoothed_tr += (tr - smoothed_tr) / weight
+        smoothed_plus += (plus_dm - smoothed_plus) / weight
+        smoothed_minus += (minus_dm - smoothed_minus) / weight
+        if i < period:
+            continue
+        
+        atr[i] = smoothed_tr
+        if smoothed_tr > 0:
+            plus_di[i] = 100.0 * smoothed_plus / smoothed_tr
+            minus_di[i] = 100.0 * smoothed_minus / smoothed_tr
+        
+        # ADX: the same average over DX, from the first bar that has one
+        di_sum = plus_di[i] + minus_di[i]
+        if di_sum > 0:
+            dx = 100.0 * abs(plus_di[i] - minus_di[i]) / di_sum
+            dx_weight = 1.0 + decay * dx_weight
+            dx_mean += (dx - dx_mean) / dx_weight
+            dx_seen += 1
+        else:
+            dx_weight *= decay
+        if dx_seen >= period:
+            adx[i] = dx_mean
+    return atr, plus_di, minus_di, adx
+
+
+@njit(cache=True, nogil=True)
+def _ema_multi_nb(x, lengths):
+    """
+    Several SMA-seeded EMAs of ``x`` in one pass, one lane per length, so each
+    value of ``x`` is loaded once for all of them. Each lane matches ``_ema_nb``.
+    
+    Returns:
+        Array of shape (len(lengths), len(x)); NaN until each seed window is complete
+    """
+    n = x.shape[0]
+    k = lengths.shape[0]
+    out = np.full((k, n), np.nan)
+    
+    start = 0
+    while start < n and np.isnan(x[start]):
+        start += 1
+    
+    alphas = np.empty(k)
+    sums = np.zeros(k)
+    for j in range(k):
+        alphas[j] = 2.0 / (lengths[j] + 1)
+    
+    for i in range(start, n):
+        xi = x[i]
+        seen = i - start + 1
+        for j in range(k):
+            length = lengths[j]
+            if length <= 0:
+                continue
+            if seen < length:
+                sums[j] += xi
+            elif seen == length:
+                out[j, i] = (sums[j] + xi) / length
+            else:
+                out[j, i] = alphas[j] * xi + (1.0 - alphas[j]) * out[j, i - 1]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _macd_rsi_nb(x, fast, slow, signal, rsi_period):
+    """
+    MACD and RSI in one pass over ``x``. The MACD lines match
+    ``_macd_nb`` and the RSI matches ``_rsi_rma_nb``, without allocating the
+    intermediate EMA and average gain/loss arrays.
+    
+    Returns:
+        Tuple of (rsi, macd, signal, histogram) arrays like ``x``
+    """
+    n = x.shape[0]
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    signal_line = np.full(n, np.nan)
+    hist = np.full(n, np.nan)
+    if fast <= 0 or slow <= 0 or signal <= 0 or rsi_period <= 0:
+        return rsi, macd, signal_line, hist
+    
+    start = 0
+    while start < n and np.isnan(x[start]):
+        start += 1
+    
+    a_fast = 2.0 / (fast + 1)
+    a_slow = 2.0 / (slow + 1)
+    a_signal = 2.0 / (signal + 1)
+    fast_sum = 0.0
+    slow_sum = 0.0
+    signal_sum = 0.0
+    fast_ema = np.nan
+    slow_ema = np.nan
+    signal_ema = np.nan
+    rsi_decay = 1.0 - 1.0 / rsi_period
+    rsi_weight = 0.0
+    gain = 0.0
+    loss = 0.0
+    macd_seen = 0
+    for i in range(start, n):
+        xi = x[i]
+        seen = i - start + 1
+        
+        # SMA-seeded fast and slow EMAs
+        if seen < fast:
+            fast_sum += xi
+        elif seen == fast:
+            fast_ema = (fast_sum + xi) / fast
+        else:
+            fast_ema = a_fast * xi + (1.0 - a_fast) * fast_ema
+        if seen < slow:
+            slow_sum += xi
+        elif seen == slow:
+            slow_ema = (slow_sum + xi) / slow
+        else:
+            slow_ema = a_slow * xi + (1.0 - a_slow) * slow_ema
+        
+        # MACD line, then its SMA-seeded signal EMA from the first valid value
+        if seen >= fast and seen >= slow:
+            m = fast_ema - slow_ema
+            macd[i] = m
+            macd_seen += 1
+            if macd_seen < signal:
+                signal_sum += m
+            elif macd_seen == signal:
+                signal_ema = (signal_sum + m) / signal
+            else:
+                signal_ema = a_signal * m + (1.0 - a_signal) * signal_ema
+            if macd_seen >= signal:
+                signal_line[i] = signal_ema
+                hist[i] = m - signal_ema
+        
+        # RMA-smoothed gains and losses
+        if seen == 1:
+            continue
+        delta = xi - x[i - 1]
+        rsi_weight = 1.0 + rsi_decay * rsi_weight
+        gain += ((delta if delta > 0 else 0.0) - gain) / rsi_weight
+        loss += ((-delta if delta < 0 else 0.0) - loss) / rsi_weight
+        if seen <= rsi_period:
+            continue
+        total = gain + loss
+        rsi[i] = 100.0 * gain / total if total > 0 else 50.0
+    return rsi, macd, signal_line, hist
+
+
+@njit(cache=True, nogil=True)
+def _ewm_mean_nb(x, span):
+    """
+    Adjusted exponentially weighted mean, as pandas ``ewm(span=span).mean()``:
+    every value so far weighted by ``(1 - alpha) ** age`` and normalized by the
+    sum of the weights. NaNs are skipped but still age the earlier values.
+    The sums are kept in float64 whatever the dtype of ``x``.
+    
+    Returns:
+        Array of the dtype of ``x``; NaN until the first non-NaN value
+    """
+    n = x.shape[0]
+    out = np.empty_like(x)
+    out[:] = np.nan
+    decay = 1.0 - 2.0 / (span + 1)
+    num = 0.0
+    den = 0.0
+    for i in range(n):
+        num *= decay
+        den *= decay
+        if not np.isnan(x[i]):
+            num += x[i]
+            den += 1.0
+        if den > 0:
+            out[i] = num / den
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_nb(x, window):
+    """
+    Mean over a sliding window of ``window`` values, as pandas
+    ``rolling(window).mean()``: NaN while the window is incomplete or holds a NaN.
+    The running sum is kept in float64 whatever the dtype of ``x``.
+    
+    Returns:
+        Array of the dtype of ``x``
+    """
+    n = x.shape[0]
+    out = np.empty_like(x)
+    out[:] = np.nan
+    if window <= 0:
+        return out
+    
+    total = 0.0
+    nans = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nans += 1
+        else:
+            total += x[i]
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+        if i >= window - 1 and nans == 0:
+            out[i] = total / window
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _wilder_averages_nb(x, period):
+    """
+    Wilder-smoothed average gain and loss of the bar-to-bar changes of ``x``,
+    seeded with the simple average of the first ``period`` changes as in
+    Wilder's original definition.
+    
+    Returns:
+        Tuple of (avg_gain, avg_loss) arrays; NaN before index ``period``
+    """
+    n = x.shape[0]
+    avg_gain = np.full(n, np.nan)
+    avg_loss = np.full(n, np.nan)
+    if period <= 0 or n <= period:
+        return avg_gain, avg_loss
+    
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, period + 1):
+        delta = x[i] - x[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+    avg_gain[period] = gain / period
+    avg_loss[period] = loss / period
+    
+    for i in range(period + 1, n):
+        delta = x[i] - x[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain[i] = (avg_gain[i - 1] * (period - 1) + gain) / period
+        avg_loss[i] = (avg_loss[i - 1] * (period - 1) + loss) / period
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, nogil=True)
+def _rsi_wilder_nb(x, period):
+    """
+    Relative Strength Index with Wilder smoothing.
+    
+    Returns:
+        Array like ``x``; NaN before index ``period``, 50 on a flat window
+    """
+    avg_gain, avg_loss = _wilder_averages_nb(x, period)
+    out = np.full(x.shape[0], np.nan)
+    for i in range(period, x.shape[0]):
+        total = avg_gain[i] + avg_loss[i]
+        out[i] = 100.0 * avg_gain[i] / total if total > 0 else 50.0
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _ewm_macd_nb(x, fast, slow, signal):
+    """
+    MACD line, signal line and histogram from pandas' adjusted ewm means, in
+    one pass over ``x``: each element equals ``_ewm_mean_nb`` of ``x`` over
+    ``fast`` minus over ``slow``, and the signal line is ``_ewm_mean_nb`` of
+    that with span ``signal``. The six running sums stay in float64.
+    
+    Returns:
+        Tuple of (macd, signal, histogram) arrays of the dtype of ``x``
+    """
+    n = x.shape[0]
+    macd = np.empty_like(x)
+    signal_line = np.empty_like(x)
+    hist = np.empty_like(x)
+    macd[:] = np.nan
+    signal_line[:] = np.nan
+    hist[:] = np.nan
+    
+    d_fast = 1.0 - 2.0 / (fast + 1)
+    d_slow = 1.0 - 2.0 / (slow + 1)
+    d_signal = 1.0 - 2.0 / (signal + 1)
+    fast_num = 0.0
+    slow_num = 0.0
+    signal_num = 0.0
+    den_fast = 0.0
+    den_slow = 0.0
+    den_signal = 0.0
+    for i in range(n):
+        xi = x[i]
+        fast_num *= d_fast
+        slow_num *= d_slow
+        den_fast *= d_fast
+        den_slow *= d_slow
+        if not np.isnan(xi):
+            fast_num += xi
+            slow_num += xi
+            den_fast += 1.0
+            den_slow += 1.0
+        
+        # The MACD line has a value from the first non-NaN close on
+        signal_num *= d_signal
+        den_signal *= d_signal
+        if den_fast > 0:
+            m = fast_num / den_fast - slow_num / den_slow
+            macd[i] = m
+            signal_num += m
+            den_signal += 1.0
+            s = signal_num / den_signal
+            signal_line[i] = s
+            hist[i] = m - s
+    return macd, signal_line, hist
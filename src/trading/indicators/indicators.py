@@ -7,20 +7,541 @@ import pandas as pd
 import pandas_ta as ta
 import numpy as np
 import logging
-from typing import Dict, List, Tuple, Optional, Union
-from dataclasses import dataclass
+import atexit
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, field
+from numpy.lib.stride_tricks import sliding_window_view
 from src.config.config_loader import get_config
+from src.trading._numba import NUMBA_AVAILABLE
+from src.trading.indicators._kernels import _ema_nb, _ema_multi_nb, _rma_averages_nb, _rsi_rma_nb, _macd_nb, _adx_atr_nb
 
 logger = logging.getLogger(__name__)
 
+try:
+    from scipy.ndimage import convolve1d
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Shared empty values of ERROR results. Treat as immutable: never modify them in place
+_EMPTY_SERIES = pd.Series(dtype=np.float64)
+_EMPTY_DF = pd.DataFrame()
+
+# Numeric direction codes of indicator signals, for vectorized scoring
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_NEUTRAL = 0
+
+_SIGNAL_CODES = {'BUY': SIGNAL_BUY, 'SELL': SIGNAL_SELL}
+
+class _LazyValue:
+    """
+    Descriptor for ``IndicatorResult.value``: when no value was given, it is
+    built by ``value_fn`` on first access and kept, so results whose series is
+    never read never build it.
+    """
+    
+    def __set_name__(self, owner, name):
+        self._attr = '_' + name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None  # dataclass default
+        value = obj.__dict__.get(self._attr)
+        if value is None and obj.value_fn is not None:
+            value = obj.value_fn()
+            obj.__dict__[self._attr] = value
+            obj.value_fn = None
+        return value
+    
+    def __set__(self, obj, value):
+        obj.__dict__[self._attr] = value
+
 @dataclass
 class IndicatorResult:
     """Container for indicator calculation results"""
     name: str
-    value: Union[float, pd.Series]
+    value: Union[float, pd.Series] = _LazyValue()
     signal: Optional[str] = None
     strength: Optional[float] = None
     metadata: Optional[Dict] = None
+    value_fn: Optional[Callable[[], Union[pd.Series, pd.DataFrame]]] = field(default=None, repr=False, compare=False)
+    sig_code: int = field(default=SIGNAL_NEUTRAL, init=False)
+    
+    def __post_init__(self):
+        # Direction of the signal: SIGNAL_BUY, SIGNAL_SELL, or SIGNAL_NEUTRAL for any other
+        self.sig_code = _SIGNAL_CODES.get(self.signal, SIGNAL_NEUTRAL)
+    
+    def __getstate__(self):
+        # Materialize the value so results pickle without the builder closure
+        self.value
+        return self.__dict__
+
+@dataclass
+class _OHLCV:
+    """
+    OHLCV columns extracted once and shared by the indicators. Prices are float32:
+    signals only resolve a couple of significant digits, and the kernels
+    accumulate in float64 anyway, so results stay within ~1e-6 relative of a
+    float64 run at half the memory traffic. Volume stays float64 for the OBV sum.
+    """
+    close: Optional[np.ndarray]
+    high: Optional[np.ndarray]
+    low: Optional[np.ndarray]
+    volume: Optional[np.ndarray]
+    index: pd.Index
+    _series: Dict[str, pd.Series] = field(default_factory=dict, repr=False)
+    _adx_atr: Dict[int, Tuple[np.ndarray, ...]] = field(default_factory=dict, repr=False)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> '_OHLCV':
+        """Extract the columns of ``df``; missing columns are left as None"""
+        def column(name, dtype=np.float32):
+            return df[name].to_numpy(dtype=dtype) if name in df else None
+        
+        return cls(
+            close=column('close'),
+            high=column('high'),
+            low=column('low'),
+            volume=column('volume', np.float64),
+            index=df.index
+        )
+    
+    def series(self, name: str) -> pd.Series:
+        """Column as a pandas Series, built once, for indicators still computed by pandas-ta"""
+        if name not in self._series:
+            self._series[name] = pd.Series(getattr(self, name), index=self.index, name=name)
+        return self._series[name]
+    
+    def fingerprint(self) -> tuple:
+        """
+        Cheap identity of the data: length, last timestamp and last bar values.
+        Any new bar changes the last timestamp, and an update of the forming bar
+        changes its values, so a stale entry lives at most until the next bar.
+        """
+        if self.index.size == 0:
+            return (0,)
+        last = tuple(
+            float(col[-1]) if col is not None else None
+            for col in (self.close, self.high, self.low, self.volume)
+        )
+        return (self.index.size, self.index[-1]) + last
+    
+    def last_bar(self) -> Optional[tuple]:
+        """(timestamp, close, high, low, volume) of the last bar, or None if a column is missing"""
+        columns = (self.close, self.high, self.low, self.volume)
+        if self.index.size == 0 or any(col is None for col in columns):
+            return None
+        return (self.index[-1],) + tuple(float(col[-1]) for col in columns)
+    
+    def adx_atr(self, period: int) -> Tuple[np.ndarray, ...]:
+        """(atr, plus_di, minus_di, adx) arrays, computed once per period and shared by ATR and ADX"""
+        if period not in self._adx_atr:
+            self._adx_atr[period] = _adx_atr_nb(self.high, self.low, self.close, period)
+        return self._adx_atr[period]
+
+@dataclass
+class StreamingState:
+    """
+    Running indicator state after the last seen bar. ``advance`` moves every
+    indicator forward by one bar in O(1) with the same recurrences as the
+    kernels in ``_kernels``, so a live feed does not recompute the full history.
+    """
+    last_index: object
+    n_bars: int
+    prev_close: float
+    prev_high: float
+    prev_low: float
+    fingerprint: tuple
+    
+    # RSI (RMA of gains and losses, and the sum of their weights)
+    rsi_period: int
+    rsi_avg_gain: float
+    rsi_avg_loss: float
+    rsi_weight: float
+    
+    # MACD
+    macd_fast: int
+    macd_slow: int
+    macd_signal_period: int
+    ema_fast: float
+    ema_slow: float
+    macd_signal: float
+    macd_hist: float
+    macd_prev_hist: float
+    
+    # Trend EMAs by period
+    emas: Dict[int, float]
+    
+    # ATR, and the Directional Movement System for ADX, each an RMA with the
+    # sum of its weights
+    atr_period: int
+    atr: float
+    atr_weight: float
+    adx_period: int
+    adx_tr: float
+    adx_plus_dm: float
+    adx_minus_dm: float
+    adx_weight: float
+    adx: float
+    adx_dx_weight: float
+    
+    # Rolling windows
+    bb_period: int
+    bb_std_dev: float
+    bb_window: deque
+    stoch_k_period: int
+    stoch_d_period: int
+    stoch_highs: deque
+    stoch_lows: deque
+    stoch_fastk: deque
+    stoch_k: deque
+    volume_window: deque
+    obv: float
+    obv_window: deque
+    
+    @classmethod
+    def seed(cls, ohlcv: _OHLCV, rsi_period: int, macd_periods: Tuple[int, int, int],
+             ema_periods: Tuple[int, ...], atr_period: int, bb_period: int, bb_std_dev: float,
+             adx_period: int = 14, k_period: int = 14, d_period: int = 3) -> Optional['StreamingState']:
+        """
+        Build the state from a fully computed history
+        
+        Args:
+            ohlcv: Column arrays of the history
+            rsi_period: RSI period
+            macd_periods: MACD (fast, slow, signal) periods
+            ema_periods: Trend EMA periods
+            atr_period: ATR period
+            bb_period: Bollinger Bands period
+            bb_std_dev: Bollinger Bands standard deviation multiplier
+            adx_period: ADX period
+            k_period: Stochastic %K period
+            d_period: Stochastic %D (and %K smoothing) period
+        
+        Returns:
+            StreamingState, or None if the data is too short or incomplete for
+            every indicator to be warmed up
+        """
+        close, high, low, volume = ohlcv.close, ohlcv.high, ohlcv.low, ohlcv.volume
+        if close is None or high is None or low is None or volume is None:
+            return None
+        
+        n = close.size
+        fast, slow, signal = macd_periods
+        warmup = max(
+            rsi_period + 1, max(fast, slow) + signal - 1, max(ema_periods),
+            atr_period + 1, 2 * adx_period, bb_period, k_period + 2 * (d_period - 1), 20, 11
+        )
+        if n < warmup:
+            return None
+        
+        avg_gain, avg_loss = _rma_averages_nb(close, rsi_period)
+        ema_fast = _ema_nb(close, fast)
+        ema_slow = _ema_nb(close, slow)
+        macd_signal = _ema_nb(ema_fast - ema_slow, signal)
+        macd_hist = ema_fast - ema_slow - macd_signal
+        lanes = _ema_multi_nb(close, np.asarray(ema_periods, dtype=np.int64))
+        emas = {period: lanes[j, -1] for j, period in enumerate(ema_periods)}
+        atr = ohlcv.adx_atr(atr_period)[0]
+        adx_tr, plus_di, minus_di, adx = ohlcv.adx_atr(adx_period)
+        
+        fastk, smoothed_k = _stochastic_tail(high, low, close, k_period, d_period)
+        
+        # Weight sums of the RMAs: n - 1 changes and true ranges, and the bars with a DX
+        dx_ages = (n - 1) - np.flatnonzero(plus_di + minus_di > 0)
+        adx_decay = 1.0 - 1.0 / adx_period
+        
+        direction = np.sign(np.diff(close, prepend=np.nan))
+        direction[0] = 1.0
+        obv = np.cumsum(direction * volume)
+        
+        state = cls(
+            last_index=ohlcv.index[-1],
+            n_bars=n,
+            prev_close=float(close[-1]),
+            prev_high=float(high[-1]),
+            prev_low=float(low[-1]),
+            fingerprint=ohlcv.fingerprint(),
+            rsi_period=rsi_period,
+            rsi_avg_gain=avg_gain[-1],
+            rsi_avg_loss=avg_loss[-1],
+            rsi_weight=cls._rma_weight(n - 1, rsi_period),
+            macd_fast=fast,
+            macd_slow=slow,
+            macd_signal_period=signal,
+            ema_fast=ema_fast[-1],
+            ema_slow=ema_slow[-1],
+            macd_signal=macd_signal[-1],
+            macd_hist=macd_hist[-1],
+            macd_prev_hist=macd_hist[-2],
+            emas=emas,
+            atr_period=atr_period,
+            atr=atr[-1],
+            atr_weight=cls._rma_weight(n - 1, atr_period),
+            adx_period=adx_period,
+            adx_tr=adx_tr[-1],
+            # The kernel returns the DIs; recover the smoothed movements from them
+            adx_plus_dm=plus_di[-1] * adx_tr[-1] / 100.0,
+            adx_minus_dm=minus_di[-1] * adx_tr[-1] / 100.0,
+            adx_weight=cls._rma_weight(n - 1, adx_period),
+            adx=adx[-1],
+            adx_dx_weight=float(np.sum(adx_decay ** dx_ages)),
+            bb_period=bb_period,
+            bb_std_dev=bb_std_dev,
+            bb_window=deque(close[-bb_period:].tolist(), maxlen=bb_period),
+            stoch_k_period=k_period,
+            stoch_d_period=d_period,
+            stoch_highs=deque(high[-k_period:].tolist(), maxlen=k_period),
+            stoch_lows=deque(low[-k_period:].tolist(), maxlen=k_period),
+            stoch_fastk=deque(fastk[-d_period:].tolist(), maxlen=d_period),
+            stoch_k=deque(smoothed_k[-d_period:].tolist(), maxlen=d_period),
+            volume_window=deque(volume[-20:], maxlen=20),
+            obv=obv[-1],
+            obv_window=deque(obv[-11:], maxlen=11)
+        )
+        
+        seeds = (state.rsi_avg_gain, state.rsi_avg_loss, state.macd_signal, state.atr,
+                 state.adx_plus_dm, state.adx_minus_dm, state.adx, state.obv)
+        if not np.all(np.isfinite(seeds + tuple(emas.values()))):
+            return None
+        return state
+    
+    def advance(self, high: float, low: float, close: float, volume: float, timestamp=None):
+        """Move every indicator forward by one bar"""
+        prev_close = self.prev_close
+        
+        # RSI
+        delta = close - prev_close
+        self.rsi_weight = self._rma_weight_step(self.rsi_weight, self.rsi_period)
+        self.rsi_avg_gain += ((delta if delta > 0 else 0.0) - self.rsi_avg_gain) / self.rsi_weight
+        self.rsi_avg_loss += ((-delta if delta < 0 else 0.0) - self.rsi_avg_loss) / self.rsi_weight
+        
+        # MACD and trend EMAs
+        self.ema_fast = self._ema_step(self.ema_fast, close, self.macd_fast)
+        self.ema_slow = self._ema_step(self.ema_slow, close, self.macd_slow)
+        macd = self.ema_fast - self.ema_slow
+        self.macd_signal = self._ema_step(self.macd_signal, macd, self.macd_signal_period)
+        self.macd_prev_hist = self.macd_hist
+        self.macd_hist = macd - self.macd_signal
+        for ema_period, value in self.emas.items():
+            self.emas[ema_period] = self._ema_step(value, close, ema_period)
+        
+        # ATR and directional movement
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        
+        self.atr_weight = self._rma_weight_step(self.atr_weight, self.atr_period)
+        self.atr += (tr - self.atr) / self.atr_weight
+        self.adx_weight = self._rma_weight_step(self.adx_weight, self.adx_period)
+        self.adx_tr += (tr - self.adx_tr) / self.adx_weight
+        self.adx_plus_dm += (plus_dm - self.adx_plus_dm) / self.adx_weight
+        self.adx_minus_dm += (minus_dm - self.adx_minus_dm) / self.adx_weight
+        plus_di, minus_di = self.directional_indices()
+        di_sum = plus_di + minus_di
+        if di_sum > 0:
+            dx = 100.0 * abs(plus_di - minus_di) / di_sum
+            self.adx_dx_weight = self._rma_weight_step(self.adx_dx_weight, self.adx_period)
+            self.adx += (dx - self.adx) / self.adx_dx_weight
+        else:
+            # No DX for this bar; it still ages the earlier ones
+            self.adx_dx_weight *= 1.0 - 1.0 / self.adx_period
+        
+        # Rolling windows
+        self.bb_window.append(close)
+        self.stoch_highs.append(high)
+        self.stoch_lows.append(low)
+        price_range = max(self.stoch_highs) - min(self.stoch_lows)
+        self.stoch_fastk.append(100 * (close - min(self.stoch_lows)) / price_range if price_range > 0 else np.nan)
+        self.stoch_k.append(np.mean(self.stoch_fastk))
+        self.volume_window.append(volume)
+        self.obv += np.sign(delta) * volume
+        self.obv_window.append(self.obv)
+        
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        self.last_index = timestamp
+        self.n_bars += 1
+    
+    def last_bar(self) -> tuple:
+        """(timestamp, close, high, low, volume) of the last seen bar"""
+        return self.last_index, self.prev_close, self.prev_high, self.prev_low, self.volume_window[-1]
+    
+    def rsi(self) -> float:
+        """Current RSI"""
+        total = self.rsi_avg_gain + self.rsi_avg_loss
+        return 100.0 * self.rsi_avg_gain / total if total > 0 else 50.0
+    
+    def directional_indices(self) -> Tuple[float, float]:
+        """Current +DI and -DI"""
+        if self.adx_tr > 0:
+            return 100.0 * self.adx_plus_dm / self.adx_tr, 100.0 * self.adx_minus_dm / self.adx_tr
+        return np.nan, np.nan
+    
+    @staticmethod
+    def _ema_step(prev: float, value: float, length: int) -> float:
+        alpha = 2.0 / (length + 1)
+        return alpha * value + (1.0 - alpha) * prev
+    
+    @staticmethod
+    def _rma_weight(count: int, period: int) -> float:
+        """Sum of the weights of an RMA over ``count`` values"""
+        decay = 1.0 - 1.0 / period
+        return (1.0 - decay ** count) / (1.0 - decay)
+    
+    @staticmethod
+    def _rma_weight_step(weight: float, period: int) -> float:
+        """Weight sum of an RMA after one more value"""
+        return 1.0 + (1.0 - 1.0 / period) * weight
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` values from a cumulative sum; NaN until the window fills"""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        csum = np.cumsum(values)
+        out[window - 1] = csum[window - 1]
+        out[window:] = csum[window:] - csum[:-window]
+        out[window - 1:] /= window
+    return out
+
+@functools.lru_cache(maxsize=None)
+def _ema_weights(period: int) -> np.ndarray:
+    """Exponential decay weights of an EMA, newest bar first, truncated at 4 periods and normalized"""
+    alpha = 2.0 / (period + 1)
+    weights = alpha * (1.0 - alpha) ** np.arange(4 * period)
+    return weights / weights.sum()
+
+def _trend_emas(close: np.ndarray, periods: List[int]) -> List[np.ndarray]:
+    """
+    EMAs for the trend signals, one array per period. With Numba all periods run
+    as lanes of one exact kernel pass over ``close``. As plain Python that kernel
+    is a slow loop, so without Numba a SciPy convolution with the truncated decay
+    weights is used instead (seeded from the first close rather than an SMA,
+    which is irrelevant to the signal once past the warmup).
+    """
+    if NUMBA_AVAILABLE:
+        return list(_ema_multi_nb(close, np.asarray(periods, dtype=np.int64)))
+    if not SCIPY_AVAILABLE:
+        return [_ema_nb(close, period) for period in periods]
+    
+    emas = []
+    for period in periods:
+        weights = _ema_weights(period)
+        out = convolve1d(close, weights, output=np.float64, mode='nearest', origin=-(weights.size // 2))
+        out[:period - 1] = np.nan
+        emas.append(out)
+    return emas
+
+# Worker threads shared by every TechnicalIndicators in the process, created on
+# first use and shut down at interpreter exit
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """Shared executor for the independent indicators of a comprehensive analysis"""
+    global _thread_pool
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                              thread_name_prefix='indicators')
+            atexit.register(_thread_pool.shutdown, wait=False)
+        return _thread_pool
+
+def _rsi_ewm(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI through pandas' C-level ``ewm`` for when the kernel would run as plain
+    Python: the same adjusted ``ewm(alpha=1/period)`` of gains and losses as
+    ``_rsi_rma_nb`` and pandas-ta.
+    """
+    out = np.full(close.shape[0], np.nan)
+    if close.shape[0] <= period:
+        return out
+    
+    delta = np.diff(close.astype(np.float64))
+    moves = pd.DataFrame({'gain': np.maximum(delta, 0.0), 'loss': np.maximum(-delta, 0.0)})
+    averages = moves.ewm(alpha=1.0 / period).mean().to_numpy()[period - 1:]
+    avg_gain, avg_loss = averages[:, 0], averages[:, 1]
+    
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[period:] = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    return out
+
+def _stochastic_tail(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     k_period: int, d_period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Raw and smoothed %K over just the bars the latest %D depends on, from
+    sliding-window highs and lows. %K is smoothed over ``d_period`` bars, as the
+    pandas-ta columns read by the indicator assume.
+    
+    Returns:
+        Tuple of (raw %K, smoothed %K) arrays of ``2 * d_period - 1`` and
+        ``d_period`` values; NaN where the window has no range
+    """
+    span = k_period + 2 * (d_period - 1)
+    highest = sliding_window_view(high[-span:], k_period).max(axis=1).astype(np.float64)
+    lowest = sliding_window_view(low[-span:], k_period).min(axis=1).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fastk = 100 * (close[-span:][k_period - 1:] - lowest) / (highest - lowest)
+    return fastk, sliding_window_view(fastk, d_period).mean(axis=1)
+
+# Per-process instance reused across the tasks of a batch_analysis worker
+_worker_indicators = None
+
+def _init_worker(config):
+    """Pool initializer for TechnicalIndicators.batch_analysis"""
+    global _worker_indicators
+    _worker_indicators = TechnicalIndicators(config)
+
+def _analyze_one(task: tuple) -> Tuple[str, Dict[str, IndicatorResult]]:
+    """Worker for TechnicalIndicators.batch_analysis: analyze one (symbol, df, required) task"""
+    symbol, df, required = task
+    return symbol, _worker_indicators.get_comprehensive_analysis(df, required)
+
+# pandas-ta output column names, built once per parameter set
+@functools.lru_cache(maxsize=64)
+def _macd_cols(fast: int, slow: int, signal: int) -> Tuple[str, str, str]:
+    """(MACD, histogram, signal) column names"""
+    suffix = f'{fast}_{slow}_{signal}'
+    return f'MACD_{suffix}', f'MACDh_{suffix}', f'MACDs_{suffix}'
+
+@functools.lru_cache(maxsize=64)
+def _adx_cols(period: int) -> Tuple[str, str, str]:
+    """(ADX, +DI, -DI) column names"""
+    return f'ADX_{period}', f'DMP_{period}', f'DMN_{period}'
+
+def _memoized(method):
+    """
+    Cache an indicator's result keyed by (indicator, data fingerprint, arguments)
+    so repeated analysis of unchanged data skips recomputation. ERROR and empty
+    results are not cached.
+    """
+    @functools.wraps(method)
+    def wrapper(self, ohlcv, *args, **kwargs):
+        params = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+        key = (method.__name__, ohlcv.fingerprint(), params, tuple(sorted(kwargs.items())))
+        cache = self._result_cache
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        
+        result = method(self, ohlcv, *args, **kwargs)
+        if result and getattr(result, 'signal', None) != 'ERROR':
+            with self._cache_lock:
+                cache[key] = result
+                if len(cache) > self.cache_max:
+                    cache.popitem(last=False)
+        return result
+    return wrapper
 
 class TechnicalIndicators:
     """
@@ -28,10 +549,34 @@ class TechnicalIndicators:
     Supports multiple timeframes and advanced calculations
     """
     
+    # pandas-ta functions still in use, bound once instead of looked up per call
+    _bbands = staticmethod(ta.bbands)
+    _stoch = staticmethod(ta.stoch)
+    
     def __init__(self, config=None):
         self.config = config or get_config()
         self.indicator_config = self.config.indicators
+        self._snapshot_config()
         
+        # LRU cache of indicator results (see _memoized)
+        self._result_cache = OrderedDict()
+        self.cache_max = 256
+        self._cache_lock = threading.Lock()
+        
+        # The independent indicators of a comprehensive analysis run on the shared
+        # thread pool; below parallel_min_bars the handoff costs more than it saves
+        self.parallel_min_bars = 500
+        
+        # Composite signal weights, in a fixed order for the vectorized score
+        self._composite_names = ('RSI', 'MACD', 'BB', 'STOCH', 'EMA_21', 'EMA_50', 'VOLUME')
+        self._composite_weights = np.array([0.2, 0.25, 0.15, 0.15, 0.1, 0.1, 0.05], dtype=np.float64)
+        
+        # Indicator state after the last analyzed bar, for one-bar incremental updates.
+        # It is seeded from the data of the last full analysis only when the first
+        # incremental bar arrives, so callers that never stream don't pay for it
+        self._stream: Optional[StreamingState] = None
+        self._stream_source: Optional[_OHLCV] = None
+    
     def calculate_rsi(self, df: pd.DataFrame, period: int = None) -> IndicatorResult:
         """
         Calculate RSI with signal generation
@@ -39,45 +584,59 @@ class TechnicalIndicators:
         Args:
             df: DataFrame with OHLCV data
             period: RSI period (default from config)
-            
+        
         Returns:
             IndicatorResult with RSI values and signals
         """
+        return self._calculate_rsi_arr(_OHLCV.from_frame(df), period)
+    
+    @_memoized
+    def _calculate_rsi_arr(self, ohlcv: _OHLCV, period: int = None) -> IndicatorResult:
+        """RSI from the shared column arrays"""
         try:
-            period = period or self.indicator_config.rsi_period
-            rsi = ta.rsi(df['close'], length=period)
+            period = period or self._rsi_p
+            close = ohlcv.close
+            if close.size < period:
+                return IndicatorResult(name='RSI', value=_EMPTY_SERIES, signal='ERROR')
             
-            current_rsi = rsi.iloc[-1] if not rsi.empty else 50
-            
-            # Generate signals
-            signal = None
-            strength = 0.5
-            
-            if current_rsi <= self.indicator_config.rsi_oversold:
-                signal = 'BUY'
-                strength = (self.indicator_config.rsi_oversold - current_rsi) / self.indicator_config.rsi_oversold
-            elif current_rsi >= self.indicator_config.rsi_overbought:
-                signal = 'SELL'
-                strength = (current_rsi - self.indicator_config.rsi_overbought) / (100 - self.indicator_config.rsi_overbought)
-            else:
-                signal = 'NEUTRAL'
-                
-            return IndicatorResult(
-                name='RSI',
-                value=rsi,
-                signal=signal,
-                strength=min(max(strength, 0), 1),
-                metadata={
-                    'period': period,
-                    'current_value': current_rsi,
-                    'overbought_level': self.indicator_config.rsi_overbought,
-                    'oversold_level': self.indicator_config.rsi_oversold
-                }
-            )
+            rsi_arr = _rsi_rma_nb(close, period) if NUMBA_AVAILABLE else _rsi_ewm(close, period)
+            index = ohlcv.index
             
+            current_rsi = rsi_arr[-1] if rsi_arr.size else 50
+            return self._rsi_result(current_rsi, period, value_fn=lambda: pd.Series(rsi_arr, index=index))
+        
         except Exception as e:
             logger.error(f"Error calculating RSI: {e}")
-            return IndicatorResult(name='RSI', value=pd.Series(), signal='ERROR')
+            return IndicatorResult(name='RSI', value=_EMPTY_SERIES, signal='ERROR')
+    
+    def _rsi_result(self, current_rsi: float, period: int, value=None, value_fn=None) -> IndicatorResult:
+        """RSI signal from the latest RSI value"""
+        # Generate signals
+        signal = None
+        strength = 0.5
+        
+        if current_rsi <= self._rsi_os:
+            signal = 'BUY'
+            strength = (self._rsi_os - current_rsi) / self._rsi_os
+        elif current_rsi >= self._rsi_ob:
+            signal = 'SELL'
+            strength = (current_rsi - self._rsi_ob) / (100 - self._rsi_ob)
+        else:
+            signal = 'NEUTRAL'
+        
+        return IndicatorResult(
+            name='RSI',
+            value=value,
+            value_fn=value_fn,
+            signal=signal,
+            strength=min(max(strength, 0), 1),
+            metadata={
+                'period': period,
+                'current_value': current_rsi,
+                'overbought_level': self._rsi_ob,
+                'oversold_level': self._rsi_os
+            }
+        )
     
     def calculate_macd(self, df: pd.DataFrame, fast: int = None, slow: int = None, signal: int = None) -> IndicatorResult:
         """
@@ -88,67 +647,89 @@ class TechnicalIndicators:
             fast: Fast EMA period
             slow: Slow EMA period  
             signal: Signal line period
-            
+        
         Returns:
             IndicatorResult with MACD values and signals
         """
+        return self._calculate_macd_arr(_OHLCV.from_frame(df), fast, slow, signal)
+    
+    @_memoized
+    def _calculate_macd_arr(self, ohlcv: _OHLCV, fast: int = None, slow: int = None, signal: int = None) -> IndicatorResult:
+        """MACD from the shared column arrays"""
         try:
-            fast = fast or self.indicator_config.macd_fast
-            slow = slow or self.indicator_config.macd_slow
-            signal_period = signal or self.indicator_config.macd_signal
+            fast = fast or self._macd_f
+            slow = slow or self._macd_s
+            signal_period = signal or self._macd_sig
             
-            macd_data = ta.macd(df['close'], fast=fast, slow=slow, signal=signal_period)
+            close = ohlcv.close
+            if close.size < max(fast, slow, signal_period):
+                return IndicatorResult(name='MACD', value=_EMPTY_DF, signal='ERROR')
             
-            if macd_data is None or macd_data.empty:
-                return IndicatorResult(name='MACD', value=pd.DataFrame(), signal='ERROR')
+            macd_arr, signal_arr, hist_arr = _macd_nb(close, fast, slow, signal_period)
+            index = ohlcv.index
             
-            macd_line = macd_data[f'MACD_{fast}_{slow}_{signal_period}']
-            signal_line = macd_data[f'MACDs_{fast}_{slow}_{signal_period}']
-            histogram = macd_data[f'MACDh_{fast}_{slow}_{signal_period}']
+            def macd_data():
+                macd_col, hist_col, signal_col = _macd_cols(fast, slow, signal_period)
+                return pd.DataFrame({
+                    macd_col: macd_arr,
+                    hist_col: hist_arr,
+                    signal_col: signal_arr
+                }, index=index)
             
-            # Generate signals based on crossovers
-            current_macd = macd_line.iloc[-1]
-            current_signal = signal_line.iloc[-1]
-            current_hist = histogram.iloc[-1]
-            prev_hist = histogram.iloc[-2] if len(histogram) > 1 else 0
+            # Generate signals based on crossovers, from the raw arrays; the
+            # histogram tail is (previous, current), with 0 before the first bar
+            tail = hist_arr[-2:] if hist_arr.size >= 2 else np.array([0.0, hist_arr[-1]])
+            prev_hist, current_hist = tail
+            current_macd = macd_arr[-1]
+            current_signal = signal_arr[-1]
             
-            # Signal generation
-            signal_type = 'NEUTRAL'
-            strength = 0.5
-            
-            if current_macd > current_signal and current_hist > 0:
-                if prev_hist <= 0:  # Bullish crossover
-                    signal_type = 'BUY'
-                    strength = 0.8
-                else:
-                    signal_type = 'BUY'
-                    strength = 0.6
-            elif current_macd < current_signal and current_hist < 0:
-                if prev_hist >= 0:  # Bearish crossover
-                    signal_type = 'SELL'
-                    strength = 0.8
-                else:
-                    signal_type = 'SELL'
-                    strength = 0.6
-                    
-            return IndicatorResult(
-                name='MACD',
-                value=macd_data,
-                signal=signal_type,
-                strength=strength,
-                metadata={
-                    'fast_period': fast,
-                    'slow_period': slow,
-                    'signal_period': signal_period,
-                    'current_macd': current_macd,
-                    'current_signal': current_signal,
-                    'current_histogram': current_hist
-                }
+            return self._macd_result(
+                current_macd, current_signal, current_hist, prev_hist,
+                fast, slow, signal_period, value_fn=macd_data
             )
-            
+        
         except Exception as e:
             logger.error(f"Error calculating MACD: {e}")
-            return IndicatorResult(name='MACD', value=pd.DataFrame(), signal='ERROR')
+            return IndicatorResult(name='MACD', value=_EMPTY_DF, signal='ERROR')
+    
+    def _macd_result(self, current_macd: float, current_signal: float, current_hist: float,
+                     prev_hist: float, fast: int, slow: int, signal_period: int,
+                     value=None, value_fn=None) -> IndicatorResult:
+        """MACD signal from the latest line, signal and histogram values"""
+        # Signal generation
+        signal_type = 'NEUTRAL'
+        strength = 0.5
+        
+        if current_macd > current_signal and current_hist > 0:
+            if prev_hist <= 0:  # Bullish crossover
+                signal_type = 'BUY'
+                strength = 0.8
+            else:
+                signal_type = 'BUY'
+                strength = 0.6
+        elif current_macd < current_signal and current_hist < 0:
+            if prev_hist >= 0:  # Bearish crossover
+                signal_type = 'SELL'
+                strength = 0.8
+            else:
+                signal_type = 'SELL'
+                strength = 0.6
+        
+        return IndicatorResult(
+            name='MACD',
+            value=value,
+            value_fn=value_fn,
+            signal=signal_type,
+            strength=strength,
+            metadata={
+                'fast_period': fast,
+                'slow_period': slow,
+                'signal_period': signal_period,
+                'current_macd': current_macd,
+                'current_signal': current_signal,
+                'current_histogram': current_hist
+            }
+        )
     
     def calculate_ema(self, df: pd.DataFrame, periods: List[int] = None) -> Dict[str, IndicatorResult]:
         """
@@ -157,41 +738,60 @@ class TechnicalIndicators:
         Args:
             df: DataFrame with OHLCV data
             periods: List of EMA periods
-            
+        
         Returns:
             Dictionary of IndicatorResults for each EMA
         """
+        return self._calculate_ema_arr(_OHLCV.from_frame(df), periods)
+    
+    @_memoized
+    def _calculate_ema_arr(self, ohlcv: _OHLCV, periods: List[int] = None) -> Dict[str, IndicatorResult]:
+        """EMAs from the shared column arrays"""
         try:
-            periods = periods or self.indicator_config.ema_periods
+            periods = periods or self._ema_periods
             emas = {}
+            close = ohlcv.close
             
-            for period in periods:
-                ema = ta.ema(df['close'], length=period)
-                current_price = df['close'].iloc[-1]
-                current_ema = ema.iloc[-1]
-                
-                # Determine trend
-                signal_type = 'BUY' if current_price > current_ema else 'SELL'
-                strength = abs(current_price - current_ema) / current_ema
+            # Skip periods without enough bars to seed the EMA
+            periods = [period for period in periods if close.size >= period]
+            if not periods:
+                return emas
+            
+            for period, ema_arr in zip(periods, _trend_emas(close, periods)):
+                current_price = float(close[-1])
+                current_ema = ema_arr[-1]
                 
-                emas[f'EMA_{period}'] = IndicatorResult(
-                    name=f'EMA_{period}',
-                    value=ema,
-                    signal=signal_type,
-                    strength=min(strength, 1.0),
-                    metadata={
-                        'period': period,
-                        'current_value': current_ema,
-                        'current_price': current_price
-                    }
+                emas[f'EMA_{period}'] = self._ema_result(
+                    period, current_price, current_ema,
+                    value_fn=lambda ema_arr=ema_arr, index=ohlcv.index: pd.Series(ema_arr, index=index)
                 )
-                
-            return emas
             
+            return emas
+        
         except Exception as e:
             logger.error(f"Error calculating EMAs: {e}")
             return {}
     
+    def _ema_result(self, period: int, current_price: float, current_ema: float,
+                    value=None, value_fn=None) -> IndicatorResult:
+        """EMA trend signal from the latest price and EMA"""
+        # Determine trend
+        signal_type = 'BUY' if current_price > current_ema else 'SELL'
+        strength = abs(current_price - current_ema) / current_ema
+        
+        return IndicatorResult(
+            name=f'EMA_{period}',
+            value=value,
+            value_fn=value_fn,
+            signal=signal_type,
+            strength=min(strength, 1.0),
+            metadata={
+                'period': period,
+                'current_value': current_ema,
+                'current_price': current_price
+            }
+        )
+    
     def calculate_bollinger_bands(self, df: pd.DataFrame, period: int = None, std_dev: float = None) -> IndicatorResult:
         """
         Calculate Bollinger Bands with position signals
@@ -200,56 +800,70 @@ class TechnicalIndicators:
             df: DataFrame with OHLCV data
             period: Period for moving average
             std_dev: Standard deviation multiplier
-            
+        
         Returns:
             IndicatorResult with Bollinger Bands data
         """
+        return self._calculate_bollinger_bands_arr(_OHLCV.from_frame(df), period, std_dev)
+    
+    @_memoized
+    def _calculate_bollinger_bands_arr(self, ohlcv: _OHLCV, period: int = None, std_dev: float = None) -> IndicatorResult:
+        """Bollinger Bands from the shared column arrays"""
         try:
-            period = period or self.indicator_config.bb_period
-            std_dev = std_dev or self.indicator_config.bb_std_dev
-            
-            bb = ta.bbands(df['close'], length=period, std=std_dev)
+            period = period or self._bb_p
+            std_dev = std_dev or self._bb_s
+            current_price = float(ohlcv.close[-1])
             
-            if bb is None or bb.empty:
-                return IndicatorResult(name='BB', value=pd.DataFrame(), signal='ERROR')
+            # The signal only needs the latest window: O(period) instead of a rolling
+            # pass. The band DataFrame is only built if the value is read
+            if ohlcv.close.size < period:
+                return IndicatorResult(name='BB', value=_EMPTY_DF, signal='ERROR')
             
-            current_price = df['close'].iloc[-1]
-            upper_band = bb[f'BBU_{period}_{std_dev}'].iloc[-1]
-            middle_band = bb[f'BBM_{period}_{std_dev}'].iloc[-1]
-            lower_band = bb[f'BBL_{period}_{std_dev}'].iloc[-1]
+            window = ohlcv.close[-period:]
+            middle_band = window.mean(dtype=np.float64)
+            width = std_dev * window.std(dtype=np.float64)
             
-            # Generate signals based on band position
-            signal_type = 'NEUTRAL'
-            strength = 0.5
-            
-            band_width = upper_band - lower_band
-            price_position = (current_price - lower_band) / band_width
-            
-            if price_position <= 0.2:  # Near lower band
-                signal_type = 'BUY'
-                strength = 0.8 - price_position * 2
-            elif price_position >= 0.8:  # Near upper band
-                signal_type = 'SELL'
-                strength = (price_position - 0.8) * 5
-                
-            return IndicatorResult(
-                name='BB',
-                value=bb,
-                signal=signal_type,
-                strength=min(max(strength, 0), 1),
-                metadata={
-                    'period': period,
-                    'std_dev': std_dev,
-                    'upper_band': upper_band,
-                    'middle_band': middle_band,
-                    'lower_band': lower_band,
-                    'price_position': price_position
-                }
+            return self._bb_result(
+                current_price, middle_band + width, middle_band, middle_band - width, period, std_dev,
+                value_fn=lambda: self._bbands(ohlcv.series('close'), length=period, std=std_dev)
             )
-            
+        
         except Exception as e:
             logger.error(f"Error calculating Bollinger Bands: {e}")
-            return IndicatorResult(name='BB', value=pd.DataFrame(), signal='ERROR')
+            return IndicatorResult(name='BB', value=_EMPTY_DF, signal='ERROR')
+    
+    def _bb_result(self, current_price: float, upper_band: float, middle_band: float, lower_band: float,
+                   period: int, std_dev: float, value=None, value_fn=None) -> IndicatorResult:
+        """Bollinger Bands signal from the price position within the latest bands"""
+        # Generate signals based on band position
+        signal_type = 'NEUTRAL'
+        strength = 0.5
+        
+        band_width = upper_band - lower_band
+        price_position = (current_price - lower_band) / band_width
+        
+        if price_position <= 0.2:  # Near lower band
+            signal_type = 'BUY'
+            strength = 0.8 - price_position * 2
+        elif price_position >= 0.8:  # Near upper band
+            signal_type = 'SELL'
+            strength = (price_position - 0.8) * 5
+        
+        return IndicatorResult(
+            name='BB',
+            value=value,
+            value_fn=value_fn,
+            signal=signal_type,
+            strength=min(max(strength, 0), 1),
+            metadata={
+                'period': period,
+                'std_dev': std_dev,
+                'upper_band': upper_band,
+                'middle_band': middle_band,
+                'lower_band': lower_band,
+                'price_position': price_position
+            }
+        )
     
     def calculate_atr(self, df: pd.DataFrame, period: int = None) -> IndicatorResult:
         """
@@ -258,44 +872,59 @@ class TechnicalIndicators:
         Args:
             df: DataFrame with OHLCV data
             period: ATR period
-            
+        
         Returns:
             IndicatorResult with ATR values
         """
+        return self._calculate_atr_arr(_OHLCV.from_frame(df), period)
+    
+    @_memoized
+    def _calculate_atr_arr(self, ohlcv: _OHLCV, period: int = None) -> IndicatorResult:
+        """ATR from the shared column arrays"""
         try:
-            period = period or self.indicator_config.atr_period
-            atr = ta.atr(df['high'], df['low'], df['close'], length=period)
+            period = period or self._atr_p
+            if ohlcv.close.size <= period:
+                return IndicatorResult(name='ATR', value=_EMPTY_SERIES, signal='ERROR')
             
-            current_atr = atr.iloc[-1] if not atr.empty else 0
-            current_price = df['close'].iloc[-1]
+            atr_arr = ohlcv.adx_atr(period)[0]
+            index = ohlcv.index
             
-            # ATR as percentage of price for volatility assessment
-            atr_percentage = (current_atr / current_price) * 100
-            
-            # Classify volatility
-            if atr_percentage < 1:
-                volatility = 'LOW'
-            elif atr_percentage < 3:
-                volatility = 'MEDIUM'
-            else:
-                volatility = 'HIGH'
-                
-            return IndicatorResult(
-                name='ATR',
-                value=atr,
-                signal=volatility,
-                strength=min(atr_percentage / 5, 1.0),  # Normalize to 0-1
-                metadata={
-                    'period': period,
-                    'current_value': current_atr,
-                    'atr_percentage': atr_percentage,
-                    'volatility_level': volatility
-                }
-            )
+            current_atr = atr_arr[-1]
+            current_price = float(ohlcv.close[-1])
             
+            return self._atr_result(current_atr, current_price, period, value_fn=lambda: pd.Series(atr_arr, index=index))
+        
         except Exception as e:
             logger.error(f"Error calculating ATR: {e}")
-            return IndicatorResult(name='ATR', value=pd.Series(), signal='ERROR')
+            return IndicatorResult(name='ATR', value=_EMPTY_SERIES, signal='ERROR')
+    
+    def _atr_result(self, current_atr: float, current_price: float, period: int,
+                    value=None, value_fn=None) -> IndicatorResult:
+        """Volatility level from the latest ATR relative to price"""
+        # ATR as percentage of price for volatility assessment
+        atr_percentage = (current_atr / current_price) * 100
+        
+        # Classify volatility
+        if atr_percentage < 1:
+            volatility = 'LOW'
+        elif atr_percentage < 3:
+            volatility = 'MEDIUM'
+        else:
+            volatility = 'HIGH'
+        
+        return IndicatorResult(
+            name='ATR',
+            value=value,
+            value_fn=value_fn,
+            signal=volatility,
+            strength=min(atr_percentage / 5, 1.0),  # Normalize to 0-1
+            metadata={
+                'period': period,
+                'current_value': current_atr,
+                'atr_percentage': atr_percentage,
+                'volatility_level': volatility
+            }
+        )
     
     def calculate_stochastic(self, df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> IndicatorResult:
         """
@@ -305,49 +934,62 @@ class TechnicalIndicators:
             df: DataFrame with OHLCV data
             k_period: %K period
             d_period: %D period
-            
+        
         Returns:
             IndicatorResult with Stochastic values and signals
         """
+        return self._calculate_stochastic_arr(_OHLCV.from_frame(df), k_period, d_period)
+    
+    @_memoized
+    def _calculate_stochastic_arr(self, ohlcv: _OHLCV, k_period: int = 14, d_period: int = 3) -> IndicatorResult:
+        """Stochastic Oscillator from the shared column arrays"""
         try:
-            stoch = ta.stoch(df['high'], df['low'], df['close'], k=k_period, d=d_period)
+            # The signal only needs the latest windows; the pandas-ta %K/%D
+            # DataFrame is only built if the value is read
+            if ohlcv.close.size < k_period + 2 * (d_period - 1):
+                return IndicatorResult(name='STOCH', value=_EMPTY_DF, signal='ERROR')
             
-            if stoch is None or stoch.empty:
-                return IndicatorResult(name='STOCH', value=pd.DataFrame(), signal='ERROR')
+            _, smoothed_k = _stochastic_tail(ohlcv.high, ohlcv.low, ohlcv.close, k_period, d_period)
+            current_k = smoothed_k[-1]
+            current_d = smoothed_k.mean()
             
-            k_values = stoch[f'STOCHk_{k_period}_{d_period}_{d_period}']
-            d_values = stoch[f'STOCHd_{k_period}_{d_period}_{d_period}']
-            
-            current_k = k_values.iloc[-1]
-            current_d = d_values.iloc[-1]
-            
-            # Generate signals
-            signal_type = 'NEUTRAL'
-            strength = 0.5
-            
-            if current_k < 20 and current_d < 20:
-                signal_type = 'BUY'
-                strength = (20 - min(current_k, current_d)) / 20
-            elif current_k > 80 and current_d > 80:
-                signal_type = 'SELL'
-                strength = (min(current_k, current_d) - 80) / 20
-                
-            return IndicatorResult(
-                name='STOCH',
-                value=stoch,
-                signal=signal_type,
-                strength=min(max(strength, 0), 1),
-                metadata={
-                    'k_period': k_period,
-                    'd_period': d_period,
-                    'current_k': current_k,
-                    'current_d': current_d
-                }
+            return self._stoch_result(
+                current_k, current_d, k_period, d_period,
+                value_fn=lambda: self._stoch(ohlcv.series('high'), ohlcv.series('low'), ohlcv.series('close'),
+                                             k=k_period, d=d_period)
             )
-            
+        
         except Exception as e:
             logger.error(f"Error calculating Stochastic: {e}")
-            return IndicatorResult(name='STOCH', value=pd.DataFrame(), signal='ERROR')
+            return IndicatorResult(name='STOCH', value=_EMPTY_DF, signal='ERROR')
+    
+    def _stoch_result(self, current_k: float, current_d: float, k_period: int, d_period: int,
+                      value=None, value_fn=None) -> IndicatorResult:
+        """Stochastic signal from the latest %K and %D"""
+        # Generate signals
+        signal_type = 'NEUTRAL'
+        strength = 0.5
+        
+        if current_k < 20 and current_d < 20:
+            signal_type = 'BUY'
+            strength = (20 - min(current_k, current_d)) / 20
+        elif current_k > 80 and current_d > 80:
+            signal_type = 'SELL'
+            strength = (min(current_k, current_d) - 80) / 20
+        
+        return IndicatorResult(
+            name='STOCH',
+            value=value,
+            value_fn=value_fn,
+            signal=signal_type,
+            strength=min(max(strength, 0), 1),
+            metadata={
+                'k_period': k_period,
+                'd_period': d_period,
+                'current_k': current_k,
+                'current_d': current_d
+            }
+        )
     
     def calculate_adx(self, df: pd.DataFrame, period: int = 14) -> IndicatorResult:
         """
@@ -356,54 +998,70 @@ class TechnicalIndicators:
         Args:
             df: DataFrame with OHLCV data
             period: ADX period
-            
+        
         Returns:
             IndicatorResult with ADX values and trend strength
         """
+        return self._calculate_adx_arr(_OHLCV.from_frame(df), period)
+    
+    @_memoized
+    def _calculate_adx_arr(self, ohlcv: _OHLCV, period: int = 14) -> IndicatorResult:
+        """ADX from the shared column arrays"""
         try:
-            adx_data = ta.adx(df['high'], df['low'], df['close'], length=period)
+            if ohlcv.close.size <= period:
+                return IndicatorResult(name='ADX', value=_EMPTY_DF, signal='ERROR')
             
-            if adx_data is None or adx_data.empty:
-                return IndicatorResult(name='ADX', value=pd.DataFrame(), signal='ERROR')
+            _, plus_di, minus_di, adx = ohlcv.adx_atr(period)
+            index = ohlcv.index
             
-            adx = adx_data[f'ADX_{period}']
-            plus_di = adx_data[f'DMP_{period}']
-            minus_di = adx_data[f'DMN_{period}']
+            def adx_data():
+                adx_col, plus_col, minus_col = _adx_cols(period)
+                return pd.DataFrame({
+                    adx_col: adx,
+                    plus_col: plus_di,
+                    minus_col: minus_di
+                }, index=index)
             
-            current_adx = adx.iloc[-1]
-            current_plus_di = plus_di.iloc[-1]
-            current_minus_di = minus_di.iloc[-1]
-            
-            # Determine trend strength and direction
-            if current_adx > 25:
-                if current_plus_di > current_minus_di:
-                    signal_type = 'STRONG_UPTREND'
-                else:
-                    signal_type = 'STRONG_DOWNTREND'
-                strength = min(current_adx / 50, 1.0)
-            elif current_adx > 15:
-                signal_type = 'WEAK_TREND'
-                strength = current_adx / 25
-            else:
-                signal_type = 'NO_TREND'
-                strength = 0.2
-                
-            return IndicatorResult(
-                name='ADX',
-                value=adx_data,
-                signal=signal_type,
-                strength=strength,
-                metadata={
-                    'period': period,
-                    'current_adx': current_adx,
-                    'plus_di': current_plus_di,
-                    'minus_di': current_minus_di
-                }
-            )
+            current_adx = adx[-1]
+            current_plus_di = plus_di[-1]
+            current_minus_di = minus_di[-1]
             
+            return self._adx_result(current_adx, current_plus_di, current_minus_di, period, value_fn=adx_data)
+        
         except Exception as e:
             logger.error(f"Error calculating ADX: {e}")
-            return IndicatorResult(name='ADX', value=pd.DataFrame(), signal='ERROR')
+            return IndicatorResult(name='ADX', value=_EMPTY_DF, signal='ERROR')
+    
+    def _adx_result(self, current_adx: float, current_plus_di: float, current_minus_di: float,
+                    period: int, value=None, value_fn=None) -> IndicatorResult:
+        """Trend strength and direction from the latest ADX and DIs"""
+        # Determine trend strength and direction
+        if current_adx > 25:
+            if current_plus_di > current_minus_di:
+                signal_type = 'STRONG_UPTREND'
+            else:
+                signal_type = 'STRONG_DOWNTREND'
+            strength = min(current_adx / 50, 1.0)
+        elif current_adx > 15:
+            signal_type = 'WEAK_TREND'
+            strength = current_adx / 25
+        else:
+            signal_type = 'NO_TREND'
+            strength = 0.2
+        
+        return IndicatorResult(
+            name='ADX',
+            value=value,
+            value_fn=value_fn,
+            signal=signal_type,
+            strength=strength,
+            metadata={
+                'period': period,
+                'current_adx': current_adx,
+                'plus_di': current_plus_di,
+                'minus_di': current_minus_di
+            }
+        )
     
     def calculate_volume_indicators(self, df: pd.DataFrame) -> Dict[str, IndicatorResult]:
         """
@@ -411,145 +1069,334 @@ class TechnicalIndicators:
         
         Args:
             df: DataFrame with OHLCV data
-            
+        
         Returns:
             Dictionary of volume indicator results
         """
+        return self._calculate_volume_indicators_arr(_OHLCV.from_frame(df))
+    
+    @_memoized
+    def _calculate_volume_indicators_arr(self, ohlcv: _OHLCV) -> Dict[str, IndicatorResult]:
+        """Volume indicators from the shared column arrays"""
         try:
-            volume_indicators = {}
+            # Volume SMA; the signal only needs the latest 20-bar window
+            volume = ohlcv.volume
+            current_vol = volume[-1]
+            avg_vol = volume[-20:].mean()
             
-            # Volume SMA
-            vol_sma = ta.sma(df['volume'], length=20)
-            current_vol = df['volume'].iloc[-1]
-            avg_vol = vol_sma.iloc[-1]
+            # On Balance Volume: running sum of volume signed by the close-to-close
+            # direction (the first bar counts as up, as in pandas-ta)
+            direction = np.sign(np.diff(ohlcv.close, prepend=np.nan))
+            direction[0] = 1.0
+            obv_arr = np.cumsum(direction * volume)
+            obv_ma = obv_arr[-10:].mean()
+            prev_obv_ma = obv_arr[-11:-1].mean() if obv_arr.size > 10 else None
             
-            vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1
+            index = ohlcv.index
             
-            if vol_ratio > 1.5:
-                vol_signal = 'HIGH_VOLUME'
-                vol_strength = min((vol_ratio - 1) / 2, 1.0)
-            elif vol_ratio < 0.5:
-                vol_signal = 'LOW_VOLUME'
-                vol_strength = (1 - vol_ratio) / 0.5
-            else:
-                vol_signal = 'NORMAL_VOLUME'
-                vol_strength = 0.5
-                
-            volume_indicators['VOLUME'] = IndicatorResult(
-                name='VOLUME',
-                value=vol_sma,
-                signal=vol_signal,
-                strength=vol_strength,
-                metadata={
-                    'current_volume': current_vol,
-                    'average_volume': avg_vol,
-                    'volume_ratio': vol_ratio
-                }
+            return self._volume_results(
+                current_vol, avg_vol, obv_arr[-1], obv_ma, prev_obv_ma,
+                vol_value_fn=lambda: pd.Series(_rolling_mean(volume, 20), index=index),
+                obv_value_fn=lambda: pd.Series(obv_arr, index=index)
             )
-            
-            # On Balance Volume
-            obv = ta.obv(df['close'], df['volume'])
-            obv_ma = ta.sma(obv, length=10)
-            
-            if len(obv_ma) > 1:
-                obv_trend = 'RISING' if obv_ma.iloc[-1] > obv_ma.iloc[-2] else 'FALLING'
-            else:
-                obv_trend = 'NEUTRAL'
-                
-            volume_indicators['OBV'] = IndicatorResult(
-                name='OBV',
-                value=obv,
-                signal=obv_trend,
-                strength=0.5,
-                metadata={
-                    'current_obv': obv.iloc[-1],
-                    'obv_ma': obv_ma.iloc[-1]
-                }
-            )
-            
-            return volume_indicators
-            
+        
         except Exception as e:
             logger.error(f"Error calculating volume indicators: {e}")
             return {}
     
-    def get_comprehensive_analysis(self, df: pd.DataFrame) -> Dict[str, IndicatorResult]:
+    def _volume_results(self, current_vol: float, avg_vol: float, current_obv: float, obv_ma: float,
+                        prev_obv_ma: Optional[float], vol_value=None, obv_value=None,
+                        vol_value_fn=None, obv_value_fn=None) -> Dict[str, IndicatorResult]:
+        """Volume and OBV signals; the OBV trend is NEUTRAL without a previous 10-bar average"""
+        volume_indicators = {}
+        vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1
+        
+        if vol_ratio > 1.5:
+            vol_signal = 'HIGH_VOLUME'
+            vol_strength = min((vol_ratio - 1) / 2, 1.0)
+        elif vol_ratio < 0.5:
+            vol_signal = 'LOW_VOLUME'
+            vol_strength = (1 - vol_ratio) / 0.5
+        else:
+            vol_signal = 'NORMAL_VOLUME'
+            vol_strength = 0.5
+        
+        volume_indicators['VOLUME'] = IndicatorResult(
+            name='VOLUME',
+            value=vol_value,
+            value_fn=vol_value_fn,
+            signal=vol_signal,
+            strength=vol_strength,
+            metadata={
+                'current_volume': current_vol,
+                'average_volume': avg_vol,
+                'volume_ratio': vol_ratio
+            }
+        )
+        
+        # Compare the latest 10-bar OBV average with the one a bar earlier
+        if prev_obv_ma is not None:
+            obv_trend = 'RISING' if obv_ma > prev_obv_ma else 'FALLING'
+        else:
+            obv_trend = 'NEUTRAL'
+        
+        volume_indicators['OBV'] = IndicatorResult(
+            name='OBV',
+            value=obv_value,
+            value_fn=obv_value_fn,
+            signal=obv_trend,
+            strength=0.5,
+            metadata={
+                'current_obv': current_obv,
+                'obv_ma': obv_ma
+            }
+        )
+        
+        return volume_indicators
+    
+    def get_comprehensive_analysis(self, df: pd.DataFrame, required: Optional[set] = None,
+                                   incremental: bool = False) -> Dict[str, IndicatorResult]:
         """
         Get comprehensive technical analysis for a given dataset
         
         Args:
             df: DataFrame with OHLCV data
-            
+            required: Names of the indicators to compute (e.g. 'ATR', 'ADX', 'OBV',
+                'EMA_200'); defaults to the ones the composite signal uses
+            incremental: When ``df`` ends exactly one bar past the last analyzed bar,
+                only feed that bar through ``update``. The results then carry the
+                current scalar in ``value``, as ``update`` does; any other data, or
+                False, gets a full recompute with series values
+        
         Returns:
-            Dictionary containing all calculated indicators
+            Dictionary containing the requested indicators
         """
         try:
+            required = required or set(self._composite_names)
+            state = self._stream
+            # Incremental only if the previous bar is the one the state ended on,
+            # unrevised. The whole bar is compared, since one instance may be
+            # fed several symbols whose timestamps line up
+            if not incremental:
+                last_bar = None
+            elif state is not None:
+                last_bar = state.last_bar()
+            else:
+                last_bar = self._stream_source.last_bar() if self._stream_source is not None else None
+            if last_bar is not None and self._continues(df, last_bar) and self._stream_state() is not None:
+                bar = df.iloc[-1]
+                streamed = self.update(
+                    bar.get('open', bar['close']), bar['high'], bar['low'], bar['close'], bar['volume'],
+                    timestamp=df.index[-1]
+                )
+                return {name: result for name, result in streamed.items() if name in required}
+            
             analysis = {}
             
-            # Core indicators
-            analysis['RSI'] = self.calculate_rsi(df)
-            analysis['MACD'] = self.calculate_macd(df)
-            analysis['BB'] = self.calculate_bollinger_bands(df)
-            analysis['ATR'] = self.calculate_atr(df)
-            analysis['STOCH'] = self.calculate_stochastic(df)
-            analysis['ADX'] = self.calculate_adx(df)
+            # Extract the OHLCV columns once and share them across all indicators
+            ohlcv = _OHLCV.from_frame(df)
             
-            # EMA analysis
-            ema_results = self.calculate_ema(df)
-            analysis.update(ema_results)
+            # Core indicators, then the EMA and volume groups, skipping any not required
+            tasks = {
+                name: task for name, task in (
+                    ('RSI', self._calculate_rsi_arr),
+                    ('MACD', self._calculate_macd_arr),
+                    ('BB', self._calculate_bollinger_bands_arr),
+                    ('ATR', self._calculate_atr_arr),
+                    ('STOCH', self._calculate_stochastic_arr),
+                    ('ADX', self._calculate_adx_arr)
+                ) if name in required
+            }
+            ema_periods = tuple(period for period in self._ema_periods if f'EMA_{period}' in required)
+            if ema_periods:
+                tasks['EMA'] = functools.partial(self._calculate_ema_arr, periods=ema_periods)
+            if required & {'VOLUME', 'OBV'}:
+                tasks['VOLUME'] = self._calculate_volume_indicators_arr
             
-            # Volume analysis
-            volume_results = self.calculate_volume_indicators(df)
-            analysis.update(volume_results)
+            if len(df) < self.parallel_min_bars:
+                results = {name: task(ohlcv) for name, task in tasks.items()}
+            else:
+                pool = _get_thread_pool()
+                futures = {pool.submit(task, ohlcv): name for name, task in tasks.items()}
+                results = {futures[future]: future.result() for future in as_completed(futures)}
             
-            return analysis
+            # Assemble in the fixed order regardless of completion order
+            for name in tasks:
+                if isinstance(results[name], dict):
+                    analysis.update((key, result) for key, result in results[name].items() if key in required)
+                else:
+                    analysis[name] = results[name]
             
+            # Keep this data to seed the streaming state from, unless the state
+            # already describes it
+            if state is None or state.fingerprint != ohlcv.fingerprint():
+                self._stream = None
+                self._stream_source = ohlcv
+            
+            return analysis
+        
         except Exception as e:
             logger.error(f"Error in comprehensive analysis: {e}")
             return {}
     
+    def batch_analysis(self, dfs: Dict[str, pd.DataFrame],
+                       required: Optional[set] = None) -> Dict[str, Dict[str, IndicatorResult]]:
+        """
+        Comprehensive analysis of many symbols in parallel worker processes
+        
+        Each worker builds its own TechnicalIndicators from this instance's config
+        and is sent a pickled copy of its frames. Workers are started with spawn
+        rather than fork, so they never inherit the parent's indicator threads or
+        a held cache lock. Workers are recycled every 50 tasks to cap their
+        resident memory.
+        
+        Args:
+            dfs: DataFrames with OHLCV data by symbol
+            required: Indicator names to compute, as for get_comprehensive_analysis
+        
+        Returns:
+            Dictionary of analysis results by symbol
+        """
+        if len(dfs) <= 1:
+            return {symbol: self.get_comprehensive_analysis(df, required) for symbol, df in dfs.items()}
+        
+        try:
+            tasks = [(symbol, df, required) for symbol, df in dfs.items()]
+            processes = min(len(tasks), os.cpu_count() or 1)
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(processes, initializer=_init_worker, initargs=(self.config,),
+                              maxtasksperchild=50) as pool:
+                return dict(pool.map(_analyze_one, tasks))
+        
+        except Exception as e:
+            logger.error(f"Error in batch analysis: {e}")
+            return {}
+    
+    def update(self, open_price: float, high: float, low: float, close: float, volume: float,
+               timestamp=None) -> Dict[str, IndicatorResult]:
+        """
+        Advance all indicators by one new bar in O(1), without recomputing the history
+        
+        The state is seeded by a full ``get_comprehensive_analysis``. Results carry
+        the current scalar in ``value`` instead of the full series.
+        
+        Args:
+            open_price: Bar open (not used by the current indicators)
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume
+            timestamp: Index of the bar, so the next DataFrame can be matched to it
+        
+        Returns:
+            Dictionary containing all calculated indicators, empty if there is no state yet
+        """
+        state = self._stream_state()
+        if state is None:
+            logger.warning("No streaming state; run get_comprehensive_analysis on a full history first")
+            return {}
+        
+        try:
+            state.advance(float(high), float(low), float(close), float(volume), timestamp)
+            return self._stream_analysis(state)
+        
+        except Exception as e:
+            logger.error(f"Error in incremental update: {e}")
+            self._stream = None
+            return {}
+    
+    def _stream_state(self) -> Optional[StreamingState]:
+        """The streaming state, seeded first from the data of the last full analysis if needed"""
+        if self._stream is None and self._stream_source is not None:
+            self._stream = StreamingState.seed(
+                self._stream_source, self._rsi_p, (self._macd_f, self._macd_s, self._macd_sig),
+                self._ema_periods, self._atr_p, self._bb_p, self._bb_s
+            )
+            self._stream_source = None
+        return self._stream
+    
+    @staticmethod
+    def _continues(df: pd.DataFrame, last_bar: tuple) -> bool:
+        """Whether df ends exactly one bar past ``last_bar``, with that bar unrevised"""
+        if len(df) < 2 or df.index[-2] != last_bar[0]:
+            return False
+        _, close, high, low, volume = last_bar
+        prev = df.iloc[-2]
+        # Prices are compared at the float32 precision they are analyzed at
+        return (np.float32(prev['close']) == np.float32(close)
+                and np.float32(prev['high']) == np.float32(high)
+                and np.float32(prev['low']) == np.float32(low)
+                and float(prev['volume']) == float(volume))
+    
+    def _stream_analysis(self, state: StreamingState) -> Dict[str, IndicatorResult]:
+        """Indicator results from the streaming state"""
+        analysis = {}
+        close = state.prev_close
+        
+        rsi = state.rsi()
+        analysis['RSI'] = self._rsi_result(rsi, state.rsi_period, rsi)
+        
+        macd = state.ema_fast - state.ema_slow
+        analysis['MACD'] = self._macd_result(
+            macd, state.macd_signal, state.macd_hist, state.macd_prev_hist,
+            state.macd_fast, state.macd_slow, state.macd_signal_period, macd
+        )
+        
+        window = np.fromiter(state.bb_window, dtype=np.float64, count=len(state.bb_window))
+        middle = window.mean()
+        width = state.bb_std_dev * window.std()
+        analysis['BB'] = self._bb_result(
+            close, middle + width, middle, middle - width, state.bb_period, state.bb_std_dev, middle
+        )
+        
+        analysis['ATR'] = self._atr_result(state.atr, close, state.atr_period, state.atr)
+        
+        current_k = state.stoch_k[-1]
+        current_d = np.mean(state.stoch_k)
+        analysis['STOCH'] = self._stoch_result(
+            current_k, current_d, state.stoch_k_period, state.stoch_d_period, current_k
+        )
+        
+        plus_di, minus_di = state.directional_indices()
+        analysis['ADX'] = self._adx_result(state.adx, plus_di, minus_di, state.adx_period, state.adx)
+        
+        for period, ema in state.emas.items():
+            analysis[f'EMA_{period}'] = self._ema_result(period, close, ema, ema)
+        
+        avg_vol = np.mean(state.volume_window)
+        obv = list(state.obv_window)
+        analysis.update(self._volume_results(
+            state.volume_window[-1], avg_vol, state.obv, np.mean(obv[-10:]), np.mean(obv[:-1]),
+            avg_vol, state.obv
+        ))
+        
+        return analysis
+    
     def generate_composite_signal(self, analysis: Dict[str, IndicatorResult]) -> Tuple[str, float]:
         """
         Generate a composite signal from multiple indicators
         
         Args:
             analysis: Dictionary of indicator results
-            
+        
         Returns:
             Tuple of (signal, confidence)
         """
         try:
-            buy_signals = 0
-            sell_signals = 0
-            total_weight = 0
-            
-            # Weight different indicators
-            weights = {
-                'RSI': 0.2,
-                'MACD': 0.25,
-                'BB': 0.15,
-                'STOCH': 0.15,
-                'EMA_21': 0.1,
-                'EMA_50': 0.1,
-                'VOLUME': 0.05
-            }
-            
-            for indicator_name, weight in weights.items():
-                if indicator_name in analysis:
-                    result = analysis[indicator_name]
-                    if result.signal == 'BUY':
-                        buy_signals += weight * result.strength
-                    elif result.signal == 'SELL':
-                        sell_signals += weight * result.strength
-                    total_weight += weight
-            
-            # Normalize signals
-            if total_weight > 0:
-                buy_signals /= total_weight
-                sell_signals /= total_weight
+            # Weights of the indicators present, with their signal codes
+            # (+1 BUY, -1 SELL, 0 otherwise) and strengths
+            present = np.fromiter(
+                (name in analysis for name in self._composite_names),
+                dtype=bool, count=len(self._composite_names)
+            )
+            weights = self._composite_weights[present]
+            results = [analysis[name] for name in self._composite_names if name in analysis]
+            codes = np.fromiter((result.sig_code for result in results), dtype=np.int8, count=len(results))
+            strengths = np.fromiter((result.strength or 0.0 for result in results), dtype=np.float64, count=len(results))
             
-            # Determine final signal
-            signal_diff = buy_signals - sell_signals
+            # Weighted net buy-minus-sell score, normalized by the weights present
+            total_weight = weights.sum()
+            signal_diff = float(weights @ (codes * strengths)) / total_weight if total_weight > 0 else 0.0
             
             if signal_diff > 0.3:
                 return 'BUY', min(signal_diff, 1.0)
@@ -557,7 +1404,31 @@ class TechnicalIndicators:
                 return 'SELL', min(abs(signal_diff), 1.0)
             else:
                 return 'NEUTRAL', abs(signal_diff)
-                
+        
         except Exception as e:
             logger.error(f"Error generating composite signal: {e}")
-            return 'NEUTRAL', 0.0 
\ No newline at end of file
+            return 'NEUTRAL', 0.0
+    
+    def refresh_config(self):
+        """Re-read the indicator configuration after it was changed at runtime"""
+        self.indicator_config = self.config.indicators
+        self._snapshot_config()
+        self.clear_cache()
+        self._stream = None
+        self._stream_source = None
+    
+    def _snapshot_config(self):
+        """Copy the indicator settings into plain attributes for the hot paths"""
+        ic = self.indicator_config
+        self._rsi_p = ic.rsi_period
+        self._rsi_ob = ic.rsi_overbought
+        self._rsi_os = ic.rsi_oversold
+        self._macd_f, self._macd_s, self._macd_sig = ic.macd_fast, ic.macd_slow, ic.macd_signal
+        self._bb_p = ic.bb_period
+        self._bb_s = ic.bb_std_dev
+        self._atr_p = ic.atr_period
+        self._ema_periods = tuple(ic.ema_periods)
+    
+    def clear_cache(self):
+        """Drop all cached indicator results"""
+        self._result_cache.clear()
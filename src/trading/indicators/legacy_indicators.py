@@ -1,16 +1,212 @@
 import pandas as pd
 import numpy as np
 import logging
+import functools
+import hashlib
+import operator
+from collections import OrderedDict
 import pandas_ta as ta
+from src.trading._numba import NUMBA_AVAILABLE
+from src.trading.indicators._kernels import _ema_multi_nb, _macd_rsi_nb
 
 logger = logging.getLogger('indicators')
 
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    logger.debug("TA-Lib not available. Indicators will use pandas_ta.")
+    TALIB_AVAILABLE = False
+
+# Indicator arrays keyed by a digest of the prices they were computed from,
+# so a series shared by several indicators (or re-scanned in a sweep) is only
+# computed once per parameter set. Bounded LRU; cached arrays are read-only.
+_INDICATOR_CACHE_SIZE = 256
+_indicator_cache = OrderedDict()
+
+def _cached(key, prices, compute):
+    """
+    Return ``compute(values)`` for the float64 values of ``prices``, memoized on
+    a digest of the values plus ``key``
+    
+    Args:
+        key: Hashable indicator name and parameters
+        prices: Price Series
+        compute: Callable mapping the values array to a result array or tuple of arrays
+        
+    Returns:
+        The (read-only) result of ``compute``
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    
+    # Keyed on the content rather than the buffer, so no entry has to keep the
+    # caller's frame alive and a fresh frame with the same bars still hits
+    digest = hashlib.blake2b(np.ascontiguousarray(values), digest_size=16).digest()
+    cache_key = (key, values.size, digest)
+    entry = _indicator_cache.get(cache_key)
+    if entry is not None:
+        _indicator_cache.move_to_end(cache_key)
+        return entry
+    
+    result = compute(values)
+    for arr in (result if isinstance(result, tuple) else (result,)):
+        arr.flags.writeable = False
+    _indicator_cache[cache_key] = result
+    if len(_indicator_cache) > _INDICATOR_CACHE_SIZE:
+        _indicator_cache.popitem(last=False)
+    return result
+
+def _ta_array(series, n):
+    """Values of a pandas_ta result, or all NaN when it returned None"""
+    if series is None:
+        return np.full(n, np.nan)
+    return series.to_numpy(dtype=np.float64)
+
+# Longest series whose EMA is evaluated as a convolution. The direct
+# convolution is quadratic, so past this the recurrence is cheaper.
+_EMA_CONVOLVE_MAX_BARS = 1024
+
+@functools.lru_cache(maxsize=32)
+def _ema_weights(length):
+    """
+    Weights of the SMA-seeded EMA written as a dot product over past bars
+    
+    Returns:
+        Tuple of (decay, carry) arrays of _EMA_CONVOLVE_MAX_BARS values:
+        decay[k] = alpha * (1 - alpha)**k weighs the k-th previous bar and
+        carry[k] = (1 - alpha)**(k + 1) what is left of the seed after k + 1 bars
+    """
+    alpha = 2.0 / (length + 1)
+    carry = (1.0 - alpha) ** np.arange(1, _EMA_CONVOLVE_MAX_BARS + 1)
+    decay = np.empty_like(carry)
+    decay[0] = alpha
+    decay[1:] = alpha * carry[:-1]
+    decay.flags.writeable = False
+    carry.flags.writeable = False
+    return decay, carry
+
+def _ema_convolve(values, length):
+    """SMA-seeded EMA of a short, NaN-free array as one convolution, matching pandas_ta's ema"""
+    out = np.full(values.size, np.nan)
+    if length <= 0 or values.size < length:
+        return out
+    
+    decay, carry = _ema_weights(length)
+    seed = values[:length].mean()
+    tail = values[length:]
+    m = tail.size
+    out[length - 1] = seed
+    if m:
+        out[length:] = np.convolve(tail, decay[:m])[:m] + seed * carry[:m]
+    return out
+
+def _ema_values(values, length):
+    """EMA of a float64 array, with TA-Lib's C implementation when installed"""
+    if TALIB_AVAILABLE:
+        return talib.EMA(values, timeperiod=length)
+    if values.size <= _EMA_CONVOLVE_MAX_BARS and not np.isnan(values).any():
+        return _ema_convolve(values, length)
+    return _ta_array(ta.ema(pd.Series(values), length=length), values.size)
+
+def _ema(prices, length):
+    """EMA of a price Series, with TA-Lib's C implementation when installed"""
+    # Copied so the caller gets a writable Series and the cached array stays untouched
+    return pd.Series(_cached(('ema', length), prices, lambda values: _ema_values(values, length)),
+                     index=prices.index, copy=True)
+
+def _ema_batch(prices, periods):
+    """
+    EMAs of every row of a price matrix for every period
+    
+    Args:
+        prices (numpy.ndarray): 2-D float64 prices, one series per row
+        periods (numpy.ndarray): int64 EMA periods
+        
+    Returns:
+        numpy.ndarray: Shape (rows, len(periods), columns)
+    """
+    out = np.empty((prices.shape[0], periods.size, prices.shape[1]))
+    for i, row in enumerate(prices):
+        if NUMBA_AVAILABLE:
+            # All periods as lanes of one compiled pass over the row
+            out[i] = _ema_multi_nb(row, periods)
+        else:
+            for j, period in enumerate(periods):
+                out[i, j] = _ema_values(row, int(period))
+    return out
+
+def _as_price_matrix(prices):
+    """2-D float64 view of 1-D or 2-D prices, and whether the input was 1-D"""
+    prices = np.asarray(prices, dtype=np.float64)
+    return np.atleast_2d(prices), prices.ndim == 1
+
+def _rsi_values(prices, length):
+    """RSI array of a price Series, with TA-Lib's C implementation when installed"""
+    def compute(values):
+        if TALIB_AVAILABLE:
+            return talib.RSI(values, timeperiod=length)
+        return _ta_array(ta.rsi(pd.Series(values), length=length), values.size)
+    
+    return _cached(('rsi', length), prices, compute)
+
+def _rsi(prices, length):
+    """RSI of a price Series, with TA-Lib's C implementation when installed"""
+    # Copied so the caller gets a writable Series and the cached array stays untouched
+    return pd.Series(_rsi_values(prices, length), index=prices.index, copy=True)
+
+def _macd(prices, fast, slow, signal):
+    """MACD line, signal line and histogram arrays of a price Series"""
+    def compute(values):
+        if TALIB_AVAILABLE:
+            return tuple(talib.MACD(values, fastperiod=fast, slowperiod=slow, signalperiod=signal))
+        
+        # pandas_ta orders the columns MACD, histogram, signal
+        macd = ta.macd(pd.Series(values), fast=fast, slow=slow, signal=signal)
+        return (
+            macd.iloc[:, 0].to_numpy(),
+            macd.iloc[:, 2].to_numpy(),
+            macd.iloc[:, 1].to_numpy()
+        )
+    
+    return _cached(('macd', fast, slow, signal), prices, compute)
+
+def _bbands(prices, length, num_std):
+    """Upper, middle and lower Bollinger Band arrays of a price Series"""
+    if TALIB_AVAILABLE:
+        return talib.BBANDS(prices.to_numpy(dtype=np.float64), timeperiod=length,
+                            nbdevup=num_std, nbdevdn=num_std, matype=0)
+    
+    # pandas_ta orders the columns lower, middle, upper (then bandwidth and %B)
+    bbands = ta.bbands(prices, length=length, std=num_std)
+    return (
+        bbands.iloc[:, 2].to_numpy(),
+        bbands.iloc[:, 1].to_numpy(),
+        bbands.iloc[:, 0].to_numpy()
+    )
+
+def _extract_close(data):
+    """Close prices of a DataFrame, or the Series itself; None without a 'close' column"""
+    return data if isinstance(data, pd.Series) else data.get('close')
+
+def _read_only(attr):
+    """
+    Read-only property over the ``_<attr>`` slot, so values derived from it in
+    ``__init__`` cannot go stale and instances shared by IndicatorFactory
+    cannot be changed by one of their callers
+    """
+    return property(operator.attrgetter('_' + attr), doc=f"{attr} (read-only, fixed at construction)")
+
 class Indicator:
     """Base class for technical indicators"""
     
+    __slots__ = ('_name',)
+    
+    name = _read_only('name')
+    
     def __init__(self, name):
-        self.name = name
-        logger.info(f"Initialized {self.name} indicator")
+        self._name = name
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} indicator")
         
     def calculate(self, data):
         """Calculate the indicator values
@@ -37,10 +233,15 @@ class Indicator:
 class EMAIndicator(Indicator):
     """Exponential Moving Average indicator"""
     
+    __slots__ = ('_period',)
+    
+    period = _read_only('period')
+    
     def __init__(self, period=20):
         super().__init__(f"EMA-{period}")
-        self.period = period
-        logger.info(f"Initialized {self.name} with period={period}")
+        self._period = period
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} with period={period}")
     
     def calculate(self, data):
         """Calculate EMA values
@@ -51,20 +252,30 @@ class EMAIndicator(Indicator):
         Returns:
             pandas.Series: EMA values
         """
-        if isinstance(data, pd.DataFrame):
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
-        else:
-            prices = data
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
         if len(prices) < self.period:
             logger.warning(f"Not enough data for {self.name}. Need at least {self.period} data points.")
             return None
             
-        # Using pandas_ta for more reliable EMA calculation
-        return ta.ema(prices, length=self.period)
+        return _ema(prices, self.period)
+    
+    def calculate_batch(self, prices, periods):
+        """Calculate EMAs for many periods (and price series) at once, for parameter sweeps
+        
+        Args:
+            prices (numpy.ndarray): Close prices, 1-D or 2-D with one series per row
+            periods (sequence of int): EMA periods
+            
+        Returns:
+            numpy.ndarray: EMAs of shape (len(periods), n), or (rows, len(periods), n) for 2-D prices
+        """
+        matrix, one_dim = _as_price_matrix(prices)
+        emas = _ema_batch(matrix, np.asarray(periods, dtype=np.int64))
+        return emas[0] if one_dim else emas
     
     def get_signal(self, data, fast_period=12, slow_period=26):
         """Generate signals based on EMA crossover
@@ -77,43 +288,51 @@ class EMAIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'fast_ema', 'slow_ema', and 'signal' columns
         """
-        if isinstance(data, pd.Series):
-            prices = data
-        else:
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
         if len(prices) < max(fast_period, slow_period):
             logger.warning(f"Not enough data for EMA crossover. Need at least {max(fast_period, slow_period)} data points.")
             return None
         
-        # Calculate fast and slow EMAs using pandas_ta
-        fast_ema = ta.ema(prices, length=fast_period)
-        slow_ema = ta.ema(prices, length=slow_period)
-        
-        # Create result DataFrame
-        result = pd.DataFrame(index=prices.index)
-        result['fast_ema'] = fast_ema
-        result['slow_ema'] = slow_ema
-        
-        # Generate signals
-        result['signal'] = 0.0
-        result['signal'] = np.where(result['fast_ema'] > result['slow_ema'], 1.0, 0.0)
-        result['position'] = result['signal'].diff()
-        
-        return result
+        # Calculate fast and slow EMAs
+        fast_ema = _ema(prices, fast_period)
+        slow_ema = _ema(prices, slow_period)
+        
+        # Long while the fast EMA is above the slow one; position marks the changes
+        signal = (fast_ema.to_numpy() > slow_ema.to_numpy()).astype(np.float64)
+        position = np.empty_like(signal)
+        position[0] = np.nan
+        position[1:] = np.diff(signal)
+        
+        return pd.DataFrame({
+            'fast_ema': fast_ema,
+            'slow_ema': slow_ema,
+            'signal': signal,
+            'position': position
+        }, index=prices.index)
 
 class RSIIndicator(Indicator):
     """Relative Strength Index indicator"""
     
+    __slots__ = ('_period', '_oversold', '_overbought', '_oversold_f32', '_overbought_f32')
+    
+    period = _read_only('period')
+    oversold = _read_only('oversold')
+    overbought = _read_only('overbought')
+    
     def __init__(self, period=14, oversold=30, overbought=70):
         super().__init__(f"RSI-{period}")
-        self.period = period
-        self.oversold = oversold
-        self.overbought = overbought
-        logger.info(f"Initialized {self.name} with period={period}, oversold={oversold}, overbought={overbought}")
+        self._period = period
+        self._oversold = oversold
+        self._overbought = overbought
+        # Thresholds in the dtype of the RSI values they are compared against
+        self._oversold_f32 = np.float32(oversold)
+        self._overbought_f32 = np.float32(overbought)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} with period={period}, oversold={oversold}, overbought={overbought}")
     
     def calculate(self, data):
         """Calculate RSI values
@@ -124,20 +343,16 @@ class RSIIndicator(Indicator):
         Returns:
             pandas.Series: RSI values
         """
-        if isinstance(data, pd.DataFrame):
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
-        else:
-            prices = data
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
         if len(prices) < self.period:
             logger.warning(f"Not enough data for {self.name}. Need at least {self.period} data points.")
             return None
         
-        # Use pandas_ta for more reliable RSI calculation
-        return ta.rsi(prices, length=self.period)
+        return _rsi(prices, self.period)
     
     def get_signal(self, data):
         """Generate signals based on RSI values
@@ -148,38 +363,41 @@ class RSIIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'rsi' and 'signal' columns
         """
-        if isinstance(data, pd.Series):
-            prices = data
-        else:
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
-        rsi = self.calculate(prices)
-        if rsi is None:
+        if len(prices) < self.period:
+            logger.warning(f"Not enough data for {self.name}. Need at least {self.period} data points.")
             return None
         
-        # Create result DataFrame
-        result = pd.DataFrame(index=prices.index)
-        result['rsi'] = rsi
+        # Work on the raw RSI array. It is bounded to [0, 100] and only compared
+        # against thresholds, so float32 is plenty
+        r = _rsi_values(prices, self.period).astype(np.float32)
         
-        # Generate signals
-        result['signal'] = 0.0
-        result['signal'] = np.where(result['rsi'] < self.oversold, 1.0, 0.0)  # Buy when oversold
-        result['signal'] = np.where(result['rsi'] > self.overbought, -1.0, result['signal'])  # Sell when overbought
+        # Sell when overbought, buy when oversold
+        signal = np.select([r > self._overbought_f32, r < self._oversold_f32], [-1.0, 1.0], default=0.0)
         
-        return result
+        return pd.DataFrame({'rsi': r, 'signal': signal}, index=prices.index)
 
 class MACDIndicator(Indicator):
     """Moving Average Convergence Divergence indicator"""
     
+    __slots__ = ('_fast_period', '_slow_period', '_signal_period', '_min_bars')
+    
+    fast_period = _read_only('fast_period')
+    slow_period = _read_only('slow_period')
+    signal_period = _read_only('signal_period')
+    
     def __init__(self, fast_period=12, slow_period=26, signal_period=9):
         super().__init__(f"MACD-{fast_period}-{slow_period}-{signal_period}")
-        self.fast_period = fast_period
-        self.slow_period = slow_period
-        self.signal_period = signal_period
-        logger.info(f"Initialized {self.name} with fast_period={fast_period}, slow_period={slow_period}, signal_period={signal_period}")
+        self._fast_period = fast_period
+        self._slow_period = slow_period
+        self._signal_period = signal_period
+        self._min_bars = slow_period + signal_period
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} with fast_period={fast_period}, slow_period={slow_period}, signal_period={signal_period}")
     
     def calculate(self, data):
         """Calculate MACD values
@@ -190,28 +408,56 @@ class MACDIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'macd', 'signal_line', and 'histogram' columns
         """
-        if isinstance(data, pd.DataFrame):
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
-        else:
-            prices = data
-            
-        if len(prices) < self.slow_period + self.signal_period:
-            logger.warning(f"Not enough data for {self.name}. Need at least {self.slow_period + self.signal_period} data points.")
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
             return None
         
-        # Use pandas_ta for more reliable MACD calculation
-        macd = ta.macd(prices, fast=self.fast_period, slow=self.slow_period, signal=self.signal_period)
+        columns = self._columns(prices)
+        if columns is None:
+            return None
+        return pd.DataFrame(columns, index=prices.index)
+    
+    def _columns(self, prices):
+        """MACD line, signal line and histogram arrays by column name, or None if prices are too short"""
+        if len(prices) < self._min_bars:
+            logger.warning(f"Not enough data for {self.name}. Need at least {self._min_bars} data points.")
+            return None
         
-        # Create result DataFrame
-        result = pd.DataFrame(index=prices.index)
-        result['macd'] = macd['MACD_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
-        result['signal_line'] = macd['MACDs_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
-        result['histogram'] = macd['MACDh_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
+        macd, signal_line, histogram = _macd(prices, self.fast_period, self.slow_period, self.signal_period)
+        return {'macd': macd, 'signal_line': signal_line, 'histogram': histogram}
+    
+    def calculate_batch(self, prices, fast_periods, slow_periods):
+        """Calculate MACD for many (fast, slow) period pairs at once, for parameter sweeps
         
-        return result
+        Every distinct period's EMA is computed once and shared by the pairs using it.
+        The signal line uses this indicator's signal_period.
+        
+        Args:
+            prices (numpy.ndarray): Close prices, 1-D or 2-D with one series per row
+            fast_periods (sequence of int): Fast EMA period of each pair
+            slow_periods (sequence of int): Slow EMA period of each pair
+            
+        Returns:
+            dict: 'macd', 'signal_line' and 'histogram' arrays of shape (pairs, n),
+                or (rows, pairs, n) for 2-D prices
+        """
+        matrix, one_dim = _as_price_matrix(prices)
+        periods, index = np.unique(np.concatenate([fast_periods, slow_periods]).astype(np.int64),
+                                   return_inverse=True)
+        emas = _ema_batch(matrix, periods)
+        
+        pairs = len(fast_periods)
+        macd = emas[:, index[:pairs]] - emas[:, index[pairs:]]
+        signal_line = np.full_like(macd, np.nan)
+        for line, out in zip(macd.reshape(-1, macd.shape[-1]), signal_line.reshape(-1, macd.shape[-1])):
+            # Seed the signal EMA from the first complete MACD value
+            valid = np.flatnonzero(~np.isnan(line))
+            if valid.size:
+                out[valid[0]:] = _ema_values(line[valid[0]:], self.signal_period)
+        
+        result = {'macd': macd, 'signal_line': signal_line, 'histogram': macd - signal_line}
+        return {name: arr[0] for name, arr in result.items()} if one_dim else result
     
     def get_signal(self, data):
         """Generate signals based on MACD values
@@ -222,43 +468,42 @@ class MACDIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'macd', 'signal_line', 'histogram', and 'signal' columns
         """
-        if isinstance(data, pd.Series):
-            prices = data
-        else:
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
-        macd_data = self.calculate(prices)
-        if macd_data is None:
+        columns = self._columns(prices)
+        if columns is None:
             return None
         
-        # Generate signals
-        macd_data['signal'] = 0.0
+        # Crossovers are sign changes of the MACD - signal line spread
+        diff = columns['macd'] - columns['signal_line']
+        prev = np.empty_like(diff)
+        prev[0] = diff[0]
+        prev[1:] = diff[:-1]
         
-        # Buy when MACD line crosses above signal line
-        macd_data['signal'] = np.where(
-            (macd_data['macd'] > macd_data['signal_line']) & 
-            (macd_data['macd'].shift(1) <= macd_data['signal_line'].shift(1)),
-            1.0, 0.0)
+        # Buy when MACD line crosses above signal line, sell when it crosses below
+        columns['signal'] = np.where(
+            (diff > 0) & (prev <= 0), 1.0,
+            np.where((diff < 0) & (prev >= 0), -1.0, 0.0))
         
-        # Sell when MACD line crosses below signal line
-        macd_data['signal'] = np.where(
-            (macd_data['macd'] < macd_data['signal_line']) & 
-            (macd_data['macd'].shift(1) >= macd_data['signal_line'].shift(1)),
-            -1.0, macd_data['signal'])
-        
-        return macd_data
+        return pd.DataFrame(columns, index=prices.index)
 
 class BollingerBandsIndicator(Indicator):
     """Bollinger Bands indicator"""
     
+    __slots__ = ('_period', '_num_std')
+    
+    period = _read_only('period')
+    num_std = _read_only('num_std')
+    
     def __init__(self, period=20, num_std=2):
         super().__init__(f"BB-{period}-{num_std}")
-        self.period = period
-        self.num_std = num_std
-        logger.info(f"Initialized {self.name} with period={period}, num_std={num_std}")
+        self._period = period
+        self._num_std = num_std
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} with period={period}, num_std={num_std}")
     
     def calculate(self, data):
         """Calculate Bollinger Bands values
@@ -269,28 +514,24 @@ class BollingerBandsIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'middle_band', 'upper_band', and 'lower_band' columns
         """
-        if isinstance(data, pd.DataFrame):
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
-        else:
-            prices = data
-            
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
+        
+        columns = self._columns(prices)
+        if columns is None:
+            return None
+        return pd.DataFrame(columns, index=prices.index)
+    
+    def _columns(self, prices):
+        """Middle, upper and lower band arrays by column name, or None if prices are too short"""
         if len(prices) < self.period:
             logger.warning(f"Not enough data for {self.name}. Need at least {self.period} data points.")
             return None
         
-        # Use pandas_ta for more reliable Bollinger Bands calculation
-        bbands = ta.bbands(prices, length=self.period, std=self.num_std)
-        
-        # Create result DataFrame
-        result = pd.DataFrame(index=prices.index)
-        result['middle_band'] = bbands['BBM_' + str(self.period) + '_' + str(self.num_std) + '.0']
-        result['upper_band'] = bbands['BBU_' + str(self.period) + '_' + str(self.num_std) + '.0']
-        result['lower_band'] = bbands['BBL_' + str(self.period) + '_' + str(self.num_std) + '.0']
-        
-        return result
+        upper_band, middle_band, lower_band = _bbands(prices, self.period, self.num_std)
+        return {'middle_band': middle_band, 'upper_band': upper_band, 'lower_band': lower_band}
     
     def get_signal(self, data):
         """Generate signals based on Bollinger Bands values
@@ -301,41 +542,61 @@ class BollingerBandsIndicator(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with 'middle_band', 'upper_band', 'lower_band', and 'signal' columns
         """
-        if isinstance(data, pd.Series):
-            prices = data
-        else:
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
-        bb_data = self.calculate(prices)
-        if bb_data is None:
+        columns = self._columns(prices)
+        if columns is None:
             return None
         
-        # Create result DataFrame with price data
-        result = bb_data.copy()
-        result['close'] = prices
+        # The bands are only compared against the price here, so keep them in float32
+        for name in ('middle_band', 'upper_band', 'lower_band'):
+            columns[name] = columns[name].astype(np.float32)
+        close = prices.to_numpy()
+        columns['close'] = close
         
-        # Generate signals
-        result['signal'] = 0.0
-        result['signal'] = np.where(result['close'] < result['lower_band'], 1.0, 0.0)  # Buy when price below lower band
-        result['signal'] = np.where(result['close'] > result['upper_band'], -1.0, result['signal'])  # Sell when price above upper band
+        # Sell when price above upper band, buy when price below lower band
+        close32 = close.astype(np.float32)
+        columns['signal'] = np.select(
+            [close32 > columns['upper_band'], close32 < columns['lower_band']],
+            [-1.0, 1.0], default=0.0)
         
-        return result
+        return pd.DataFrame(columns, index=prices.index)
 
 class DualMACD_RSI_Strategy(Indicator):
     """Combined MACD and RSI strategy with dual timeframe confirmation"""
     
+    __slots__ = ('_rsi_period', '_fast_period', '_slow_period', '_signal_period', '_oversold', '_overbought',
+                 '_min_bars', '_cache_key', '_buy_rsi', '_sell_rsi', '_trend_lookback')
+    
+    rsi_period = _read_only('rsi_period')
+    fast_period = _read_only('fast_period')
+    slow_period = _read_only('slow_period')
+    signal_period = _read_only('signal_period')
+    oversold = _read_only('oversold')
+    overbought = _read_only('overbought')
+    
     def __init__(self, rsi_period=14, fast_period=12, slow_period=26, signal_period=9, oversold=30, overbought=70):
         super().__init__(f"DualMACD_RSI-{fast_period}-{slow_period}-{rsi_period}")
-        self.rsi_period = rsi_period
-        self.fast_period = fast_period
-        self.slow_period = slow_period
-        self.signal_period = signal_period
-        self.oversold = oversold
-        self.overbought = overbought
-        logger.info(f"Initialized {self.name} with RSI period={rsi_period}, MACD parameters={fast_period}-{slow_period}-{signal_period}")
+        self._rsi_period = rsi_period
+        self._fast_period = fast_period
+        self._slow_period = slow_period
+        self._signal_period = signal_period
+        self._oversold = oversold
+        self._overbought = overbought
+        # Fixed per instance: minimum history, cache key and the near-threshold RSI levels
+        self._min_bars = max(slow_period + signal_period, rsi_period)
+        self._cache_key = ('macd_rsi', fast_period, slow_period, signal_period, rsi_period)
+        self._buy_rsi = oversold + 5
+        self._sell_rsi = overbought - 5
+        # Higher timeframe bars used for its trend. The slow EMA's SMA seed decays
+        # slowest: over five times the MACD warm-up it keeps a weight of about
+        # (1 - 2 / (slow + 1)) ** (4 * slow + 5 * signal), ~1e-5 for 12-26-9
+        self._trend_lookback = 5 * (slow_period + signal_period)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Initialized {self.name} with RSI period={rsi_period}, MACD parameters={fast_period}-{slow_period}-{signal_period}")
     
     def calculate(self, data):
         """Calculate MACD and RSI values for a dataframe
@@ -344,36 +605,42 @@ class DualMACD_RSI_Strategy(Indicator):
             data (pandas.DataFrame): Price data with 'close' column
             
         Returns:
-            pandas.DataFrame: DataFrame with indicator values added
+            pandas.DataFrame: DataFrame with 'close', 'rsi', 'macd', 'signal_line' and
+                'histogram' columns on the index of the price data
         """
-        if isinstance(data, pd.DataFrame):
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-            prices = data['close']
-        else:
-            prices = data
-            data = pd.DataFrame({'close': prices})
+        prices = _extract_close(data)
+        if prices is None:
+            logger.error("DataFrame must contain 'close' column")
+            return None
             
-        if len(prices) < max(self.slow_period + self.signal_period, self.rsi_period):
-            logger.warning(f"Not enough data for {self.name}. Need at least {max(self.slow_period + self.signal_period, self.rsi_period)} data points.")
+        if len(prices) < self._min_bars:
+            logger.warning(f"Not enough data for {self.name}. Need at least {self._min_bars} data points.")
             return None
         
-        # Create result DataFrame
-        result = data.copy()
-        
-        # Calculate RSI
-        result['rsi'] = ta.rsi(prices, length=self.rsi_period)
-        
-        # Calculate MACD
-        macd = ta.macd(prices, fast=self.fast_period, slow=self.slow_period, signal=self.signal_period)
-        
-        # Add MACD columns to result
-        result['macd'] = macd['MACD_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
-        result['signal_line'] = macd['MACDs_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
-        result['histogram'] = macd['MACDh_' + str(self.fast_period) + '_' + str(self.slow_period) + '_' + str(self.signal_period)]
-        
-        return result
+        if NUMBA_AVAILABLE:
+            # RSI and MACD together in a single compiled pass over the prices
+            rsi, macd, signal_line, histogram = _cached(
+                self._cache_key,
+                prices,
+                lambda values: _macd_rsi_nb(values, self.fast_period, self.slow_period,
+                                            self.signal_period, self.rsi_period)
+            )
+        else:
+            # Calculate RSI
+            rsi = _rsi_values(prices, self.rsi_period)
+            
+            # Calculate MACD
+            macd, signal_line, histogram = _macd(prices, self.fast_period, self.slow_period, self.signal_period)
+        
+        # Build the result from the close and the indicator columns only, rather
+        # than copying every column of the input frame
+        return pd.DataFrame({
+            'close': prices.to_numpy(),
+            'rsi': rsi,
+            'macd': macd,
+            'signal_line': signal_line,
+            'histogram': histogram
+        }, index=prices.index)
     
     def get_signal(self, data, higher_tf_data=None):
         """Generate signals based on MACD and RSI with dual timeframe confirmation
@@ -385,14 +652,6 @@ class DualMACD_RSI_Strategy(Indicator):
         Returns:
             pandas.DataFrame: DataFrame with indicator values and signals
         """
-        if isinstance(data, pd.Series):
-            prices = data
-            data = pd.DataFrame({'close': prices})
-        else:
-            if 'close' not in data.columns:
-                logger.error("DataFrame must contain 'close' column")
-                return None
-        
         # Calculate indicators for current timeframe
         result = self.calculate(data)
         if result is None:
@@ -405,7 +664,7 @@ class DualMACD_RSI_Strategy(Indicator):
         # 1. RSI is oversold or close to it
         # 2. MACD line crosses above signal line
         buy_condition = (
-            (result['rsi'] < self.oversold + 5) &
+            (result['rsi'] < self._buy_rsi) &
             (result['macd'] > result['signal_line']) &
             (result['macd'].shift(1) <= result['signal_line'].shift(1))
         )
@@ -414,7 +673,7 @@ class DualMACD_RSI_Strategy(Indicator):
         # 1. RSI is overbought or close to it
         # 2. MACD line crosses below signal line
         sell_condition = (
-            (result['rsi'] > self.overbought - 5) &
+            (result['rsi'] > self._sell_rsi) &
             (result['macd'] < result['signal_line']) &
             (result['macd'].shift(1) >= result['signal_line'].shift(1))
         )
@@ -425,27 +684,27 @@ class DualMACD_RSI_Strategy(Indicator):
         
         # Apply higher timeframe confirmation if provided
         if higher_tf_data is not None:
-            if isinstance(higher_tf_data, pd.Series):
-                higher_tf_data = pd.DataFrame({'close': higher_tf_data})
-            elif 'close' not in higher_tf_data.columns:
+            higher_tf_prices = _extract_close(higher_tf_data)
+            if higher_tf_prices is None:
                 logger.error("Higher timeframe DataFrame must contain 'close' column")
                 return result  # Return without higher timeframe confirmation
             
-            higher_tf_result = self.calculate(higher_tf_data)
-            
-            if higher_tf_result is not None:
-                # Get the trend from higher timeframe
-                higher_tf_trend = higher_tf_result['macd'].iloc[-1] > higher_tf_result['signal_line'].iloc[-1]
+            if len(higher_tf_prices) < self._min_bars:
+                logger.warning(f"Not enough data for {self.name}. Need at least {self._min_bars} data points.")
+            else:
+                # Get the trend from higher timeframe. Only the last MACD values are needed,
+                # so run it over a tail long enough for the EMA seeds to have decayed
+                tail = higher_tf_prices.iloc[-self._trend_lookback:]
+                macd, signal_line, _ = _macd(tail, self.fast_period, self.slow_period, self.signal_period)
+                higher_tf_trend = bool(macd[-1] > signal_line[-1])
                 result['higher_tf_bullish'] = higher_tf_trend
                 
                 # Filter signals based on higher timeframe trend
                 # Only keep buy signals if higher timeframe is bullish
                 # Only keep sell signals if higher timeframe is bearish
-                for i in range(len(result)):
-                    if result['signal'].iloc[i] == 1.0 and not higher_tf_trend:
-                        result.at[result.index[i], 'signal'] = 0.0
-                    elif result['signal'].iloc[i] == -1.0 and higher_tf_trend:
-                        result.at[result.index[i], 'signal'] = 0.0
+                bullish = higher_tf_trend
+                signal = result['signal'].to_numpy()
+                result['signal'] = np.where(signal == (-1.0 if bullish else 1.0), 0.0, signal)
         
         return result
 
@@ -461,18 +720,29 @@ class IndicatorFactory:
             **params: Parameters to pass to the indicator constructor
             
         Returns:
-            Indicator: An instance of the requested indicator
+            Indicator: An instance of the requested indicator. Instances are cached per
+                name and parameters and shared between callers; their parameters are read-only
         """
-        indicators = {
-            'ema': EMAIndicator,
-            'rsi': RSIIndicator,
-            'macd': MACDIndicator,
-            'bollinger_bands': BollingerBandsIndicator,
-            'dual_macd_rsi': DualMACD_RSI_Strategy
-        }
-        
-        if indicator_name not in indicators:
+        if indicator_name not in _INDICATORS:
             logger.error(f"Indicator '{indicator_name}' not found")
             return None
         
-        return indicators[indicator_name](**params) 
\ No newline at end of file
+        try:
+            return _get_indicator_cached(indicator_name, tuple(sorted(params.items())))
+        except TypeError:
+            # Unhashable parameter values cannot be cached
+            return _INDICATORS[indicator_name](**params)
+
+_INDICATORS = {
+    'ema': EMAIndicator,
+    'rsi': RSIIndicator,
+    'macd': MACDIndicator,
+    'bollinger_bands': BollingerBandsIndicator,
+    'dual_macd_rsi': DualMACD_RSI_Strategy
+}
+
+@functools.lru_cache(maxsize=1024)
+def _get_indicator_cached(indicator_name, params):
+    """Shared indicator instance for a name and sorted (name, value) parameter pairs"""
+    return _INDICATORS[indicator_name](**dict(params))
+ 
\ No newline at end of file
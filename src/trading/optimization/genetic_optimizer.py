@@ -2,8 +2,12 @@ import numpy as np
 import pandas as pd
 import logging
 import random
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Any, Callable, Optional, Union
 import time
+from collections import OrderedDict
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -15,6 +19,137 @@ except ImportError:
     logger.warning("DEAP library not available. Genetic optimization will use simple implementation.")
     DEAP_AVAILABLE = False
 
+from src.trading._numba import njit
+
+
+# Fitness function of a worker process, installed once per worker by
+# _init_worker so tasks only carry their params dict
+_worker_fitness_function = None
+
+
+def _init_worker(fitness_function, worker_init, worker_init_args):
+    """Executor initializer: keep the fitness function, then run the user's initializer"""
+    global _worker_fitness_function
+    _worker_fitness_function = fitness_function
+    if worker_init is not None:
+        worker_init(*worker_init_args)
+
+
+def _eval_worker(params):
+    """Evaluate one params dict with the worker's fitness function; module-level so it pickles"""
+    return _safe_fitness(_worker_fitness_function, params)
+
+
+def _safe_fitness(fitness_function, params):
+    """Fitness of params, or -inf if the fitness function raises"""
+    try:
+        return fitness_function(params)
+    except Exception as e:
+        logger.error(f"Error evaluating individual: {e}")
+        return -float('inf')
+
+
+def _fitness_key(ind):
+    """First fitness value of a DEAP individual; module-level so it pickles"""
+    return ind.fitness.values[0]
+
+
+@njit(cache=True)
+def _mutate_nb(individual, lows, highs, int_mask, steps, gene_draws, value_draws):
+    """
+    Redraw each gene with 20% chance: integer genes uniform over [min, max],
+    float genes uniform over [min, max] snapped to the ``steps`` grid.
+    ``gene_draws`` and ``value_draws`` hold one uniform [0, 1) draw per gene.
+    
+    Returns True if any gene changed value.
+    """
+    changed = False
+    for g in range(individual.shape[0]):
+        if gene_draws[g] < 0.2:
+            if int_mask[g]:
+                gene = min(
+                    np.floor(lows[g] + value_draws[g] * (highs[g] - lows[g] + 1)),
+                    highs[g]
+                )
+            else:
+                offset = value_draws[g] * (highs[g] - lows[g])
+                gene = lows[g] + np.floor(offset / steps[g] + 0.5) * steps[g]
+            changed = changed or gene != individual[g]
+            individual[g] = gene
+    return changed
+
+
+@njit(cache=True)
+def _make_child_nb(row, primary, secondary, point1, point2, mutate,
+                   lows, highs, int_mask, steps, gene_draws, value_draws):
+    """
+    Write into ``row`` the ``primary`` parent with genes [point1, point2)
+    taken from ``secondary``, then mutate it if ``mutate``.
+    
+    Returns True if the child differs from ``primary``.
+    """
+    row[:] = primary
+    changed = False
+    for g in range(point1, point2):
+        if secondary[g] != primary[g]:
+            row[g] = secondary[g]
+            changed = True
+    if mutate:
+        changed = _mutate_nb(row, lows, highs, int_mask, steps, gene_draws, value_draws) or changed
+    return changed
+
+
+@njit(cache=True)
+def _evolve_nb(population, fitness, elite_idx, next_population, next_fitness, next_valid,
+               lows, highs, int_mask, steps, mutation_probability,
+               parents, cuts, mut_draws, gene_draws, value_draws):
+    """
+    Build the next generation into ``next_population``: elitism, two-point
+    crossover of the pre-selected ``parents`` and per-gene mutation.
+    
+    All randomness is drawn up front by the caller, one entry per child
+    (``parents``, ``mut_draws``, ``gene_draws``, ``value_draws``) or per
+    mating pair (``cuts``: sorted crossover points, equal when the pair
+    does not cross over).
+    
+    Rows identical to an individual of ``population`` (the elite and any
+    child left unchanged by crossover and mutation) inherit its fitness in
+    ``next_fitness`` and are flagged in ``next_valid``; the others need
+    evaluation.
+    """
+    pop_size = population.shape[0]
+    
+    # Elitism - keep best individual
+    next_population[0, :] = population[elite_idx]
+    next_fitness[0] = fitness[elite_idx]
+    next_valid[0] = True
+    
+    for pair in range(cuts.shape[0]):
+        child1 = 2 * pair
+        child2 = child1 + 1
+        
+        # Parents are read as rows of ``population``; children are written
+        # straight into their ``next_population`` rows
+        parent1 = parents[child1]
+        parent2 = parents[child2]
+        
+        # Two-point crossover: children swap the genes in [point1, point2)
+        point1 = cuts[pair, 0]
+        point2 = cuts[pair, 1]
+        
+        for child, primary, secondary in ((child1, parent1, parent2), (child2, parent2, parent1)):
+            row = 1 + child
+            if row >= pop_size:
+                break
+            changed = _make_child_nb(
+                next_population[row], population[primary], population[secondary],
+                point1, point2, mut_draws[child] < mutation_probability,
+                lows, highs, int_mask, steps, gene_draws[child], value_draws[child]
+            )
+            next_valid[row] = not changed
+            next_fitness[row] = fitness[primary]
+
+
 class GeneticOptimizer:
     """
     Genetic algorithm based optimizer for trading strategy parameters.
@@ -26,9 +161,18 @@ class GeneticOptimizer:
                 generations: int = 100,
                 parameter_ranges: Dict[str, Tuple] = None,
                 fitness_function: Callable = None,
+                batched_fitness_function: Optional[Callable[[np.ndarray, List[str]], np.ndarray]] = None,
                 crossover_probability: float = 0.7,
                 mutation_probability: float = 0.2,
-                tournament_size: int = 3):
+                tournament_size: int = 3,
+                float_resolution: int = 256,
+                cache_max: Optional[int] = 2**15,
+                n_workers: Optional[int] = None,
+                worker_init: Optional[Callable] = None,
+                worker_init_args: Tuple = (),
+                seed: Optional[int] = None,
+                patience: Optional[int] = None,
+                min_delta: float = 0.0):
         """
         Initialize the genetic optimizer.
         
@@ -37,9 +181,25 @@ class GeneticOptimizer:
             generations: Number of generations to evolve
             parameter_ranges: Dictionary of parameter names and (min, max) tuples
             fitness_function: Function that evaluates parameters and returns fitness
+            batched_fitness_function: Optional function taking a (n, n_genes) array
+                of parameter sets and the parameter names, returning n fitness
+                values; used instead of ``fitness_function`` when set
             crossover_probability: Probability of crossover
             mutation_probability: Probability of mutation
             tournament_size: Tournament selection size
+            float_resolution: Number of grid steps across each float range; float
+                genes are snapped to this lattice so repeated genotypes hit the
+                fitness cache
+            cache_max: Most fitness values kept in the cache; the least recently
+                used are evicted beyond this (None for unbounded)
+            n_workers: Worker processes for fitness evaluation (defaults to CPU count)
+            worker_init: Called once in each worker process before any evaluation,
+                e.g. to load the market data the fitness function reads
+            worker_init_args: Positional arguments for ``worker_init``
+            seed: Seed for the random generator, for reproducible runs
+            patience: Stop after this many generations without the best fitness
+                improving by more than ``min_delta`` (None runs every generation)
+            min_delta: Minimum best-fitness gain that counts as an improvement
         """
         self.population_size = population_size
         self.generations = generations
@@ -47,6 +207,15 @@ class GeneticOptimizer:
         self.mutation_probability = mutation_probability
         self.tournament_size = tournament_size
         self.fitness_function = fitness_function
+        self.batched_fitness_function = batched_fitness_function
+        self.float_resolution = float_resolution
+        self.cache_max = cache_max
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.patience = patience
+        self.min_delta = min_delta
+        self.worker_init = worker_init
+        self.worker_init_args = tuple(worker_init_args)
+        self._executor = None
         self.parameter_ranges = parameter_ranges or {
             'rsi_period': (9, 25),
             'macd_fast': (8, 20),
@@ -56,6 +225,9 @@ class GeneticOptimizer:
             'sl_atr': (0.5, 3.0),
             'tp_ratio': (1.0, 4.0)
         }
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self._cache_parameter_layout()
         
         # Set up the genetic algorithm framework
         if DEAP_AVAILABLE:
@@ -66,10 +238,23 @@ class GeneticOptimizer:
         # Store results
         self.best_individual = None
         self.best_fitness = -float('inf')
-        self.history = []
+        self._allocate_history(0)
+        self.generations_run = 0
+        self._stale_gens = 0
+        
+        # Fitness memo: repeated genotypes skip the (expensive) fitness function.
+        # Kept in recency order so the least recently used entries evict first
+        self._fitness_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         
     def _setup_deap(self):
         """Set up DEAP genetic algorithm framework"""
+        self._setup_deap_static()
+        self._setup_deap_dynamic()
+        
+    def _setup_deap_static(self):
+        """Create the DEAP classes and register operators that do not depend on the ranges"""
         # Create fitness class that we want to maximize
         if not hasattr(creator, 'FitnessMax'):
             creator.create("FitnessMax", base.Fitness, weights=(1.0,))
@@ -80,242 +265,457 @@ class GeneticOptimizer:
         
         # Set up toolbox
         self.toolbox = base.Toolbox()
+        self._gene_generators = ()
         
-        # Register parameter generators
-        for name, (min_val, max_val) in self.parameter_ranges.items():
-            if isinstance(min_val, int) and isinstance(max_val, int):
-                self.toolbox.register(name, random.randint, min_val, max_val)
-            else:
-                # For float parameters
-                self.toolbox.register(name, random.uniform, min_val, max_val)
-        
-        # Register individual and population creation
-        attrs = tuple(self.parameter_ranges.keys())
-        self.toolbox.register("individual", self._create_individual, creator.Individual, attrs)
-        self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
+        # Register individual and population creation; both read the cached layout
+        self.toolbox.register("individual", self._create_individual, creator.Individual)
+        self.toolbox.register("population", self._create_population, creator.Individual)
         
-        # Register genetic operators
+        # Register genetic operators; evaluations go through the cached, pooled map
+        self.toolbox.register("map", self._map)
         self.toolbox.register("evaluate", self._evaluate_individual)
         self.toolbox.register("mate", tools.cxTwoPoint)
         self.toolbox.register("mutate", self._mutate_individual)
         self.toolbox.register("select", tools.selTournament, tournsize=self.tournament_size)
+        
+    def _setup_deap_dynamic(self):
+        """(Re-)register the per-parameter generators for the current ranges"""
+        for name in self._gene_generators:
+            self.toolbox.unregister(name)
+            
+        for index, name in enumerate(self._param_names):
+            self.toolbox.register(name, self._draw_gene, index)
+        self._gene_generators = self._param_names
     
-    def _create_individual(self, ind_class, attributes):
-        """Create an individual with specified attributes"""
-        ind = ind_class()
-        for attr in attributes:
-            gene = getattr(self.toolbox, attr)()
-            ind.append(gene)
-        return ind
+    def _cache_parameter_layout(self):
+        """Per-gene bounds, integer mask and grid steps as arrays for batched sampling"""
+        self._param_names = tuple(self.parameter_ranges.keys())
+        ranges = list(self.parameter_ranges.values())
+        self._int_flags = tuple(isinstance(lo, int) and isinstance(hi, int) for lo, hi in ranges)
+        self._int_mask = np.array(self._int_flags, dtype=bool)
+        self._lows = np.array([lo for lo, _ in ranges], dtype=np.float64)
+        self._highs = np.array([hi for _, hi in ranges], dtype=np.float64)
+        
+        # Integer genes live on a unit grid, float genes on float_resolution steps
+        steps = (self._highs - self._lows) / self.float_resolution
+        self._steps = np.where(self._int_mask | (steps <= 0), 1.0, steps)
+        
+    def _snap(self, genes):
+        """Snap genes (a row or a population matrix) onto the parameter grid"""
+        return self._lows + np.round((genes - self._lows) / self._steps) * self._steps
+        
+    def _random_population(self, size: int) -> np.ndarray:
+        """
+        Draw ``size`` random individuals in one batch.
+        
+        Returns:
+            (size, n_genes) array; integer genes are uniform over [min, max],
+            float genes are snapped to the parameter grid
+        """
+        # Integer genes sample [min, max + 1) and floor to stay uniform over [min, max]
+        upper = np.where(self._int_mask, self._highs + 1, self._highs)
+        population = self.rng.uniform(self._lows, upper, size=(size, len(self._lows)))
+        population[:, self._int_mask] = np.minimum(
+            np.floor(population[:, self._int_mask]), self._highs[self._int_mask]
+        )
+        return self._snap(population)
+        
+    def _to_individual(self, row) -> List:
+        """Convert a population row to a gene list with Python int/float genes"""
+        return [int(gene) if is_int else float(gene) for gene, is_int in zip(row, self._int_flags)]
+        
+    def _create_population(self, ind_class, n: int):
+        """Create ``n`` DEAP individuals from one batched draw"""
+        return [ind_class(self._to_individual(row)) for row in self._random_population(n)]
+        
+    def _create_individual(self, ind_class):
+        """Create one random DEAP individual"""
+        return ind_class(self._to_individual(self._random_population(1)[0]))
+        
+    def _draw_gene(self, index: int):
+        """Draw a random value for the gene at ``index``"""
+        return self._to_individual(self._random_population(1)[0])[index]
     
     def _mutate_individual(self, individual):
-        """Mutate an individual by randomly changing genes"""
-        for i, (name, (min_val, max_val)) in enumerate(self.parameter_ranges.items()):
-            # 20% chance to mutate each gene
-            if random.random() < 0.2:
-                if isinstance(min_val, int) and isinstance(max_val, int):
-                    individual[i] = random.randint(min_val, max_val)
-                else:
-                    individual[i] = random.uniform(min_val, max_val)
+        """Mutate an individual by redrawing each gene with 20% chance"""
+        redraw = self._to_individual(self._random_population(1)[0])
+        for i in np.flatnonzero(self.rng.random(len(individual)) < 0.2):
+            individual[i] = redraw[i]
         return individual,
     
+    def _cache_key(self, individual) -> tuple:
+        """Fitness cache key: the individual's position on the parameter grid"""
+        grid = np.rint((np.asarray(individual, dtype=np.float64) - self._lows) / self._steps)
+        return tuple(grid.astype(np.int64).tolist())
+        
+    def _to_params(self, individual) -> Dict[str, Any]:
+        """Convert individual (gene list or population row) to parameters dict"""
+        return dict(zip(self._param_names, self._to_individual(individual)))
+        
+    def _evaluate_population(self, population) -> np.ndarray:
+        """Fitness of every individual in ``population``"""
+        return self._score_population(population)[0]
+        
+    def _score_population(self, population, fitness_scores: np.ndarray = None,
+                          valid: np.ndarray = None) -> Tuple[np.ndarray, int]:
+        """
+        Evaluate a population, calling the fitness function only for genotypes
+        not seen before. Those run in the worker pool when one is active.
+        
+        Args:
+            population: Individuals to score (gene lists or population rows)
+            fitness_scores: Optional array to write the scores into
+            valid: Optional mask of rows whose score in ``fitness_scores`` is
+                already known; only the other rows are looked up or evaluated
+            
+        Returns:
+            Tuple of (fitness array, index of the fittest individual)
+        """
+        if fitness_scores is None:
+            fitness_scores = np.empty(len(population), dtype=np.float64)
+        todo = range(len(population)) if valid is None else np.flatnonzero(~valid)
+        keys = {i: self._cache_key(population[i]) for i in todo}
+        
+        pending = {}
+        for i, key in keys.items():
+            if key in self._fitness_cache:
+                self._fitness_cache.move_to_end(key)
+                self.cache_hits += 1
+            elif key in pending:
+                self.cache_hits += 1
+            else:
+                pending[key] = population[i]
+        self.cache_misses += len(pending)
+        
+        if pending:
+            results = self._evaluate_pending(list(pending.values()))
+            self._fitness_cache.update(zip(pending.keys(), results))
+            
+        for i, key in keys.items():
+            fitness_scores[i] = self._fitness_cache[key]
+            
+        # Evict only after assembling, so this generation's entries are all present
+        if self.cache_max is not None:
+            while len(self._fitness_cache) > self.cache_max:
+                self._fitness_cache.popitem(last=False)
+                
+        return fitness_scores, int(np.argmax(fitness_scores))
+        
+    def _evaluate_pending(self, individuals: List) -> List[float]:
+        """Run the fitness function on individuals that missed the cache"""
+        if self.batched_fitness_function is not None:
+            # Whole batch in one call so the user's kernel can share precomputation
+            batch = np.asarray(individuals, dtype=np.float64)
+            try:
+                results = self.batched_fitness_function(batch, list(self._param_names))
+                return np.asarray(results, dtype=np.float64).tolist()
+            except Exception as e:
+                logger.error(f"Error evaluating population batch: {e}")
+                return [-float('inf')] * len(individuals)
+                
+        tasks = [self._to_params(ind) for ind in individuals]
+        if self._executor is not None:
+            # Chunk tasks so each round trip to a worker carries several evaluations
+            chunksize = max(1, len(tasks) // (4 * self.n_workers))
+            return list(self._executor.map(_eval_worker, tasks, chunksize=chunksize))
+        return [_safe_fitness(self.fitness_function, params) for params in tasks]
+        
+    def _has_fitness_function(self) -> bool:
+        """True if either a per-individual or a batched fitness function is set"""
+        return self.fitness_function is not None or self.batched_fitness_function is not None
+        
     def _evaluate_individual(self, individual):
         """Convert individual to parameters dict and evaluate fitness"""
-        if not self.fitness_function:
+        if not self._has_fitness_function():
             raise ValueError("No fitness function provided")
             
-        # Convert individual to parameters dict
-        params = {}
-        for i, name in enumerate(self.parameter_ranges.keys()):
-            params[name] = individual[i]
+        return (self._evaluate_population([individual])[0],)
+        
+    def _map(self, func, iterable):
+        """DEAP toolbox.map: batch fitness evaluations, plain map for anything else"""
+        if func is self.toolbox.evaluate:
+            return [(fitness,) for fitness in self._evaluate_population(list(iterable))]
+        return list(map(func, iterable))
+        
+    def _create_executor(self):
+        """Worker processes for fitness evaluation, or None to evaluate serially"""
+        if self.n_workers <= 1 or self.batched_fitness_function is not None:
+            return None
             
-        # Call fitness function
         try:
-            fitness = self.fitness_function(params)
-            return (fitness,)
+            pickle.dumps((self.fitness_function, self.worker_init, self.worker_init_args))
         except Exception as e:
-            logger.error(f"Error evaluating individual: {e}")
-            return (-float('inf'),)
-    
+            logger.warning(f"Fitness function or worker initializer cannot be sent to "
+                           f"worker processes ({e}); "
+                           f"evaluating serially")
+            return None
+            
+        # The fitness function (and the data its closure holds) is sent once
+        # per worker through the initializer rather than with every task
+        return ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.fitness_function, self.worker_init, self.worker_init_args)
+        )
+        
+    def _select_parents(self, fitness_scores: np.ndarray, n_parents: int) -> np.ndarray:
+        """
+        Run ``n_parents`` tournaments at once.
+        
+        Returns:
+            Population indices of the tournament winners
+        """
+        idx = self.rng.integers(0, len(fitness_scores), size=(n_parents, self.tournament_size))
+        return idx[np.arange(n_parents), np.argmax(fitness_scores[idx], axis=1)]
+        
+    def _allocate_draws(self, pop_size: int, n_genes: int) -> Tuple[np.ndarray, ...]:
+        """
+        Buffers for one generation's crossover and mutation draws.
+        
+        Returns:
+            Tuple of (cx_draws, mut_draws, gene_draws, value_draws)
+        """
+        n_pairs = pop_size // 2
+        n_children = 2 * n_pairs
+        return (
+            np.empty(n_pairs),
+            np.empty(n_children),
+            np.empty((n_children, n_genes)),
+            np.empty((n_children, n_genes))
+        )
+        
+    def _draw_generation(self, fitness_scores: np.ndarray, draws: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+        """
+        Draw all of one generation's selection, crossover and mutation
+        randomness in a few batched calls, refilling the ``draws`` buffers.
+        
+        Returns:
+            Tuple of (parents, cuts, mut_draws, gene_draws, value_draws)
+            as consumed by ``_evolve_nb``
+        """
+        for buffer in draws:
+            self.rng.random(out=buffer)
+        cx_draws, mut_draws, gene_draws, value_draws = draws
+        
+        # Sorted cut points per pair; pairs that skip crossover get an empty segment
+        cuts = np.sort(self.rng.integers(0, gene_draws.shape[1], size=(len(cx_draws), 2)), axis=1)
+        cuts[cx_draws >= self.crossover_probability] = 0
+        
+        parents = self._select_parents(fitness_scores, len(mut_draws))
+        return parents, cuts, mut_draws, gene_draws, value_draws
+        
+    def _allocate_history(self, generations: int, with_stats: bool = False):
+        """Preallocate per-generation history arrays for a run of ``generations``"""
+        self._hist_len = 0
+        self._hist_stats = with_stats
+        self._hist_best = np.empty(generations, dtype=np.float64)
+        self._hist_params = np.empty((generations, len(self._param_names)), dtype=np.float64)
+        if with_stats:
+            self._hist_avg = np.empty(generations, dtype=np.float64)
+            self._hist_std = np.empty(generations, dtype=np.float64)
+            
+    def _record_history(self, best_fitness: float, best_individual,
+                        avg_fitness: float = None, std_fitness: float = None):
+        """Write one generation's summary into the history arrays"""
+        gen = self._hist_len
+        self._hist_best[gen] = best_fitness
+        self._hist_params[gen] = best_individual
+        if self._hist_stats:
+            self._hist_avg[gen] = avg_fitness
+            self._hist_std[gen] = std_fitness
+        self._hist_len += 1
+        
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """Per-generation summaries of the last run, built from the history arrays"""
+        history = []
+        for gen in range(self._hist_len):
+            entry = {
+                'generation': gen,
+                'best_fitness': self._hist_best[gen],
+                'best_params': self._to_params(self._hist_params[gen])
+            }
+            if self._hist_stats:
+                entry['avg_fitness'] = self._hist_avg[gen]
+                entry['std_fitness'] = self._hist_std[gen]
+            history.append(entry)
+        return history
+        
+    def _plateaued(self, best_fitness: float) -> bool:
+        """
+        Update the stale-generation count with this generation's best fitness.
+        Call before updating ``self.best_fitness``.
+        
+        Returns:
+            True once ``patience`` generations passed without improvement
+        """
+        if best_fitness - self.best_fitness > self.min_delta:
+            self._stale_gens = 0
+        else:
+            self._stale_gens += 1
+        return self.patience is not None and self._stale_gens >= self.patience
+        
     def _simple_genetic_algorithm(self):
         """Simple genetic algorithm implementation without DEAP"""
-        # Initialize population
-        population = []
-        for _ in range(self.population_size):
-            individual = []
-            for name, (min_val, max_val) in self.parameter_ranges.items():
-                if isinstance(min_val, int) and isinstance(max_val, int):
-                    individual.append(random.randint(min_val, max_val))
-                else:
-                    individual.append(random.uniform(min_val, max_val))
-            population.append(individual)
+        # Initialize population as a (population_size, n_genes) matrix; generations
+        # alternate between it and a second buffer of the same shape
+        population = self._random_population(self.population_size)
+        next_population = np.empty_like(population)
+        draws = self._allocate_draws(*population.shape)
+        self._allocate_history(self.generations)
+        
+        # Fitness per row, and which rows carry a known fitness into the next
+        # generation (the elite and unchanged children)
+        fitness_scores = np.empty(self.population_size, dtype=np.float64)
+        next_fitness = np.empty_like(fitness_scores)
+        valid = np.zeros(self.population_size, dtype=bool)
+        next_valid = np.empty_like(valid)
             
         # Evolve for specified generations
         for generation in range(self.generations):
-            # Evaluate fitness
-            fitness_scores = []
-            for individual in population:
-                params = {name: individual[i] for i, name in enumerate(self.parameter_ranges.keys())}
-                try:
-                    fitness = self.fitness_function(params)
-                    fitness_scores.append(fitness)
-                except Exception as e:
-                    logger.error(f"Error evaluating individual: {e}")
-                    fitness_scores.append(-float('inf'))
-            
-            # Find best individual
-            best_idx = np.argmax(fitness_scores)
+            # Evaluate fitness of changed rows and find best individual
+            fitness_scores, best_idx = self._score_population(population, fitness_scores, valid)
             best_individual = population[best_idx]
             best_fitness = fitness_scores[best_idx]
+            self.generations_run = generation + 1
+            plateaued = self._plateaued(best_fitness)
             
             # Store best of this generation
-            self.history.append({
-                'generation': generation,
-                'best_fitness': best_fitness,
-                'best_params': {name: best_individual[i] for i, name in enumerate(self.parameter_ranges.keys())}
-            })
+            self._record_history(best_fitness, best_individual)
             
             # Update overall best
             if best_fitness > self.best_fitness:
                 self.best_fitness = best_fitness
-                self.best_individual = best_individual.copy()
+                self.best_individual = self._to_individual(best_individual)
                 
             # Status update
             if generation % 10 == 0:
                 logger.info(f"Generation {generation}: Best fitness = {best_fitness:.4f}")
-            
-            # Create new population
-            new_population = []
-            
-            # Elitism - keep best individual
-            new_population.append(best_individual)
-            
-            # Create rest of population through selection, crossover, mutation
-            while len(new_population) < self.population_size:
-                # Tournament selection
-                parent1_idx = self._tournament_selection(fitness_scores)
-                parent2_idx = self._tournament_selection(fitness_scores)
                 
-                parent1 = population[parent1_idx].copy()
-                parent2 = population[parent2_idx].copy()
-                
-                # Crossover
-                if random.random() < self.crossover_probability:
-                    child1, child2 = self._simple_crossover(parent1, parent2)
-                else:
-                    child1, child2 = parent1, parent2
-                    
-                # Mutation
-                if random.random() < self.mutation_probability:
-                    self._simple_mutation(child1)
-                    
-                if random.random() < self.mutation_probability:
-                    self._simple_mutation(child2)
-                    
-                # Add to new population
-                new_population.append(child1)
-                if len(new_population) < self.population_size:
-                    new_population.append(child2)
+            if plateaued:
+                logger.info(f"No improvement for {self._stale_gens} generations; "
+                            f"stopping at generation {generation}")
+                break
+            
+            # Create new population through elitism, selection, crossover and mutation
+            _evolve_nb(
+                population,
+                fitness_scores,
+                best_idx,
+                next_population,
+                next_fitness,
+                next_valid,
+                self._lows,
+                self._highs,
+                self._int_mask,
+                self._steps,
+                self.mutation_probability,
+                *self._draw_generation(fitness_scores, draws)
+            )
             
-            # Replace old population
-            population = new_population
+            # Swap buffers: the new generation becomes the current population
+            population, next_population = next_population, population
+            fitness_scores, next_fitness = next_fitness, fitness_scores
+            valid, next_valid = next_valid, valid
             
         # Return best individual found
         return self.best_individual, self.best_fitness
     
-    def _tournament_selection(self, fitness_scores, tournament_size=None):
-        """Tournament selection of individuals"""
-        tournament_size = tournament_size or self.tournament_size
-        tournament = random.sample(range(len(fitness_scores)), tournament_size)
-        tournament_fitness = [fitness_scores[i] for i in tournament]
-        return tournament[np.argmax(tournament_fitness)]
-    
-    def _simple_crossover(self, parent1, parent2):
-        """Simple two-point crossover"""
-        size = len(parent1)
-        point1 = random.randint(0, size - 1)
-        point2 = random.randint(point1, size - 1)
+    def _deap_genetic_algorithm(self):
+        """Genetic algorithm using DEAP"""
+        logger.info("Starting genetic optimization with DEAP")
         
-        child1 = parent1[:point1] + parent2[point1:point2] + parent1[point2:]
-        child2 = parent2[:point1] + parent1[point1:point2] + parent2[point2:]
+        # DEAP's crossover and selection draw from the random module
+        if self.seed is not None:
+            random.seed(self.seed)
         
-        return child1, child2
-    
-    def _simple_mutation(self, individual):
-        """Simple mutation - randomly change genes"""
-        for i, (name, (min_val, max_val)) in enumerate(self.parameter_ranges.items()):
-            # 20% chance to mutate each gene
-            if random.random() < 0.2:
-                if isinstance(min_val, int) and isinstance(max_val, int):
-                    individual[i] = random.randint(min_val, max_val)
-                else:
-                    individual[i] = random.uniform(min_val, max_val)
-        return individual
-    
-    def optimize(self) -> Dict[str, Any]:
-        """
-        Run genetic algorithm optimization.
-        
-        Returns:
-            Dictionary with best parameters and optimization stats
-        """
-        start_time = time.time()
+        # Create population
+        population = self.toolbox.population(n=self.population_size)
+        self._allocate_history(self.generations + 1, with_stats=True)
+        hall_of_fame = tools.HallOfFame(1)
         
-        if not self.fitness_function:
-            raise ValueError("No fitness function provided")
+        # Track statistics
+        stats = tools.Statistics(_fitness_key)
+        stats.register("avg", np.mean)
+        stats.register("min", np.min)
+        stats.register("max", np.max)
+        stats.register("std", np.std)
         
-        if DEAP_AVAILABLE:
-            # Run optimization using DEAP
-            logger.info("Starting genetic optimization with DEAP")
-            
-            # Create population
-            population = self.toolbox.population(n=self.population_size)
-            
-            # Track statistics
-            stats = tools.Statistics(lambda ind: ind.fitness.values[0])
-            stats.register("avg", np.mean)
-            stats.register("min", np.min)
-            stats.register("max", np.max)
-            stats.register("std", np.std)
+        # Generational loop as in algorithms.eaSimple, with a plateau check
+        for gen in range(self.generations + 1):
+            if gen > 0:
+                offspring = self.toolbox.select(population, len(population))
+                population[:] = algorithms.varAnd(
+                    offspring, self.toolbox, self.crossover_probability, self.mutation_probability
+                )
+                
+            self._evaluate_invalid(population)
+            hall_of_fame.update(population)
+            record = stats.compile(population)
+            self.generations_run = gen + 1
+            plateaued = self._plateaued(record['max'])
             
-            # Run evolution
-            population, logbook = algorithms.eaSimple(
-                population, 
-                self.toolbox, 
-                cxpb=self.crossover_probability, 
-                mutpb=self.mutation_probability, 
-                ngen=self.generations,
-                stats=stats,
-                verbose=True
+            # Store optimization history
+            self._record_history(
+                record['max'], max(population, key=_fitness_key), record['avg'], record['std']
             )
             
-            # Get best individual
-            best_ind = tools.selBest(population, 1)[0]
-            self.best_individual = best_ind
-            self.best_fitness = best_ind.fitness.values[0]
+            self.best_individual = hall_of_fame[0]
+            self.best_fitness = hall_of_fame[0].fitness.values[0]
             
-            # Store optimization history
-            for gen, record in enumerate(logbook):
-                self.history.append({
-                    'generation': gen,
-                    'best_fitness': record['max'],
-                    'avg_fitness': record['avg'],
-                    'std_fitness': record['std']
-                })
+            if gen % 10 == 0:
+                logger.info(f"Generation {gen}: Best fitness = {record['max']:.4f}, "
+                            f"avg = {record['avg']:.4f}")
+                
+            if plateaued:
+                logger.info(f"No improvement for {self._stale_gens} generations; "
+                            f"stopping at generation {gen}")
+                break
                 
+    def _evaluate_invalid(self, population):
+        """Evaluate the individuals whose fitness is not yet valid"""
+        invalid = [ind for ind in population if not ind.fitness.valid]
+        for ind, fitness in zip(invalid, self.toolbox.map(self.toolbox.evaluate, invalid)):
+            ind.fitness.values = fitness
+            
+    def _run_evolution(self):
+        """Run the DEAP or the simple genetic algorithm"""
+        if DEAP_AVAILABLE:
+            self._deap_genetic_algorithm()
         else:
-            # Run simple genetic algorithm implementation
             logger.info("Starting simple genetic optimization")
             self._simple_genetic_algorithm()
+            
+    def optimize(self) -> Dict[str, Any]:
+        """
+        Run genetic algorithm optimization.
+        
+        Returns:
+            Dictionary with best parameters and optimization stats
+        """
+        start_time = time.time()
         
-        # Convert best individual to parameters
-        best_params = {}
-        for i, name in enumerate(self.parameter_ranges.keys()):
-            best_params[name] = self.best_individual[i]
+        if not self._has_fitness_function():
+            raise ValueError("No fitness function provided")
             
-            # Round integer parameters
-            if isinstance(self.parameter_ranges[name][0], int):
-                best_params[name] = int(round(best_params[name]))
+        # Start from scratch: a best from an earlier run (e.g. on other data)
+        # must neither be returned nor hold back the plateau check
+        self.best_individual = None
+        self.best_fitness = -float('inf')
+        self._stale_gens = 0
+        self._executor = self._create_executor()
+        if self._executor is None and self.worker_init is not None:
+            # Serial evaluation runs in this process, so initialize it instead
+            self.worker_init(*self.worker_init_args)
+        try:
+            self._run_evolution()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                
+        # Convert best individual to parameters (integer genes come back as int)
+        best_params = self._to_params(self.best_individual)
         
         # Calculate optimization stats
         elapsed_time = time.time() - start_time
@@ -325,6 +725,7 @@ class GeneticOptimizer:
             'best_fitness': self.best_fitness,
             'elapsed_time': elapsed_time,
             'generations': self.generations,
+            'generations_run': self.generations_run,
             'population_size': self.population_size,
             'timestamp': datetime.now().isoformat()
         }
@@ -335,12 +736,24 @@ class GeneticOptimizer:
         
         return result
     
+    def clear_cache(self):
+        """Drop memoized fitness values and reset the hit/miss counters"""
+        self._fitness_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
     def set_fitness_function(self, fitness_function: Callable):
         """Set the fitness function for evaluation"""
         self.fitness_function = fitness_function
+        self.clear_cache()
         if DEAP_AVAILABLE:
             self.toolbox.register("evaluate", self._evaluate_individual)
             
+    def set_batched_fitness_function(self, batched_fitness_function: Callable[[np.ndarray, List[str]], np.ndarray]):
+        """Set a fitness function that scores a whole (n, n_genes) batch per call"""
+        self.batched_fitness_function = batched_fitness_function
+        self.clear_cache()
+            
     def set_parameter_ranges(self, parameter_ranges: Dict[str, Tuple]):
         """
         Set parameter ranges for optimization.
@@ -349,5 +762,8 @@ class GeneticOptimizer:
             parameter_ranges: Dictionary of parameter names and (min, max) tuples
         """
         self.parameter_ranges = parameter_ranges
+        self._cache_parameter_layout()
+        self._allocate_history(0)  # Old history rows no longer match the gene layout
+        self.clear_cache()
         if DEAP_AVAILABLE:
-            self._setup_deap()  # Re-setup with new parameter ranges 
\ No newline at end of file
+            self._setup_deap_dynamic()  # Re-register generators for the new ranges 
\ No newline at end of file
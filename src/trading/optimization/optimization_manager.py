@@ -1,4 +1,5 @@
 import logging
+import functools
 import pandas as pd
 import numpy as np
 import time
@@ -16,6 +17,42 @@ from src.utils.performance import PerformanceTracker
 
 logger = logging.getLogger(__name__)
 
+def _strategy_fitness(params: Dict[str, Any], data: pd.DataFrame) -> float:
+    """
+    Genetic optimization fitness of MultiIndicatorStrategy parameters, from a
+    backtest on data. Module-level so that, bound to its data with
+    functools.partial, it pickles to the optimizer's worker processes.
+    """
+    try:
+        # Create strategy with these parameters
+        strategy = MultiIndicatorStrategy(
+            rsi_period=params['rsi_period'],
+            macd_fast=params['macd_fast'],
+            macd_slow=params['macd_slow'],
+            ema_periods=[params['ema_short'], params['ema_long']]
+        )
+        
+        # Backtest strategy
+        results = strategy.backtest(data)
+        
+        # Calculate fitness based on Sharpe ratio and win rate
+        sharpe = results['sharpe_ratio']
+        win_rate = results['win_rate'] / 100  # Convert to fraction
+        return_pct = results['total_return_pct']
+        
+        # Prefer strategies with more trades
+        trade_factor = min(1.0, results['num_trades'] / 10) if 'num_trades' in results else 0.5
+        
+        # Fitness function that rewards Sharpe, win rate, and return
+        fitness = (sharpe * 0.5) + (win_rate * 0.3) + (return_pct * 0.02) + (trade_factor * 0.2)
+        
+        return max(0, fitness)  # Prevent negative fitness
+        
+    except Exception as e:
+        logger.error(f"Error in fitness function: {e}")
+        return 0.0
+
+
 class OptimizationManager:
     """
     Central manager for all trading strategy optimization techniques.
@@ -229,36 +266,8 @@ class OptimizationManager:
         # Fetch historical data
         data = self.fetch_historical_data(symbol, timeframe, days)
         
-        # Define fitness function
-        def fitness_function(params: Dict[str, Any]) -> float:
-            try:
-                # Create strategy with these parameters
-                strategy = MultiIndicatorStrategy(
-                    rsi_period=params['rsi_period'],
-                    macd_fast=params['macd_fast'],
-                    macd_slow=params['macd_slow'],
-                    ema_periods=[params['ema_short'], params['ema_long']]
-                )
-                
-                # Backtest strategy
-                results = strategy.backtest(data)
-                
-                # Calculate fitness based on Sharpe ratio and win rate
-                sharpe = results['sharpe_ratio']
-                win_rate = results['win_rate'] / 100  # Convert to fraction
-                return_pct = results['total_return_pct']
-                
-                # Prefer strategies with more trades
-                trade_factor = min(1.0, results['num_trades'] / 10) if 'num_trades' in results else 0.5
-                
-                # Fitness function that rewards Sharpe, win rate, and return
-                fitness = (sharpe * 0.5) + (win_rate * 0.3) + (return_pct * 0.02) + (trade_factor * 0.2)
-                
-                return max(0, fitness)  # Prevent negative fitness
-                
-            except Exception as e:
-                logger.error(f"Error in fitness function: {e}")
-                return 0.0
+        # Fitness function bound to this data
+        fitness_function = functools.partial(_strategy_fitness, data=data)
         
         # Set fitness function
         self.genetic_optimizer.set_fitness_function(fitness_function)
@@ -1,11 +1,12 @@
 """Reinforcement learning modules for trading."""
 
-from .finrl_environment import CryptoTradingEnv, FinRLDataProcessor
+from .finrl_environment import CryptoTradingEnv, FinRLDataProcessor, make_vec_env
 from .rl_agent_manager import RLAgentManager, TradingCallback
 
 __all__ = [
     "CryptoTradingEnv",
     "FinRLDataProcessor",
+    "make_vec_env",
     "RLAgentManager",
     "TradingCallback",
 ] 
\ No newline at end of file
@@ -2,6 +2,8 @@ import gymnasium as gym
 import numpy as np
 import pandas as pd
 import logging
+import os
+import hashlib
 from gymnasium import spaces
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
@@ -10,6 +12,98 @@ warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
 
+try:
+    from stable_baselines3.common.vec_env import SubprocVecEnv, DummyVecEnv
+    from stable_baselines3.common.monitor import Monitor
+    SB3_AVAILABLE = True
+except ImportError:
+    SB3_AVAILABLE = False
+
+from src.trading._numba import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _execute_trades_nb(actions, prices, stocks_owned, balance, portfolio_value,
+                       transaction_cost_pct):
+    """
+    Apply one step of trading actions in place on ``stocks_owned``.
+    
+    Trades at ``prices`` only move value between cash and holdings, so the
+    portfolio value (already marked at ``prices``) changes by the fees alone.
+    
+    Returns:
+        Tuple of (new balance, new portfolio value, L1 norm of ``actions``)
+    """
+    fees = 0.0
+    action_l1 = 0.0
+    for i in range(actions.shape[0]):
+        action = actions[i]
+        price = prices[i]
+        action_l1 += abs(action)
+        
+        if action > 0:  # Buy
+            max_affordable = balance / price
+            trade_quantity = min(action * max_affordable, max_affordable)
+            
+            if trade_quantity > 0:
+                cost = trade_quantity * price
+                transaction_cost = cost * transaction_cost_pct
+                total_cost = cost + transaction_cost
+                
+                if total_cost <= balance:
+                    balance -= total_cost
+                    fees += transaction_cost
+                    stocks_owned[i] += trade_quantity
+                    
+        elif action < 0 and stocks_owned[i] > 0:  # Sell
+            trade_quantity = min(-action * stocks_owned[i], stocks_owned[i])
+            
+            if trade_quantity > 0:
+                proceeds = trade_quantity * price
+                transaction_cost = proceeds * transaction_cost_pct
+                balance += proceeds - transaction_cost
+                fees += transaction_cost
+                stocks_owned[i] -= trade_quantity
+                
+    return balance, portfolio_value - fees, action_l1
+
+
+@njit(cache=True, fastmath=True)
+def _reward_nb(ret_sum, ret_sq, count):
+    """Sharpe-like ratio from running return moments, 0.0 when too short or flat"""
+    if count <= 5:
+        return 0.0
+        
+    mean = ret_sum / count
+    mean_sq = ret_sq / count
+    var = mean_sq - mean * mean
+    
+    # Treat cancellation noise in the one-pass variance as a flat window
+    if var <= 1e-12 * mean_sq:
+        return 0.0
+    return mean / np.sqrt(var)
+
+
+_KERNELS_WARM = False
+
+
+def _warmup_kernels():
+    """Compile the Numba kernels up front so the first step() does not pay for it"""
+    global _KERNELS_WARM
+    if _KERNELS_WARM or not NUMBA_AVAILABLE:
+        return
+        
+    _execute_trades_nb(
+        np.zeros(1, dtype=np.float32),
+        np.ones(1, dtype=np.float32),
+        np.zeros(1, dtype=np.float32),
+        0.0,
+        0.0,
+        0.0
+    )
+    _reward_nb(0.0, 0.0, 0)
+    _KERNELS_WARM = True
+
 class CryptoTradingEnv(gym.Env):
     """
     FinRL-compatible cryptocurrency trading environment for Discord trading bot.
@@ -53,6 +147,7 @@ class CryptoTradingEnv(gym.Env):
             model_name: Name of the RL model
             mode: 'train' or 'test'
             env_config: Additional environment configuration
+                (``random_start`` starts each reset on a random day)
         """
         # Environment parameters
         self.day = day
@@ -69,6 +164,23 @@ class CryptoTradingEnv(gym.Env):
         self.mode = mode
         self.env_config = env_config or {}
         
+        # Constructor arguments needed to replicate this env in vectorized workers
+        self._env_kwargs = {
+            'initial_amount': initial_amount,
+            'transaction_cost_pct': transaction_cost_pct,
+            'tech_indicator_list': tech_indicator_list,
+            'max_stock': max_stock,
+            'lookback': lookback,
+            'day': day,
+            'turbulence_threshold': turbulence_threshold,
+            'risk_indicator_col': risk_indicator_col,
+            'print_verbosity': print_verbosity,
+            'iteration': iteration,
+            'model_name': model_name,
+            'mode': mode,
+            'env_config': env_config,
+        }
+        
         # Technical indicators
         if tech_indicator_list is None:
             self.tech_indicator_list = [
@@ -84,31 +196,33 @@ class CryptoTradingEnv(gym.Env):
         # Environment state
         self.terminal = False
         self.portfolio_value = self.initial_amount
-        self.asset_memory = [self.initial_amount]
-        self.portfolio_return_memory = [0]
-        self.actions_memory = []
-        self.date_memory = []
+        self._reset_memory()
+        
+        # Rolling window of returns for the reward's Sharpe term
+        self._ret_window = 30
+        self._reset_return_moments()
         
         # Initialize state
+        self._allocate_state()
         if previous_state is None:
-            self.state = self._initiate_state()
+            self._initiate_state()
         else:
-            self.state = previous_state
+            self.state[:] = previous_state
             
         # Action and observation spaces
         self.action_space = spaces.Box(
             low=-1, 
             high=1, 
-            shape=(len(self.df.tic.unique()),), 
+            shape=(self._n_tics,), 
             dtype=np.float32
         )
         
         # Observation space includes: balance, positions, prices, technical indicators
         observation_dim = (
             1 +  # balance
-            len(self.df.tic.unique()) +  # positions
-            len(self.df.tic.unique()) +  # prices
-            len(self.df.tic.unique()) * len(self.tech_indicator_list)  # technical indicators
+            self._n_tics +  # positions
+            self._n_tics +  # prices
+            self._n_tics * len(self.tech_indicator_list)  # technical indicators
         )
         
         self.observation_space = spaces.Box(
@@ -121,11 +235,14 @@ class CryptoTradingEnv(gym.Env):
         # Trading parameters
         self.reward_scaling = 1e-4
         self.state_space = observation_dim
-        self.action_space_dim = len(self.df.tic.unique())
+        self.action_space_dim = self._n_tics
         
         # Portfolio tracking
-        self.stocks_owned = np.zeros(self.action_space_dim)
-        self.stocks_price = np.array([0] * self.action_space_dim)
+        self.stocks_owned = np.zeros(self.action_space_dim, dtype=np.float32)
+        self.stocks_price = np.zeros(self.action_space_dim, dtype=np.float32)
+        
+        # Compile trading/reward kernels before the first step
+        _warmup_kernels()
         
         logger.info(f"FinRL Crypto Trading Environment initialized")
         logger.info(f"Action space: {self.action_space}")
@@ -144,7 +261,15 @@ class CryptoTradingEnv(gym.Env):
         
         # Get unique symbols and dates
         self.tic_list = list(self.df.tic.unique())
-        self.trade_dates = list(self.df.date.unique())
+        self._n_tics = len(self.tic_list)
+        self._trade_dates_arr = self.df.date.unique()
+        self.trade_dates = list(self._trade_dates_arr)
+        
+        # Rows are sorted by date, so each day is a contiguous row range:
+        # day i spans [_date_row_starts[i], _date_row_starts[i + 1])
+        self._date_row_starts = np.r_[
+            0, np.cumsum(self.df.groupby('date', sort=False).size().values)
+        ]
         
         # Validate technical indicators
         missing_indicators = []
@@ -164,42 +289,62 @@ class CryptoTradingEnv(gym.Env):
         logger.info(f"Trading period: {self.trade_dates[0]} to {self.trade_dates[-1]}")
         logger.info(f"Technical indicators: {self.tech_indicator_list}")
         
+        self._build_panels()
+        
+    def _build_panels(self):
+        """
+        Convert the per-step columns of ``self.df`` into day-indexed NumPy panels.
+        
+        ``_close_panel[day]`` holds the close of every symbol and
+        ``_tech_panel[day]`` holds the indicators in observation order
+        (each indicator for every symbol), so stepping never touches pandas.
+        """
+        n_days = len(self.trade_dates)
+        n_tics = self._n_tics
+        
+        if not np.all(np.diff(self._date_row_starts) == n_tics):
+            raise ValueError("DataFrame must contain one row per symbol for every date")
+            
+        self._close_panel = self.df['close'].to_numpy(dtype=np.float32).reshape(n_days, n_tics)
+        
+        if self.tech_indicator_list:
+            self._tech_panel = np.stack([
+                self.df[indicator].to_numpy(dtype=np.float32).reshape(n_days, n_tics)
+                for indicator in self.tech_indicator_list
+            ], axis=1).reshape(n_days, -1)
+        else:
+            self._tech_panel = np.empty((n_days, 0), dtype=np.float32)
+            
+    def _allocate_state(self):
+        """Allocate the observation buffer and the offsets of its sections"""
+        n_tics = self._n_tics
+        
+        # Layout: [balance, positions, prices, indicator_1 per tic, ...]
+        self._off_pos = 1
+        self._off_prc = 1 + n_tics
+        self._off_tech = 1 + 2 * n_tics
+        
+        self.state = np.zeros(
+            self._off_tech + n_tics * len(self.tech_indicator_list),
+            dtype=np.float32
+        )
+        
     def _initiate_state(self):
         """Initialize the environment state"""
         if self.day >= len(self.trade_dates):
             self.terminal = True
             return None
             
-        # Get current date's data
-        current_date = self.trade_dates[self.day]
-        current_data = self.df[self.df.date == current_date]
-        
         # Initialize portfolio
-        balance = self.initial_amount
-        positions = np.zeros(len(self.tic_list))
-        prices = current_data.close.values
-        
-        # Get technical indicators
-        tech_indicators = []
-        for indicator in self.tech_indicator_list:
-            if indicator in current_data.columns:
-                tech_indicators.extend(current_data[indicator].values)
-            else:
-                tech_indicators.extend(np.zeros(len(self.tic_list)))
-                
-        # Combine all state components
-        state = np.concatenate([
-            [balance],
-            positions,
-            prices,
-            tech_indicators
-        ])
+        self.stocks_owned = np.zeros(self._n_tics, dtype=np.float32)
+        self.stocks_price = np.zeros(self._n_tics, dtype=np.float32)
+        self.state[0] = self.initial_amount
+        self.portfolio_value = self.initial_amount
         
         # Update tracking variables
-        self.stocks_price = prices
-        self.portfolio_value = balance + np.sum(positions * prices)
+        self._refresh_state()
         
-        return state.astype(np.float32)
+        return self.state
         
     def step(self, actions):
         """Execute one trading step"""
@@ -207,14 +352,15 @@ class CryptoTradingEnv(gym.Env):
         if self.terminal:
             return self.state, 0, True, False, {}
             
-        # Validate actions
-        actions = np.array(actions).astype(np.float32)
-        actions = np.clip(actions, -1, 1)  # Ensure actions are in valid range
+        # Validate actions, clipping straight into this step's action memory row
+        actions = np.clip(
+            np.asarray(actions, dtype=np.float32), -1, 1,
+            out=self.actions_memory[self._n_memory]
+        )
         
         # Get current date and data
         current_date = self.trade_dates[self.day]
-        current_data = self.df[self.df.date == current_date]
-        current_prices = current_data.close.values
+        current_prices = self._close_panel[self.day]
         
         # Calculate portfolio value before action
         portfolio_value_prev = self.portfolio_value
@@ -233,23 +379,19 @@ class CryptoTradingEnv(gym.Env):
             
         # Get next state
         if not self.terminal:
-            next_state = self._get_state()
-        else:
-            next_state = self.state
+            self._refresh_state()
             
         # Calculate reward
         reward = self._calculate_reward(portfolio_value_prev)
         
         # Update memory
-        self.asset_memory.append(self.portfolio_value)
-        self.portfolio_return_memory.append(
-            (self.portfolio_value - portfolio_value_prev) / portfolio_value_prev
-        )
-        self.actions_memory.append(actions)
-        self.date_memory.append(current_date)
+        portfolio_return = (self.portfolio_value - portfolio_value_prev) / portfolio_value_prev
+        self._push_return(portfolio_return)
         
-        # Update state
-        self.state = next_state
+        n = self._n_memory + 1
+        self.asset_memory[n] = self.portfolio_value
+        self.portfolio_return_memory[n] = portfolio_return
+        self._n_memory = n
         
         # Additional info
         info = {
@@ -265,138 +407,135 @@ class CryptoTradingEnv(gym.Env):
         
     def _execute_trades(self, actions, current_prices):
         """Execute trading actions"""
-        # Calculate current portfolio value
-        balance = self.state[0]
-        current_positions = self.stocks_owned
-        
-        # Calculate transaction costs and new positions
-        for i, action in enumerate(actions):
-            price = current_prices[i]
-            current_position = current_positions[i]
-            
-            # Determine trade size based on action
-            if action > 0:  # Buy
-                # Calculate maximum affordable quantity
-                max_affordable = balance / price
-                trade_quantity = min(action * max_affordable, max_affordable)
-                
-                if trade_quantity > 0:
-                    # Execute buy order
-                    cost = trade_quantity * price
-                    transaction_cost = cost * self.transaction_cost_pct
-                    total_cost = cost + transaction_cost
-                    
-                    if total_cost <= balance:
-                        balance -= total_cost
-                        current_positions[i] += trade_quantity
-                        
-            elif action < 0 and current_position > 0:  # Sell
-                # Calculate sell quantity
-                trade_quantity = min(abs(action) * current_position, current_position)
-                
-                if trade_quantity > 0:
-                    # Execute sell order
-                    proceeds = trade_quantity * price
-                    transaction_cost = proceeds * self.transaction_cost_pct
-                    net_proceeds = proceeds - transaction_cost
-                    
-                    balance += net_proceeds
-                    current_positions[i] -= trade_quantity
-                    
-        # Update state
-        self.stocks_owned = current_positions
+        # Trade loop runs in the compiled kernel, positions are updated in place
+        balance, self.portfolio_value, self._last_action_l1 = _execute_trades_nb(
+            actions,
+            current_prices,
+            self.stocks_owned,
+            float(self.state[0]),
+            float(self.portfolio_value),
+            self.transaction_cost_pct
+        )
         self.stocks_price = current_prices
-        self.portfolio_value = balance + np.sum(current_positions * current_prices)
         
         # Update state vector
         self.state[0] = balance
-        self.state[1:1+len(self.tic_list)] = current_positions
-        self.state[1+len(self.tic_list):1+2*len(self.tic_list)] = current_prices
+        self.state[self._off_pos:self._off_prc] = self.stocks_owned
+        self.state[self._off_prc:self._off_tech] = current_prices
+        
+    def _refresh_state(self):
+        """
+        Overwrite the observation buffer in place with the current day's data.
         
-    def _get_state(self):
-        """Get current environment state"""
+        Returns:
+            Current day's close prices
+        """
         if self.day >= len(self.trade_dates):
-            return self.state
+            return self.stocks_price
             
         # Get current date's data
-        current_date = self.trade_dates[self.day]
-        current_data = self.df[self.df.date == current_date]
-        
-        # Get current prices
-        current_prices = current_data.close.values
-        
-        # Get technical indicators
-        tech_indicators = []
-        for indicator in self.tech_indicator_list:
-            if indicator in current_data.columns:
-                tech_indicators.extend(current_data[indicator].values)
-            else:
-                tech_indicators.extend(np.zeros(len(self.tic_list)))
-                
-        # Update state with new prices and indicators
-        balance = self.state[0]
-        positions = self.stocks_owned
-        
-        # Combine all state components
-        state = np.concatenate([
-            [balance],
-            positions,
-            current_prices,
-            tech_indicators
-        ])
-        
-        # Update portfolio value
-        self.portfolio_value = balance + np.sum(positions * current_prices)
+        current_prices = self._close_panel[self.day]
+        
+        # Scatter positions, prices and indicators into their sections
+        state = self.state
+        state[self._off_pos:self._off_prc] = self.stocks_owned
+        state[self._off_prc:self._off_tech] = current_prices
+        state[self._off_tech:] = self._tech_panel[self.day]
+        
+        # Mark holdings to the new prices. The float32 prices are widened first:
+        # the value is carried forward step by step, so it is kept in float64
+        price_change = current_prices.astype(np.float64) - self.stocks_price
+        self.portfolio_value = float(self.portfolio_value + np.dot(self.stocks_owned, price_change))
+        self.stocks_price = current_prices
         
-        return state.astype(np.float32)
+        return current_prices
         
     def _calculate_reward(self, portfolio_value_prev):
         """Calculate reward for the current step"""
         # Portfolio return
         portfolio_return = (self.portfolio_value - portfolio_value_prev) / portfolio_value_prev
         
-        # Risk-adjusted reward
-        if len(self.portfolio_return_memory) > 1:
-            # Calculate Sharpe-like ratio
-            returns = np.array(self.portfolio_return_memory[-30:])  # Last 30 returns
-            if len(returns) > 5 and np.std(returns) > 0:
-                risk_adjusted_return = np.mean(returns) / np.std(returns)
-                reward = portfolio_return + 0.1 * risk_adjusted_return
-            else:
-                reward = portfolio_return
-        else:
-            reward = portfolio_return
+        # Risk-adjusted reward: Sharpe-like ratio over the last 30 returns
+        reward = portfolio_return + 0.1 * _reward_nb(
+            self._ret_sum, self._ret_sq, self._ret_count
+        )
             
         # Apply reward scaling
         reward = reward * self.reward_scaling
         
         # Penalty for excessive trading (to prevent overfitting)
-        if len(self.actions_memory) > 0:
-            action_penalty = np.sum(np.abs(self.actions_memory[-1])) * 0.001
-            reward -= action_penalty
+        reward -= self._last_action_l1 * 0.001
             
         return reward
         
+    def _reset_memory(self):
+        """
+        Allocate the per-episode memory buffers.
+        
+        An episode takes at most ``len(trade_dates) - 1`` steps, so every buffer
+        fits in ``len(trade_dates)`` rows; slot 0 of the asset and return
+        buffers holds the starting point.
+        """
+        n_days = len(self.trade_dates)
+        
+        self.asset_memory = np.empty(n_days, dtype=np.float32)
+        self.asset_memory[0] = self.initial_amount
+        self.portfolio_return_memory = np.empty(n_days, dtype=np.float32)
+        self.portfolio_return_memory[0] = 0.0
+        self.actions_memory = np.empty((n_days, self._n_tics), dtype=np.float32)
+        
+        self._memory_start_day = self.day
+        self._n_memory = 0
+        
+    def _reset_return_moments(self):
+        """Reset the reward's return window to the initial zero return"""
+        self._ret_ring = np.zeros(self._ret_window, dtype=np.float32)
+        self._ret_sum = 0.0
+        self._ret_sq = 0.0
+        self._ret_count = 0
+        self._ret_idx = 0
+        self._push_return(0.0)
+        
+    def _push_return(self, value: float):
+        """Add a return to the rolling window, evicting the oldest in O(1)"""
+        if self._ret_count == self._ret_window:
+            evicted = self._ret_ring[self._ret_idx]
+            self._ret_sum -= evicted
+            self._ret_sq -= evicted * evicted
+        else:
+            self._ret_count += 1
+            
+        # Accumulate the stored FP32 value so evictions cancel it exactly
+        self._ret_ring[self._ret_idx] = value
+        value = float(self._ret_ring[self._ret_idx])
+        self._ret_sum += value
+        self._ret_sq += value * value
+        self._ret_idx = (self._ret_idx + 1) % self._ret_window
+        
     def reset(self, seed=None, options=None):
         """Reset the environment"""
-        # Reset day
-        self.day = 0
+        # Seed self.np_random per the Gymnasium reset contract
+        super().reset(seed=seed)
+        
+        # Reset day, optionally to a random start drawn from self.np_random
+        if self.env_config.get('random_start', False) and len(self.trade_dates) > 1:
+            self.day = int(self.np_random.integers(0, len(self.trade_dates) - 1))
+        else:
+            self.day = 0
         
         # Reset terminal flag
         self.terminal = False
         
         # Reset portfolio
         self.portfolio_value = self.initial_amount
-        self.stocks_owned = np.zeros(self.action_space_dim)
+        self.stocks_owned = np.zeros(self.action_space_dim, dtype=np.float32)
         
         # Reset memory
-        self.asset_memory = [self.initial_amount]
-        self.portfolio_return_memory = [0]
-        self.actions_memory = []
-        self.date_memory = []
+        self._reset_memory()
+        self._reset_return_moments()
         
         # Reset state
-        self.state = self._initiate_state()
+        self._initiate_state()
         
         return self.state, {}
         
@@ -409,36 +548,116 @@ class CryptoTradingEnv(gym.Env):
             print(f"Current Prices: {self.stocks_price}")
             print("-" * 50)
             
-    def get_sb_env(self):
-        """Get environment for Stable Baselines3 compatibility"""
-        return self
+    def get_sb_env(self,
+                   n_envs: int = 1,
+                   seed: Optional[int] = None,
+                   monitor_dir: Optional[str] = None,
+                   start_method: Optional[str] = None):
+        """
+        Get a vectorized copy of this environment for Stable Baselines3.
+        
+        Args:
+            n_envs: Number of parallel environments (>1 uses worker processes)
+            seed: Base seed, worker ``i`` is seeded with ``seed + i``
+            monitor_dir: Directory for per-worker Monitor logs
+            start_method: multiprocessing start method for SubprocVecEnv
+            
+        Returns:
+            DummyVecEnv or SubprocVecEnv wrapping CryptoTradingEnv instances
+        """
+        return make_vec_env(
+            self.df,
+            n_envs=n_envs,
+            seed=seed,
+            monitor_dir=monitor_dir,
+            start_method=start_method,
+            **self._env_kwargs
+        )
         
     def save_asset_memory(self):
         """Save portfolio performance memory"""
-        date_list = self.date_memory
-        asset_list = self.asset_memory
-        portfolio_return = self.portfolio_return_memory
+        n = self._n_memory + 1
+        start = self._memory_start_day
         
         df_account_value = pd.DataFrame({
-            'date': date_list,
-            'account_value': asset_list,
-            'daily_return': portfolio_return
+            'date': self._trade_dates_arr[start:start + n],
+            'account_value': self.asset_memory[:n],
+            'daily_return': self.portfolio_return_memory[:n]
         })
         
         return df_account_value
         
     def save_action_memory(self):
         """Save action memory"""
-        if len(self.actions_memory) > 0:
-            date_list = self.date_memory
-            df_actions = pd.DataFrame(self.actions_memory)
-            df_actions['date'] = date_list
-            df_actions.columns = [f'{tic}_action' for tic in self.tic_list] + ['date']
+        n = self._n_memory
+        if n > 0:
+            start = self._memory_start_day
+            df_actions = pd.DataFrame(
+                self.actions_memory[:n],
+                columns=[f'{tic}_action' for tic in self.tic_list]
+            )
+            df_actions['date'] = self._trade_dates_arr[start:start + n]
             return df_actions
         else:
             return pd.DataFrame()
 
 
+def make_vec_env(df: pd.DataFrame,
+                 n_envs: int = 1,
+                 seed: Optional[int] = None,
+                 monitor_dir: Optional[str] = None,
+                 start_method: Optional[str] = None,
+                 **env_kwargs):
+    """
+    Create a vectorized CryptoTradingEnv for Stable Baselines3.
+    
+    With ``n_envs > 1`` every environment steps in its own process via
+    ``SubprocVecEnv``, so rollouts are not serialized behind the GIL and the
+    policy forward pass receives a stacked ``(n_envs, obs_dim)`` batch.
+    
+    Args:
+        df: DataFrame with OHLCV data and technical indicators
+        n_envs: Number of parallel environments
+        seed: Base seed, worker ``i`` is seeded with ``seed + i``
+        monitor_dir: Directory for per-worker Monitor logs
+        start_method: multiprocessing start method for SubprocVecEnv
+        **env_kwargs: Keyword arguments forwarded to CryptoTradingEnv
+        
+    Returns:
+        DummyVecEnv for a single environment, SubprocVecEnv otherwise
+    """
+    if not SB3_AVAILABLE:
+        raise ImportError("Stable Baselines3 is required for vectorized environments")
+        
+    if monitor_dir is not None:
+        os.makedirs(monitor_dir, exist_ok=True)
+        
+    def _make_env(rank: int):
+        def _init():
+            env = CryptoTradingEnv(df=df, **env_kwargs)
+            if monitor_dir is not None:
+                env = Monitor(env, os.path.join(monitor_dir, str(rank)))
+            return env
+        return _init
+        
+    env_fns = [_make_env(rank) for rank in range(max(1, n_envs))]
+    
+    if n_envs > 1:
+        vec_env = SubprocVecEnv(env_fns, start_method=start_method)
+    else:
+        vec_env = DummyVecEnv(env_fns)
+        
+    if seed is not None:
+        vec_env.seed(seed)
+        
+    return vec_env
+
+
+# Part of the processed-data cache key. Bump it whenever a change to the
+# processing steps changes their output, so stale cache files are not served
+_PROCESSING_VERSION = 1
+
+
 class FinRLDataProcessor:
     """
     Data processor for FinRL integration with the Discord trading bot.
@@ -449,7 +668,9 @@ class FinRLDataProcessor:
                  symbols: List[str] = None,
                  tech_indicator_list: List[str] = None,
                  use_turbulence: bool = True,
-                 user_defined_feature: bool = False):
+                 user_defined_feature: bool = False,
+                 use_cache: bool = False,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the data processor.
         
@@ -458,10 +679,15 @@ class FinRLDataProcessor:
             tech_indicator_list: List of technical indicators
             use_turbulence: Whether to calculate turbulence index
             user_defined_feature: Whether to use user-defined features
+            use_cache: Whether to cache processed DataFrames on disk as Parquet
+                (needs pyarrow)
+            cache_dir: Cache directory (defaults to $FINRL_CACHE_DIR or ~/.cache/finrl)
         """
         self.symbols = symbols or ['BTC/USDT', 'ETH/USDT']
         self.use_turbulence = use_turbulence
         self.user_defined_feature = user_defined_feature
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir or self.default_cache_dir()
         
         if tech_indicator_list is None:
             self.tech_indicator_list = [
@@ -488,9 +714,19 @@ class FinRLDataProcessor:
                 if col not in df.columns:
                     raise ValueError(f"DataFrame missing required column: {col}")
                     
-            # Rename columns to FinRL format
-            df_processed = df.copy()
-            df_processed = df_processed.rename(columns={
+            # Processing is deterministic, so reuse a previous result for identical input
+            cache_path = self._cache_path(df) if self.use_cache else None
+            if cache_path is not None and os.path.exists(cache_path):
+                try:
+                    df_cached = pd.read_parquet(cache_path)
+                    logger.info(f"Loaded processed data from cache: {cache_path}")
+                    return df_cached
+                except Exception as e:
+                    logger.warning(f"Could not read processed data cache: {e}")
+                    
+            # Rename columns to FinRL format; this is the only copy of the input,
+            # the steps below add their columns to df_processed in place
+            df_processed = df.rename(columns={
                 'timestamp': 'date',
                 'symbol': 'tic'
             })
@@ -500,7 +736,7 @@ class FinRLDataProcessor:
                 df_processed['date'] = pd.to_datetime(df_processed['date'])
                 
             # Sort by date and symbol
-            df_processed = df_processed.sort_values(['date', 'tic']).reset_index(drop=True)
+            df_processed = df_processed.sort_values(['date', 'tic'], ignore_index=True)
             
             # Add technical indicators if not present
             df_processed = self._add_technical_indicators(df_processed)
@@ -513,86 +749,149 @@ class FinRLDataProcessor:
             df_processed = self._add_vix(df_processed)
             
             logger.info(f"Data processing completed. Shape: {df_processed.shape}")
+            
+            if cache_path is not None:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    df_processed.to_parquet(cache_path)
+                except Exception as e:
+                    logger.warning(f"Could not write processed data cache: {e}")
+                    
             return df_processed
             
         except Exception as e:
             logger.error(f"Error in data processing: {e}")
             raise
             
+    @staticmethod
+    def default_cache_dir() -> str:
+        """Directory for cached processed DataFrames"""
+        return os.environ.get(
+            'FINRL_CACHE_DIR',
+            os.path.join(os.path.expanduser('~'), '.cache', 'finrl')
+        )
+        
+    @classmethod
+    def clear_cache(cls, cache_dir: Optional[str] = None) -> int:
+        """
+        Delete cached processed DataFrames.
+        
+        Args:
+            cache_dir: Cache directory (defaults to default_cache_dir())
+            
+        Returns:
+            Number of cache files removed
+        """
+        cache_dir = cache_dir or cls.default_cache_dir()
+        if not os.path.isdir(cache_dir):
+            return 0
+            
+        removed = 0
+        for filename in os.listdir(cache_dir):
+            if filename.endswith('.parquet'):
+                os.remove(os.path.join(cache_dir, filename))
+                removed += 1
+                
+        return removed
+        
+    def _cache_path(self, df: pd.DataFrame) -> str:
+        """Cache file for ``df`` under the current processing settings"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        digest.update(repr((
+            _PROCESSING_VERSION,
+            list(df.columns),
+            list(self.tech_indicator_list),
+            self.use_turbulence
+        )).encode())
+        
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.parquet")
+        
     def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicators to the DataFrame"""
+        # Only compute indicators the frame does not already carry
+        needed = [ind for ind in self.tech_indicator_list if ind not in df.columns]
+        if not needed:
+            return df
+            
         import pandas_ta as ta
         
-        df_with_indicators = df.copy()
-        
-        # Group by symbol for indicator calculation
-        for symbol in df['tic'].unique():
-            symbol_data = df[df['tic'] == symbol].copy()
+        def _compute_all_indicators(symbol_data: pd.DataFrame) -> pd.DataFrame:
+            """Compute every missing indicator for one symbol's OHLCV rows"""
+            close = symbol_data['close']
+            new_columns = {}
             
-            # Calculate indicators
-            if 'rsi' in self.tech_indicator_list and 'rsi' not in symbol_data.columns:
-                symbol_data['rsi'] = ta.rsi(symbol_data['close'], length=14)
+            if 'rsi' in needed:
+                new_columns['rsi'] = ta.rsi(close, length=14)
                 
-            if 'macd' in self.tech_indicator_list and 'macd' not in symbol_data.columns:
-                macd = ta.macd(symbol_data['close'])
-                symbol_data['macd'] = macd['MACD_12_26_9']
-                
-            if 'ema_9' in self.tech_indicator_list and 'ema_9' not in symbol_data.columns:
-                symbol_data['ema_9'] = ta.ema(symbol_data['close'], length=9)
+            if 'macd' in needed:
+                macd = ta.macd(close)
+                if macd is not None:
+                    new_columns['macd'] = macd['MACD_12_26_9']
+                    
+            if 'ema_9' in needed:
+                new_columns['ema_9'] = ta.ema(close, length=9)
                 
-            if 'ema_21' in self.tech_indicator_list and 'ema_21' not in symbol_data.columns:
-                symbol_data['ema_21'] = ta.ema(symbol_data['close'], length=21)
+            if 'ema_21' in needed:
+                new_columns['ema_21'] = ta.ema(close, length=21)
                 
-            if 'ema_50' in self.tech_indicator_list and 'ema_50' not in symbol_data.columns:
-                symbol_data['ema_50'] = ta.ema(symbol_data['close'], length=50)
+            if 'ema_50' in needed:
+                new_columns['ema_50'] = ta.ema(close, length=50)
                 
-            if any(ind in self.tech_indicator_list for ind in ['bb_upper', 'bb_lower']):
-                bb = ta.bbands(symbol_data['close'])
+            if 'bb_upper' in needed or 'bb_lower' in needed:
+                bb = ta.bbands(close)
                 if bb is not None:
-                    symbol_data['bb_upper'] = bb['BBU_20_2.0']
-                    symbol_data['bb_lower'] = bb['BBL_20_2.0']
-                    
-            if 'atr' in self.tech_indicator_list and 'atr' not in symbol_data.columns:
-                symbol_data['atr'] = ta.atr(
-                    symbol_data['high'], 
-                    symbol_data['low'], 
-                    symbol_data['close']
+                    if 'bb_upper' in needed:
+                        new_columns['bb_upper'] = bb['BBU_20_2.0']
+                    if 'bb_lower' in needed:
+                        new_columns['bb_lower'] = bb['BBL_20_2.0']
+                        
+            if 'atr' in needed:
+                new_columns['atr'] = ta.atr(
+                    symbol_data['high'],
+                    symbol_data['low'],
+                    close
                 )
                 
-            if 'volume_ratio' in self.tech_indicator_list and 'volume_ratio' not in symbol_data.columns:
-                symbol_data['volume_ratio'] = symbol_data['volume'] / symbol_data['volume'].rolling(20).mean()
+            if 'volume_ratio' in needed:
+                volume = symbol_data['volume']
+                new_columns['volume_ratio'] = volume / volume.rolling(20).mean()
                 
-            # Update main dataframe
-            df_with_indicators.loc[df_with_indicators['tic'] == symbol] = symbol_data
+            return pd.DataFrame(new_columns, index=symbol_data.index)
             
-        # Fill NaN values
-        df_with_indicators = df_with_indicators.fillna(method='ffill').fillna(0)
+        # One pass per symbol group over the price columns only, so the result
+        # holds just the new indicator columns; they align back to df by index
+        indicator_values = (
+            df.groupby('tic', group_keys=False)[['high', 'low', 'close', 'volume']]
+            .apply(_compute_all_indicators)
+        )
+        for column in indicator_values.columns:
+            df[column] = indicator_values[column]
+            
+        # Fill NaN values within each symbol so values never carry across symbols
+        fill_columns = df.columns.drop('tic')
+        df[fill_columns] = df.groupby('tic')[fill_columns].ffill().fillna(0)
+        
+        # Indicators feed a float32 observation space, store them that way
+        indicator_columns = [ind for ind in needed if ind in df.columns]
+        df[indicator_columns] = df[indicator_columns].astype(np.float32)
         
-        return df_with_indicators
+        return df
         
     def _add_turbulence(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add turbulence index for risk management"""
         try:
-            from finrl.finrl_meta.preprocessor.yahoodownloader import YahooDownloader
+            # Calculate returns per symbol
+            returns = df.groupby('tic')['close'].pct_change().fillna(0)
             
-            # Calculate turbulence based on price movements
-            df_turbulence = df.copy()
+            # Rolling volatility as turbulence proxy, aligned to the original rows
+            turbulence = returns.groupby(df['tic']).transform(
+                lambda r: r.rolling(20).std()
+            ) * np.sqrt(252)
             
-            # Simple turbulence calculation
-            for symbol in df['tic'].unique():
-                symbol_data = df[df['tic'] == symbol].copy()
-                
-                # Calculate returns
-                returns = symbol_data['close'].pct_change().fillna(0)
-                
-                # Rolling volatility as turbulence proxy
-                turbulence = returns.rolling(20).std() * np.sqrt(252)
-                
-                df_turbulence.loc[df_turbulence['tic'] == symbol, 'turbulence'] = turbulence
-                
-            df_turbulence['turbulence'] = df_turbulence['turbulence'].fillna(0)
+            df['turbulence'] = turbulence.fillna(0)
             
-            return df_turbulence
+            return df
             
         except Exception as e:
             logger.warning(f"Could not calculate turbulence: {e}")
@@ -603,29 +902,17 @@ class FinRLDataProcessor:
         """Add VIX-like volatility index for crypto"""
         try:
             # Use average volatility across all symbols as VIX proxy
-            df_vix = df.copy()
+            # Rolling volatility per symbol over its last 20 closes (19 returns),
+            # once at least 6 closes are available
+            returns = df.groupby('tic')['close'].pct_change()
+            volatility = returns.groupby(df['tic']).transform(
+                lambda r: r.rolling(19, min_periods=5).std()
+            ) * np.sqrt(252) * 100  # Annualized volatility %
             
-            # Calculate volatility for each symbol
-            for date in df['date'].unique():
-                date_data = df[df['date'] == date]
-                
-                volatilities = []
-                for symbol in date_data['tic'].unique():
-                    symbol_data = df[df['tic'] == symbol]
-                    symbol_data = symbol_data[symbol_data['date'] <= date].tail(20)
-                    
-                    if len(symbol_data) > 5:
-                        returns = symbol_data['close'].pct_change().dropna()
-                        vol = returns.std() * np.sqrt(252) * 100  # Annualized volatility %
-                        volatilities.append(vol)
-                        
-                # Average volatility as VIX
-                vix_value = np.mean(volatilities) if volatilities else 20
-                df_vix.loc[df_vix['date'] == date, 'vix'] = vix_value
-                
-            df_vix['vix'] = df_vix['vix'].fillna(20)
+            # Average volatility across symbols on each date as VIX
+            df['vix'] = volatility.groupby(df['date']).transform('mean').fillna(20)
             
-            return df_vix
+            return df
             
         except Exception as e:
             logger.warning(f"Could not calculate VIX: {e}")
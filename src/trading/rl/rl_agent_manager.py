@@ -14,7 +14,6 @@ logger = logging.getLogger(__name__)
 try:
     from stable_baselines3 import PPO, A2C, SAC, TD3, DDPG
     from stable_baselines3.common.vec_env import DummyVecEnv
-    from stable_baselines3.common.env_util import make_vec_env
     from stable_baselines3.common.callbacks import BaseCallback, EvalCallback
     from stable_baselines3.common.monitor import Monitor
     from stable_baselines3.common.results_plotter import load_results, ts2xy
@@ -28,7 +27,7 @@ except ImportError:
     logger.warning("Stable Baselines3 or FinRL not available. RL features disabled.")
     SB3_AVAILABLE = False
 
-from src.trading.finrl_environment import CryptoTradingEnv, FinRLDataProcessor
+from src.trading.rl.finrl_environment import CryptoTradingEnv, FinRLDataProcessor
 
 class TradingCallback(BaseCallback):
     """
@@ -255,9 +254,12 @@ class RLAgentManager:
             if train_env is None:
                 return False
                 
-            # Wrap environment
-            train_env = Monitor(train_env, self.results_dir)
-            train_env = DummyVecEnv([lambda: train_env])
+            # Wrap environment (num_envs > 1 steps rollouts in worker processes)
+            train_env = train_env.get_sb_env(
+                n_envs=self.config.get('num_envs', 1),
+                seed=self.config.get('seed'),
+                monitor_dir=self.results_dir
+            )
             
             # Create validation environment (last 20% of data)
             split_idx = int(len(df) * 0.8)
@@ -269,14 +271,24 @@ class RLAgentManager:
             # Initialize agent
             agent_class = self.agent_types[agent_type]
             
+            # SB3 runs one policy forward per step on the stacked (num_envs, obs_dim)
+            # observations, so with num_envs > 1 the GPU sees a real batch
+            device = self.config.get('device', 'auto')
+                
             # Agent-specific parameters
             if agent_type in ['PPO', 'A2C']:
+                on_policy_kwargs = {}
+                if 'n_steps' in self.config:
+                    # Rollout length per environment; the buffer holds n_steps * num_envs
+                    on_policy_kwargs['n_steps'] = self.config['n_steps']
+                    
                 model = agent_class(
                     'MlpPolicy',
                     train_env,
                     verbose=1,
                     tensorboard_log=os.path.join(self.results_dir, 'tensorboard'),
-                    device='auto'
+                    device=device,
+                    **on_policy_kwargs
                 )
             elif agent_type in ['SAC', 'TD3', 'DDPG']:
                 model = agent_class(
@@ -284,7 +296,7 @@ class RLAgentManager:
                     train_env,
                     verbose=1,
                     tensorboard_log=os.path.join(self.results_dir, 'tensorboard'),
-                    device='auto',
+                    device=device,
                     buffer_size=100000,
                     learning_starts=1000
                 )
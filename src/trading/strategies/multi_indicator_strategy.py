@@ -1,10 +1,543 @@
 import numpy as np
 import pandas as pd
+import hashlib
 import logging
+from collections import deque
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple, Union
+from src.trading._numba import NUMBA_AVAILABLE, njit, prange
+from src.trading.indicators._kernels import (
+    _ewm_macd_nb, _ewm_mean_nb, _rolling_mean_nb, _rsi_wilder_nb, _wilder_averages_nb
+)
 
 logger = logging.getLogger(__name__)
 
+# The indicator pipeline stores its arrays in float32: they only feed threshold
+# and crossover comparisons, and half-width arrays halve the memory traffic.
+# Running sums inside the kernels stay float64.
+_IND_DTYPE = np.float32
+
+def _ewm_mean(x: np.ndarray, span: int) -> np.ndarray:
+    """pandas ``ewm(span=span).mean()`` of an array, as one compiled pass when Numba is available"""
+    if NUMBA_AVAILABLE:
+        return _ewm_mean_nb(x, span)
+    return pd.Series(x).ewm(span=span).mean().to_numpy(dtype=x.dtype)
+
+def _ewm_macd(close: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram from ewm means, fused into one compiled pass when Numba is available"""
+    if NUMBA_AVAILABLE:
+        return _ewm_macd_nb(close, fast, slow, signal)
+    macd_line = _ewm_mean(close, fast) - _ewm_mean(close, slow)
+    signal_line = _ewm_mean(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+def _rsi_wilder(close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI of an array, as one compiled pass when Numba is available"""
+    if NUMBA_AVAILABLE:
+        return _rsi_wilder_nb(close, period).astype(close.dtype, copy=False)
+    
+    # pandas' C-level ewm instead of the kernel as plain Python. Starting the
+    # recurrence at the SMA seed of the first period changes reproduces _rsi_wilder_nb
+    out = np.full(close.shape[0], np.nan, dtype=close.dtype)
+    if close.shape[0] <= period:
+        return out
+    delta = np.diff(close.astype(np.float64))
+    averages = []
+    for moves in (np.maximum(delta, 0.0), np.maximum(-delta, 0.0)):
+        seeded = moves[period - 1:].copy()
+        seeded[0] = moves[:period].mean()
+        averages.append(pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy())
+    avg_gain, avg_loss = averages
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[period:] = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+    return out
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """pandas ``rolling(window).mean()`` of an array, as one compiled pass when Numba is available"""
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_nb(x, window)
+    return pd.Series(x).rolling(window=window).mean().to_numpy(dtype=x.dtype)
+
+# Signal names by signal code (1 buy, -1 sell, 0 hold)
+_SIGNAL_NAMES = np.array(['HOLD', 'BUY', 'SELL'])
+
+@njit(cache=True, nogil=True)
+def _signal_codes_nb(rsi, macd_line, signal_line, macd_histogram, price, ema_50, volume_ratio, price_roc):
+    """
+    Consensus signal of every bar in one pass: 1 when at least 5 of the 7 buy
+    conditions hold, else -1 when at least 5 of the 7 sell conditions hold, else 0.
+    The conditions are those of ``MultiIndicatorStrategy.generate_signal``.
+    """
+    n = rsi.shape[0]
+    codes = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        r = rsi[i]
+        volume_up = volume_ratio[i] > 1.0
+        buy = ((r > 50) + (r < 70) + (macd_line[i] > signal_line[i]) + (macd_histogram[i] > 0)
+               + (price[i] > ema_50[i]) + volume_up + (price_roc[i] > 0))
+        if buy >= 5:
+            codes[i] = 1
+            continue
+        sell = ((r < 50) + (r > 30) + (macd_line[i] < signal_line[i]) + (macd_histogram[i] < 0)
+                + (price[i] < ema_50[i]) + volume_up + (price_roc[i] < 0))
+        if sell >= 5:
+            codes[i] = -1
+    return codes
+
+# Exit type codes of backtest trades, indexing _EXIT_TYPES
+_EXIT_STOP_LOSS = 0
+_EXIT_TAKE_PROFIT = 1
+_EXIT_END_OF_DATA = 2
+_EXIT_TYPES = ('stop_loss', 'take_profit', 'end_of_data')
+
+def _first_exit_bar(low: np.ndarray, high: np.ndarray, start: int,
+                    stop_loss: float, take_profit: float) -> Tuple[int, int]:
+    """
+    First bar from ``start`` on whose low reaches the stop loss or whose high
+    reaches the take profit, scanning in doubling blocks so short trades only
+    touch a few bars. Each block packs both hits into one uint8 status per bar,
+    bit 0 for the stop loss and bit 1 for the take profit, so the exit type is
+    a bit test on the exit bar instead of a second comparison.
+    
+    Returns:
+        Tuple of (bar index, exit type code); ``len(low)`` and
+        ``_EXIT_END_OF_DATA`` if neither level is reached
+    """
+    n = len(low)
+    block = 64
+    while start < n:
+        end = min(start + block, n)
+        status = (low[start:end] <= stop_loss).view(np.uint8)
+        status |= (high[start:end] >= take_profit).view(np.uint8) << 1
+        k = int((status != 0).argmax())
+        if status[k]:
+            # The stop loss wins when both levels are hit on the same bar
+            return start + k, _EXIT_STOP_LOSS if status[k] & 1 else _EXIT_TAKE_PROFIT
+        start = end
+        block *= 2
+    return n, _EXIT_END_OF_DATA
+
+@njit(cache=True, nogil=True)
+def _simulate_trades_nb(close, low, high, atr, buy, start, initial_balance, risk_percent,
+                        entry_idx, exit_idx, entry_prices, exit_prices, position_values,
+                        pnl, exit_codes):
+    """
+    Trade simulation of ``MultiIndicatorStrategy.backtest`` on raw arrays: a long
+    position opens on a BUY bar while flat, with an ATR stop loss and take profit,
+    and the last one still open is closed at the final close. Trades are written
+    to the output arrays, which need room for ``len(close) - start + 1`` trades.
+    
+    Returns:
+        Tuple of (number of trades, final balance)
+    """
+    n = close.shape[0]
+    balance = initial_balance
+    n_trades = 0
+    i = start
+    while i < n:
+        if not buy[i]:
+            i += 1
+            continue
+        
+        entry_price = close[i]
+        stop_loss = entry_price - (atr[i] * 1.5)
+        take_profit = entry_price + (atr[i] * 1.5 * 2.0)
+        
+        # Same sizing as calculate_position_size
+        price_risk = abs(entry_price - stop_loss)
+        if price_risk > 0 and entry_price > 0:
+            position_value = balance * (risk_percent / 100) / price_risk * entry_price
+        else:
+            position_value = 0.0
+        balance -= position_value
+        
+        # The stop loss wins when both levels are hit on the same bar
+        k = i + 1
+        while k < n and not (low[k] <= stop_loss or high[k] >= take_profit):
+            k += 1
+        if k == n:
+            k = n - 1
+            exit_price = close[k]
+            exit_code = _EXIT_END_OF_DATA
+        elif low[k] <= stop_loss:
+            exit_price = stop_loss
+            exit_code = _EXIT_STOP_LOSS
+        else:
+            exit_price = take_profit
+            exit_code = _EXIT_TAKE_PROFIT
+        
+        profit_loss = (exit_price / entry_price - 1) * position_value
+        balance += position_value + profit_loss
+        
+        entry_idx[n_trades] = i
+        exit_idx[n_trades] = k
+        entry_prices[n_trades] = entry_price
+        exit_prices[n_trades] = exit_price
+        position_values[n_trades] = position_value
+        pnl[n_trades] = profit_loss
+        exit_codes[n_trades] = exit_code
+        n_trades += 1
+        if exit_code == _EXIT_END_OF_DATA:
+            break
+        i = k
+    return n_trades, balance
+
+@njit(cache=True, nogil=True, parallel=True)
+def _backtest_many_nb(close, low, high, atr, buy, offsets, start, initial_balance, risk_percent,
+                      entry_idx, exit_idx, entry_prices, exit_prices, position_values,
+                      pnl, exit_codes, n_trades, balances):
+    """
+    ``_simulate_trades_nb`` over several symbols at once, one symbol per thread.
+    The bars of symbol ``s`` are ``offsets[s]:offsets[s + 1]`` of the concatenated
+    inputs, and its trades go to the same slice of the trade arrays, so the
+    threads never share an output.
+    """
+    for s in prange(offsets.shape[0] - 1):
+        a = offsets[s]
+        b = offsets[s + 1]
+        n_trades[s], balances[s] = _simulate_trades_nb(
+            close[a:b], low[a:b], high[a:b], atr[a:b], buy[a:b], start,
+            initial_balance, risk_percent,
+            entry_idx[a:b], exit_idx[a:b], entry_prices[a:b], exit_prices[a:b],
+            position_values[a:b], pnl[a:b], exit_codes[a:b])
+
+def _backtest_metrics(pnl: np.ndarray, position_values: np.ndarray,
+                      balance: float, initial_balance: float) -> Dict[str, float]:
+    """
+    Summary metrics of a backtest from its trades' profit/loss and position values.
+    
+    Args:
+        pnl: Profit/loss of each trade
+        position_values: Position value of each trade
+        balance: Final balance
+        initial_balance: Initial balance
+        
+    Returns:
+        Dictionary with the balance, return, Sharpe ratio, drawdown and win rate
+    """
+    n_trades = len(pnl)
+    
+    # Calculate performance metrics
+    total_return = balance - initial_balance
+    total_return_pct = (balance / initial_balance - 1) * 100
+    
+    # Win rate
+    win_rate = np.count_nonzero(pnl > 0) / n_trades if n_trades else 0
+    
+    # Calculate Sharpe ratio (simplified)
+    if n_trades:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = pnl / position_values
+        std = np.std(returns)
+        sharpe_ratio = np.mean(returns) / (std if std > 0 else 1) * np.sqrt(252)
+    else:
+        sharpe_ratio = 0
+        
+    # Calculate max drawdown
+    # This is simplified - ideally would track equity curve
+    if n_trades:
+        cumulative_returns = np.cumsum(pnl)
+        peak = np.maximum.accumulate(cumulative_returns)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peak > 0, (peak - cumulative_returns) / peak, 0.0)
+        max_dd = max(0.0, drawdowns.max())
+    else:
+        max_dd = 0
+    
+    return {
+        'final_balance': balance,
+        'total_return': total_return,
+        'total_return_pct': total_return_pct,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': max_dd * 100,  # Convert to percentage
+        'win_rate': win_rate * 100,  # Convert to percentage
+    }
+
+def backtest_many(strategy: 'MultiIndicatorStrategy', dfs: List[pd.DataFrame],
+                  initial_balance: float = 10000,
+                  risk_percent: float = 2.0) -> List[Dict[str, Union[float, List[Dict]]]]:
+    """
+    Backtest a strategy on several symbols in parallel, e.g. when an optimizer
+    scores one parameter set across many tickers. Each symbol gets the result
+    ``strategy.backtest`` gives for its frame.
+    
+    Args:
+        strategy: Strategy whose indicators and signals to trade
+        dfs: DataFrames with OHLCV data, one per symbol
+        initial_balance: Initial balance of each symbol's backtest
+        risk_percent: Percentage of account to risk per trade
+        
+    Returns:
+        Backtest results per symbol, in the order given
+    """
+    # Per symbol the arrays backtest simulates on; frames too short to trade contribute no bars
+    columns = {name: [] for name in ('close', 'low', 'high', 'atr', 'buy')}
+    for df in dfs:
+        if len(df) < 50:
+            df = df.iloc[:0]
+            atr, buy = np.empty(0), np.empty(0, dtype=bool)
+        else:
+            indicators = strategy._calculate_indicators_np(df)
+            atr = indicators['atr']
+            buy = strategy._compute_signal_series(df, indicators) == 'BUY'
+        columns['close'].append(df['close'].to_numpy(dtype=np.float64))
+        columns['low'].append(df['low'].to_numpy(dtype=np.float64))
+        columns['high'].append(df['high'].to_numpy(dtype=np.float64))
+        columns['atr'].append(atr.astype(np.float64))
+        columns['buy'].append(buy)
+    
+    lengths = np.array([len(close) for close in columns['close']], dtype=np.int64)
+    offsets = np.zeros(len(dfs) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    
+    close, low, high, atr, buy = (
+        np.concatenate(arrays) if arrays else np.empty(0, dtype=bool if name == 'buy' else np.float64)
+        for name, arrays in columns.items()
+    )
+    
+    # A symbol makes at most one trade per bar, so each gets its bars' slice
+    # of the trade arrays
+    total = int(offsets[-1])
+    entry_idx = np.empty(total, dtype=np.int64)
+    exit_idx = np.empty(total, dtype=np.int64)
+    entry_prices = np.empty(total)
+    exit_prices = np.empty(total)
+    position_values = np.empty(total)
+    pnl = np.empty(total)
+    exit_codes = np.empty(total, dtype=np.int8)
+    n_trades = np.zeros(len(dfs), dtype=np.int64)
+    balances = np.full(len(dfs), float(initial_balance))
+    
+    _backtest_many_nb(close, low, high, atr, buy, offsets, 50, float(initial_balance), float(risk_percent),
+                      entry_idx, exit_idx, entry_prices, exit_prices, position_values,
+                      pnl, exit_codes, n_trades, balances)
+    
+    results = []
+    for s, length in enumerate(lengths):
+        if length == 0:
+            results.append({
+                'final_balance': initial_balance,
+                'total_return_pct': 0.0,
+                'sharpe_ratio': 0.0,
+                'max_drawdown': 0.0,
+                'win_rate': 0.0,
+                'trades': []
+            })
+            continue
+        
+        a = offsets[s]
+        b = a + n_trades[s]
+        dates = dfs[s].index
+        result = _backtest_metrics(pnl[a:b], position_values[a:b], float(balances[s]), initial_balance)
+        result['trades'] = [
+            {
+                'entry_date': dates[entry_idx[t]],
+                'exit_date': dates[exit_idx[t]],
+                'entry_price': entry_prices[t],
+                'exit_price': exit_prices[t],
+                'position_value': position_values[t],
+                'profit_loss': pnl[t],
+                'exit_type': _EXIT_TYPES[exit_codes[t]]
+            }
+            for t in range(a, b)
+        ]
+        result['num_trades'] = int(n_trades[s])
+        results.append(result)
+    return results
+
+@dataclass
+class LiveState:
+    """
+    Running indicator state of MultiIndicatorStrategy after the last seen bar.
+    ``update`` moves every indicator forward by one bar in O(1) with the same
+    recurrences as the full calculation, so a live feed does not recompute the
+    whole history on every tick.
+    """
+    last_index: object
+    n_bars: int
+    prev_close: float
+    fingerprint: tuple
+    
+    # RSI (Wilder averages of gains and losses)
+    rsi_period: int
+    avg_gain: float
+    avg_loss: float
+    
+    # MACD, as pandas' adjusted ewm means
+    macd_fast: int
+    macd_slow: int
+    macd_signal_period: int
+    ema_fast: float
+    ema_slow: float
+    ema_signal: float
+    
+    # Trend EMAs by period
+    emas: Dict[int, float]
+    
+    # Rolling windows: true ranges for the ATR, volumes, and the last closes
+    # for the 5-bar rate of change
+    tr_window: deque
+    vol_window: deque
+    close_window: deque
+    
+    # State before the last bar, to redo that bar when the feed revises it
+    previous: Optional['LiveState'] = field(default=None, repr=False, compare=False)
+    
+    @classmethod
+    def seed(cls, strategy: 'MultiIndicatorStrategy', df: pd.DataFrame) -> Optional['LiveState']:
+        """
+        Build the state from a full history. The last bar is applied with
+        ``update``, so a live bar with its timestamp can still revise it.
+        
+        Args:
+            strategy: Strategy whose indicator periods to use
+            df: DataFrame with OHLCV data
+        
+        Returns:
+            LiveState, or None if the data is too short or incomplete for every
+            indicator to be warmed up
+        """
+        history = df.iloc[:-1]
+        n = len(history)
+        if n < max(50, strategy.rsi_period + 1, strategy.atr_period + 1, strategy.volume_period):
+            return None
+        
+        close = history['close'].to_numpy(dtype=np.float64)
+        high = history['high'].to_numpy(dtype=np.float64)
+        low = history['low'].to_numpy(dtype=np.float64)
+        volume = history['volume'].to_numpy(dtype=np.float64)
+        
+        avg_gain, avg_loss = _wilder_averages_nb(close, strategy.rsi_period)
+        ema_fast = _ewm_mean(close, strategy.macd_fast)
+        ema_slow = _ewm_mean(close, strategy.macd_slow)
+        ema_signal = _ewm_mean(ema_fast - ema_slow, strategy.macd_signal)
+        
+        # True ranges of the last atr_period bars
+        period = strategy.atr_period
+        high, low, prev_close = high[-period:], low[-period:], close[-period - 1:-1]
+        tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        
+        state = cls(
+            last_index=history.index[-1],
+            n_bars=n,
+            prev_close=float(close[-1]),
+            fingerprint=MultiIndicatorStrategy._fingerprint(df),
+            rsi_period=strategy.rsi_period,
+            avg_gain=float(avg_gain[-1]),
+            avg_loss=float(avg_loss[-1]),
+            macd_fast=strategy.macd_fast,
+            macd_slow=strategy.macd_slow,
+            macd_signal_period=strategy.macd_signal,
+            ema_fast=float(ema_fast[-1]),
+            ema_slow=float(ema_slow[-1]),
+            ema_signal=float(ema_signal[-1]),
+            emas={period: float(_ewm_mean(close, period)[-1]) for period in strategy.ema_periods},
+            tr_window=deque(tr.tolist(), maxlen=strategy.atr_period),
+            vol_window=deque(volume[-strategy.volume_period:].tolist(), maxlen=strategy.volume_period),
+            close_window=deque(close[-6:].tolist(), maxlen=6)
+        )
+        
+        seeds = (state.avg_gain, state.avg_loss, state.ema_signal) + tuple(state.emas.values())
+        windows = tuple(state.tr_window) + tuple(state.vol_window) + tuple(state.close_window)
+        if not np.all(np.isfinite(seeds + windows)):
+            return None
+        
+        last = df.iloc[-1]
+        state.update(last['open'], last['high'], last['low'], last['close'], last['volume'], df.index[-1])
+        return state
+    
+    def update(self, open_price: float, high: float, low: float, close: float, volume: float,
+               timestamp=None) -> Optional[Dict[str, float]]:
+        """
+        Move every indicator forward by one bar
+        
+        A bar with the timestamp of the last one is a re-sent or revised copy
+        of it: it replaces that bar instead of advancing a second time.
+        
+        Args:
+            open_price: Bar open (not used by the current indicators)
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume
+            timestamp: Index of the bar
+        
+        Returns:
+            Dictionary with the latest value of each indicator, or None if the
+            bar is older than the last one, or revises a bar that cannot be redone
+        """
+        if timestamp is not None and self.last_index is not None:
+            if timestamp < self.last_index:
+                return None
+            if timestamp == self.last_index:
+                if self.previous is None:
+                    return None
+                self._restore(self.previous)
+        self.previous = self._copy()
+        
+        prev_close = self.prev_close
+        self.n_bars += 1
+        
+        # RSI
+        period = self.rsi_period
+        delta = close - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+        self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+        total = self.avg_gain + self.avg_loss
+        
+        # MACD and trend EMAs
+        self.ema_fast = self._ewm_step(self.ema_fast, close, self.macd_fast)
+        self.ema_slow = self._ewm_step(self.ema_slow, close, self.macd_slow)
+        macd_line = self.ema_fast - self.ema_slow
+        self.ema_signal = self._ewm_step(self.ema_signal, macd_line, self.macd_signal_period)
+        for ema_period, value in self.emas.items():
+            self.emas[ema_period] = self._ewm_step(value, close, ema_period)
+        
+        # ATR and volume
+        self.tr_window.append(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        self.vol_window.append(volume)
+        volume_avg = np.mean(self.vol_window)
+        self.close_window.append(close)
+        
+        self.prev_close = close
+        self.last_index = timestamp
+        
+        indicators = {
+            'rsi': 100.0 * self.avg_gain / total if total > 0 else 50.0,
+            'macd_line': macd_line,
+            'signal_line': self.ema_signal,
+            'macd_histogram': macd_line - self.ema_signal,
+            'atr': np.mean(self.tr_window),
+            'volume_avg': volume_avg,
+            'volume_ratio': volume / volume_avg if volume_avg > 0 else np.nan,
+            'price_roc': (close / self.close_window[0] - 1) * 100
+        }
+        for ema_period, value in self.emas.items():
+            indicators[f'ema_{ema_period}'] = value
+        return indicators
+    
+    def _copy(self) -> 'LiveState':
+        """Copy of the state, without its own previous state, that later updates do not change"""
+        return replace(self, emas=dict(self.emas), tr_window=self.tr_window.copy(),
+                       vol_window=self.vol_window.copy(), close_window=self.close_window.copy(),
+                       previous=None)
+    
+    def _restore(self, state: 'LiveState'):
+        """Reset to a copy of an earlier state"""
+        self.__dict__.update(state._copy().__dict__)
+    
+    def _ewm_step(self, prev: float, value: float, span: int) -> float:
+        """
+        One step of pandas' adjusted ewm mean: the new value's weight relative
+        to the sum of the weights of the ``n_bars`` values so far
+        """
+        decay = 1.0 - 2.0 / (span + 1)
+        weight_sum = (1.0 - decay ** self.n_bars) / (1.0 - decay)
+        return prev + (value - prev) / weight_sum
+
 class MultiIndicatorStrategy:
     """
     Advanced trading strategy that combines multiple technical indicators 
@@ -46,10 +579,38 @@ class MultiIndicatorStrategy:
         self.atr_period = atr_period
         self.volume_period = volume_period
         
+        # Last _calculate_indicators_np result, keyed by a fingerprint of its frame
+        self._ind_cache: Optional[Tuple[tuple, Dict[str, np.ndarray]]] = None
+        
+        # Incremental state for get_signal_with_details_live, seeded from the frame
+        # of the last get_signal_with_details only when the first live bar arrives
+        self._live: Optional[LiveState] = None
+        self._live_source: Optional[pd.DataFrame] = None
+        
+        # Temporaries of the indicator calculation, reused while the bar count stays the same
+        self._scratch: Dict[str, np.ndarray] = {}
+        
     def calculate_indicators(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """
         Calculate all technical indicators used by the strategy.
         
+        Args:
+            df: DataFrame with OHLCV data
+            
+        Returns:
+            Dictionary with all calculated indicators
+        """
+        # Copied: the arrays of _calculate_indicators_np may be the read-only cached ones
+        index = df.index
+        return {name: pd.Series(values, index=index, copy=True)
+                for name, values in self._calculate_indicators_np(df).items()}
+    
+    def _calculate_indicators_np(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate all technical indicators as plain arrays aligned with the bars
+        of df. The signal and backtest paths only read them by position, so they
+        skip the Series wrapping of calculate_indicators.
+        
         Args:
             df: DataFrame with OHLCV data
             
@@ -64,59 +625,120 @@ class MultiIndicatorStrategy:
             if col not in df.columns:
                 raise ValueError(f"DataFrame missing required column: {col}")
         
+        # Reuse the last result when called again for the same bars, e.g. by
+        # several signal methods within one tick
+        key = self._fingerprint(df)
+        if key is not None and self._ind_cache is not None and self._ind_cache[0] == key:
+            return dict(self._ind_cache[1])
+        
         try:
+            # The moving averages run on plain float32 arrays
+            close = df['close'].to_numpy(dtype=_IND_DTYPE)
+            
             # Calculate RSI
-            delta = df['close'].diff()
-            gain = delta.copy()
-            loss = delta.copy()
-            gain[gain < 0] = 0
-            loss[loss > 0] = 0
-            avg_gain = gain.rolling(window=self.rsi_period).mean()
-            avg_loss = abs(loss.rolling(window=self.rsi_period).mean())
-            rs = avg_gain / avg_loss
-            indicators['rsi'] = 100 - (100 / (1 + rs))
+            indicators['rsi'] = _rsi_wilder(close, self.rsi_period)
             
             # Calculate MACD
-            ema_fast = df['close'].ewm(span=self.macd_fast).mean()
-            ema_slow = df['close'].ewm(span=self.macd_slow).mean()
-            indicators['macd_line'] = ema_fast - ema_slow
-            indicators['signal_line'] = indicators['macd_line'].ewm(span=self.macd_signal).mean()
-            indicators['macd_histogram'] = indicators['macd_line'] - indicators['signal_line']
+            macd_line, signal_line, macd_histogram = _ewm_macd(
+                close, self.macd_fast, self.macd_slow, self.macd_signal)
+            indicators['macd_line'] = macd_line
+            indicators['signal_line'] = signal_line
+            indicators['macd_histogram'] = macd_histogram
             
             # Calculate EMAs
             for period in self.ema_periods:
-                indicators[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+                indicators[f'ema_{period}'] = _ewm_mean(close, period)
             
-            # Calculate ATR
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            indicators['atr'] = true_range.rolling(window=self.atr_period).mean()
+            # Calculate ATR. fmax skips NaN ranges, so the first bar, which has
+            # no previous close, gets just its high - low
+            high = df['high'].to_numpy(dtype=_IND_DTYPE)
+            low = df['low'].to_numpy(dtype=_IND_DTYPE)
+            n = close.shape[0]
+            prev_close = self._scratch_buffer('prev_close', n)
+            true_range = self._scratch_buffer('true_range', n)
+            buf = self._scratch_buffer('tmp', n)
+            prev_close[:1] = np.nan
+            prev_close[1:] = close[:-1]
+            np.subtract(high, low, out=true_range)
+            for bound in (high, low):
+                np.subtract(bound, prev_close, out=buf)
+                np.fabs(buf, out=buf)
+                np.fmax(true_range, buf, out=true_range)
+            indicators['atr'] = _rolling_mean(true_range, self.atr_period)
             
             # Calculate volume indicators
-            indicators['volume_avg'] = df['volume'].rolling(window=self.volume_period).mean()
-            indicators['volume_ratio'] = df['volume'] / indicators['volume_avg']
+            volume = df['volume'].to_numpy(dtype=_IND_DTYPE)
+            volume_avg = _rolling_mean(volume, self.volume_period)
+            indicators['volume_avg'] = volume_avg
+            with np.errstate(divide='ignore', invalid='ignore'):
+                indicators['volume_ratio'] = volume / volume_avg
             
             # Calculate price rate of change
-            indicators['price_roc'] = df['close'].pct_change(5) * 100
+            indicators['price_roc'] = (df['close'].pct_change(5) * 100).to_numpy(dtype=_IND_DTYPE)
             
             # Calculate higher timeframe trend (simulated by using longer EMAs)
-            indicators['trend'] = indicators['ema_50'] > indicators['ema_50'].shift(5)
+            ema_50 = indicators['ema_50']
+            trend = np.zeros(len(ema_50), dtype=bool)
+            trend[5:] = ema_50[5:] > ema_50[:-5]
+            indicators['trend'] = trend
             
+            if key is not None:
+                # Callers get the cached arrays themselves, so keep them from being edited
+                for values in indicators.values():
+                    values.flags.writeable = False
+                self._ind_cache = (key, dict(indicators))
             return indicators
             
         except Exception as e:
             logger.error(f"Error calculating indicators: {e}")
             raise
         
-    def generate_signal(self, df: pd.DataFrame) -> str:
+    def _scratch_buffer(self, name: str, n: int) -> np.ndarray:
+        """
+        Scratch array of n indicator values, kept between calls and only
+        reallocated when the bar count changes. Its contents are undefined.
+        
+        Args:
+            name: Name of the temporary
+            n: Number of bars
+            
+        Returns:
+            Array of n float32 values
+        """
+        buf = self._scratch.get(name)
+        if buf is None or buf.shape[0] != n:
+            buf = self._scratch[name] = np.empty(n, dtype=_IND_DTYPE)
+        return buf
+    
+    @staticmethod
+    def _fingerprint(df: pd.DataFrame) -> Optional[tuple]:
+        """
+        Identity of a frame's bars: its length and first and last timestamps,
+        and a digest of every value the indicators read, so a revised bar (such
+        as a forming candle with a new high or volume but the same close) never
+        matches the frame it replaced.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            
+        Returns:
+            Hashable fingerprint, or None for an empty frame
+        """
+        if df.empty:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for column in ('high', 'low', 'close', 'volume'):
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)))
+        return (len(df), df.index[0], df.index[-1], digest.digest())
+    
+    def generate_signal(self, df: pd.DataFrame, indicators: Optional[Dict[str, np.ndarray]] = None) -> str:
         """
         Generate trading signal based on calculated indicators.
         
         Args:
             df: DataFrame with OHLCV data
+            indicators: Indicator arrays already calculated for df by
+                _calculate_indicators_np, if the caller has them
             
         Returns:
             Signal string: 'BUY', 'SELL', or 'HOLD'
@@ -126,60 +748,122 @@ class MultiIndicatorStrategy:
             
         try:
             # Calculate indicators
-            indicators = self.calculate_indicators(df)
+            if indicators is None:
+                indicators = self._calculate_indicators_np(df)
             
-            # Get the latest values for each indicator
-            latest_idx = df.index[-1]
-            
-            # Extract latest values
-            rsi = indicators['rsi'].iloc[-1]
-            macd_line = indicators['macd_line'].iloc[-1]
-            signal_line = indicators['signal_line'].iloc[-1]
-            macd_histogram = indicators['macd_histogram'].iloc[-1]
-            price = df['close'].iloc[-1]
-            volume_ratio = indicators['volume_ratio'].iloc[-1]
-            atr = indicators['atr'].iloc[-1]
-            price_roc = indicators['price_roc'].iloc[-1]
-            
-            # Current price relation to EMAs
-            ema_9 = indicators['ema_9'].iloc[-1]
-            ema_21 = indicators['ema_21'].iloc[-1]
-            ema_50 = indicators['ema_50'].iloc[-1]
-            
-            # Buy conditions
-            buy_conditions = [
-                rsi > 50,  # RSI bullish momentum
-                rsi < 70,  # Not overbought
-                macd_line > signal_line,  # MACD bullish crossover
-                macd_histogram > 0,  # MACD histogram positive
-                price > ema_50,  # Price above EMA trend
-                volume_ratio > 1.0,  # Above average volume
-                price_roc > 0  # Price rising
-            ]
-            
-            # Sell conditions
-            sell_conditions = [
-                rsi < 50,  # RSI bearish momentum
-                rsi > 30,  # Not oversold
-                macd_line < signal_line,  # MACD bearish crossover
-                macd_histogram < 0,  # MACD histogram negative
-                price < ema_50,  # Price below EMA trend
-                volume_ratio > 1.0,  # Above average volume
-                price_roc < 0  # Price falling
-            ]
-            
-            # Consensus logic - need at least 5/7 conditions
-            if sum(buy_conditions) >= 5:
-                return 'BUY'
-            elif sum(sell_conditions) >= 5:
-                return 'SELL'
-            else:
-                return 'HOLD'
+            # Latest value of each condition input
+            return self._consensus_signal(
+                indicators['rsi'][-1],
+                indicators['macd_line'][-1],
+                indicators['signal_line'][-1],
+                indicators['macd_histogram'][-1],
+                df['close'].to_numpy()[-1],
+                indicators['ema_50'][-1],
+                indicators['volume_ratio'][-1],
+                indicators['price_roc'][-1]
+            )
                 
         except Exception as e:
             logger.error(f"Error generating signal: {e}")
             return 'HOLD'
     
+    @staticmethod
+    def _consensus_signal(rsi: float, macd_line: float, signal_line: float, macd_histogram: float,
+                          price: float, ema_50: float, volume_ratio: float, price_roc: float) -> str:
+        """
+        Signal from the latest indicator values: BUY or SELL when at least 5 of
+        the 7 conditions for it hold, else HOLD.
+        
+        Returns:
+            Signal string: 'BUY', 'SELL', or 'HOLD'
+        """
+        # Condition counts as plain int additions, without building lists to sum
+        volume_up = int(volume_ratio > 1.0)  # Above average volume
+        
+        # Buy conditions
+        buy_score = (int(rsi > 50)  # RSI bullish momentum
+                     + int(rsi < 70)  # Not overbought
+                     + int(macd_line > signal_line)  # MACD bullish crossover
+                     + int(macd_histogram > 0)  # MACD histogram positive
+                     + int(price > ema_50)  # Price above EMA trend
+                     + volume_up
+                     + int(price_roc > 0))  # Price rising
+        
+        # Consensus logic - need at least 5/7 conditions
+        if buy_score >= 5:
+            return 'BUY'
+        
+        # Sell conditions
+        sell_score = (int(rsi < 50)  # RSI bearish momentum
+                      + int(rsi > 30)  # Not oversold
+                      + int(macd_line < signal_line)  # MACD bearish crossover
+                      + int(macd_histogram < 0)  # MACD histogram negative
+                      + int(price < ema_50)  # Price below EMA trend
+                      + volume_up
+                      + int(price_roc < 0))  # Price falling
+        if sell_score >= 5:
+            return 'SELL'
+        return 'HOLD'
+    
+    def _compute_signal_series(self, df: pd.DataFrame, indicators: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Signals of every bar at once, from indicators calculated over the whole frame.
+        
+        All indicators only look back in time, so bar i gets the same signal as
+        ``generate_signal(df.iloc[:i + 1])``.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Indicator arrays calculated over df by _calculate_indicators_np
+            
+        Returns:
+            Array with 'BUY', 'SELL' or 'HOLD' per bar
+        """
+        rsi = indicators['rsi']
+        macd_line = indicators['macd_line']
+        signal_line = indicators['signal_line']
+        macd_histogram = indicators['macd_histogram']
+        price = df['close'].to_numpy()
+        volume_ratio = indicators['volume_ratio']
+        price_roc = indicators['price_roc']
+        ema_50 = indicators['ema_50']
+        
+        if NUMBA_AVAILABLE:
+            codes = _signal_codes_nb(rsi, macd_line, signal_line, macd_histogram,
+                                     price, ema_50, volume_ratio, price_roc)
+            signals = _SIGNAL_NAMES[codes]
+            
+            # generate_signal holds until it has 50 bars
+            signals[:49] = 'HOLD'
+            return signals
+        
+        buy_conditions = np.stack([
+            rsi > 50,
+            rsi < 70,
+            macd_line > signal_line,
+            macd_histogram > 0,
+            price > ema_50,
+            volume_ratio > 1.0,
+            price_roc > 0
+        ])
+        sell_conditions = np.stack([
+            rsi < 50,
+            rsi > 30,
+            macd_line < signal_line,
+            macd_histogram < 0,
+            price < ema_50,
+            volume_ratio > 1.0,
+            price_roc < 0
+        ])
+        
+        # Consensus logic - need at least 5/7 conditions
+        signals = np.where(buy_conditions.sum(axis=0) >= 5, 'BUY',
+                           np.where(sell_conditions.sum(axis=0) >= 5, 'SELL', 'HOLD'))
+        
+        # generate_signal holds until it has 50 bars
+        signals[:49] = 'HOLD'
+        return signals
+    
     def get_signal_with_details(self, df: pd.DataFrame) -> Dict[str, Union[str, float]]:
         """
         Generate a detailed signal with all relevant information.
@@ -195,73 +879,127 @@ class MultiIndicatorStrategy:
             
         try:
             # Calculate indicators
-            indicators = self.calculate_indicators(df)
+            indicators = self._calculate_indicators_np(df)
+            
+            # Keep this frame to seed the live state from, unless the state
+            # already describes it
+            state = self._live
+            if state is None or state.fingerprint != self._fingerprint(df):
+                self._live = None
+                self._live_source = df
             
             # Get the latest values for each indicator
             latest_idx = df.index[-1] if not df.empty else None
+            latest = {name: values[-1] for name, values in indicators.items()}
+            return self._signal_details(latest, df['close'].to_numpy()[-1], latest_idx)
             
-            # Extract latest values
-            rsi = indicators['rsi'].iloc[-1]
-            macd_line = indicators['macd_line'].iloc[-1]
-            signal_line = indicators['signal_line'].iloc[-1]
-            macd_histogram = indicators['macd_histogram'].iloc[-1]
-            price = df['close'].iloc[-1]
-            volume_ratio = indicators['volume_ratio'].iloc[-1]
-            atr = indicators['atr'].iloc[-1]
-            
-            # Current price relation to EMAs
-            ema_9 = indicators['ema_9'].iloc[-1]
-            ema_21 = indicators['ema_21'].iloc[-1]
-            ema_50 = indicators['ema_50'].iloc[-1]
-            
-            # Calculate entry price - current price
-            entry_price = price
-            
-            # Calculate stop loss and take profit based on ATR
-            sl_multiplier = 1.5  # Default SL multiplier, can be optimized
-            tp_ratio = 2.0  # Default TP:SL ratio, can be optimized
-            
-            stop_loss = entry_price - (atr * sl_multiplier)
-            take_profit = entry_price + (atr * sl_multiplier * tp_ratio)
-            
-            # Calculate risk/reward ratio
-            risk = entry_price - stop_loss
-            reward = take_profit - entry_price
-            rr_ratio = reward / risk if risk > 0 else 0
-            
-            # Determine signal
-            signal = self.generate_signal(df)
-            
-            # Build signal details
-            details = {
-                'signal': signal,
-                'price': price,
-                'rsi': rsi,
-                'macd': macd_histogram,
-                'entry': entry_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'risk_reward': rr_ratio,
-                'atr': atr,
-                'volume_ratio': volume_ratio,
-                'ema_trend': price > ema_50,
-                'timestamp': latest_idx
-            }
+        except Exception as e:
+            logger.error(f"Error generating detailed signal: {e}")
+            return {'signal': 'HOLD', 'reason': f'Error: {str(e)}'}
+    
+    def get_signal_with_details_live(self, bar: Dict[str, float]) -> Dict[str, Union[str, float]]:
+        """
+        Detailed signal for one new bar, advancing the indicators in O(1)
+        instead of recomputing the history.
+        
+        The state is seeded on the first live bar from the frame of the last
+        full get_signal_with_details; call that again to re-seed after a gap
+        in the feed.
+        
+        Args:
+            bar: New bar with 'open', 'high', 'low', 'close' and 'volume', and
+                optionally its 'timestamp'
             
-            # Add signal reason
-            if signal == 'BUY':
-                details['reason'] = "Bullish momentum with confirmation"
-            elif signal == 'SELL':
-                details['reason'] = "Bearish momentum with confirmation"
-            else:
-                details['reason'] = "Mixed signals, no clear direction"
-                
-            return details
+        Returns:
+            Dictionary with signal details
+        """
+        state = self._live
+        if state is None and self._live_source is not None:
+            state = self._live = LiveState.seed(self, self._live_source)
+            self._live_source = None
+        if state is None:
+            logger.warning("No live state; run get_signal_with_details on a full history first")
+            return {'signal': 'HOLD', 'reason': 'No live state'}
+        
+        try:
+            price = float(bar['close'])
+            timestamp = bar.get('timestamp')
+            latest = state.update(float(bar['open']), float(bar['high']), float(bar['low']),
+                                  price, float(bar['volume']), timestamp)
+            if latest is None:
+                logger.warning(f"Ignoring live bar {timestamp}, which is out of order")
+                return {'signal': 'HOLD', 'reason': 'Out-of-order bar'}
+            return self._signal_details(latest, price, timestamp)
             
         except Exception as e:
-            logger.error(f"Error generating detailed signal: {e}")
+            logger.error(f"Error generating live signal: {e}")
+            self._live = None
             return {'signal': 'HOLD', 'reason': f'Error: {str(e)}'}
     
+    def _signal_details(self, latest: Dict[str, float], price: float, timestamp) -> Dict[str, Union[str, float]]:
+        """
+        Signal details from the latest indicator values.
+        
+        Args:
+            latest: Latest value of each indicator
+            price: Latest close
+            timestamp: Index of the latest bar
+            
+        Returns:
+            Dictionary with signal details
+        """
+        # Extract latest values
+        rsi = latest['rsi']
+        macd_histogram = latest['macd_histogram']
+        volume_ratio = latest['volume_ratio']
+        atr = latest['atr']
+        ema_50 = latest['ema_50']
+        
+        # Calculate entry price - current price
+        entry_price = price
+        
+        # Calculate stop loss and take profit based on ATR
+        sl_multiplier = 1.5  # Default SL multiplier, can be optimized
+        tp_ratio = 2.0  # Default TP:SL ratio, can be optimized
+        
+        stop_loss = entry_price - (atr * sl_multiplier)
+        take_profit = entry_price + (atr * sl_multiplier * tp_ratio)
+        
+        # Calculate risk/reward ratio
+        risk = entry_price - stop_loss
+        reward = take_profit - entry_price
+        rr_ratio = reward / risk if risk > 0 else 0
+        
+        # Determine signal
+        signal = self._consensus_signal(rsi, latest['macd_line'], latest['signal_line'], macd_histogram,
+                                        price, ema_50, volume_ratio, latest['price_roc'])
+        
+        # Build signal details
+        details = {
+            'signal': signal,
+            'price': price,
+            'rsi': rsi,
+            'macd': macd_histogram,
+            'entry': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'risk_reward': rr_ratio,
+            'atr': atr,
+            'volume_ratio': volume_ratio,
+            'ema_trend': price > ema_50,
+            'timestamp': timestamp
+        }
+        
+        # Add signal reason
+        if signal == 'BUY':
+            details['reason'] = "Bullish momentum with confirmation"
+        elif signal == 'SELL':
+            details['reason'] = "Bearish momentum with confirmation"
+        else:
+            details['reason'] = "Mixed signals, no clear direction"
+            
+        return details
+    
     def calculate_position_size(self, 
                                account_balance: float, 
                                risk_percent: float, 
@@ -325,144 +1063,120 @@ class MultiIndicatorStrategy:
             }
             
         try:
-            # Calculate indicators
-            indicators = self.calculate_indicators(df)
+            # Calculate indicators and every bar's signal once, up front
+            indicators = self._calculate_indicators_np(df)
+            signals = self._compute_signal_series(df, indicators)
+            
+            # Plain float64 arrays for the trade simulation
+            dates = df.index
+            close_arr = df['close'].to_numpy()
+            low_arr = df['low'].to_numpy()
+            high_arr = df['high'].to_numpy()
+            atr_arr = indicators['atr'].astype(np.float64)
             
             # Initialize backtest variables
             balance = initial_balance
             position = 0  # 0 = no position, 1 = long position
-            entry_price = 0.0
-            stop_loss = 0.0
-            take_profit = 0.0
-            trades = []
-            daily_returns = []
-            
-            # Use a window to simulate trading
-            for i in range(50, len(df)):
-                current_date = df.index[i]
-                price = df['close'].iloc[i]
-                
-                # Check if we have a position and need to exit
-                if position == 1:
-                    # Check for stop loss hit
-                    if df['low'].iloc[i] <= stop_loss:
-                        # Exit at stop loss
-                        exit_price = stop_loss
-                        profit_loss = (exit_price / entry_price - 1) * position_value
-                        balance += position_value + profit_loss
-                        
-                        trades.append({
-                            'entry_date': entry_date,
-                            'exit_date': current_date,
-                            'entry_price': entry_price,
-                            'exit_price': exit_price,
-                            'position_value': position_value,
-                            'profit_loss': profit_loss,
-                            'exit_type': 'stop_loss'
-                        })
-                        
-                        position = 0
-                        
-                    # Check for take profit hit
-                    elif df['high'].iloc[i] >= take_profit:
-                        # Exit at take profit
-                        exit_price = take_profit
-                        profit_loss = (exit_price / entry_price - 1) * position_value
-                        balance += position_value + profit_loss
-                        
-                        trades.append({
-                            'entry_date': entry_date,
-                            'exit_date': current_date,
-                            'entry_price': entry_price,
-                            'exit_price': exit_price,
-                            'position_value': position_value,
-                            'profit_loss': profit_loss,
-                            'exit_type': 'take_profit'
-                        })
-                        
-                        position = 0
-                
-                # Check for entry signals if no position
-                if position == 0:
-                    # Get slice of data up to current point
-                    data_slice = df.iloc[:i+1]
+            
+            # Trade records as parallel arrays. Each trade takes at least one bar
+            # after the first 50, plus one more if the last is still open
+            n_bars = len(df)
+            max_trades = n_bars - 49
+            entry_idx = np.empty(max_trades, dtype=np.int64)
+            exit_idx = np.empty(max_trades, dtype=np.int64)
+            entry_prices = np.empty(max_trades)
+            exit_prices = np.empty(max_trades)
+            position_values = np.empty(max_trades)
+            pnl = np.empty(max_trades)
+            exit_codes = np.empty(max_trades, dtype=np.int8)
+            n_trades = 0
+            
+            if NUMBA_AVAILABLE:
+                n_trades, balance = _simulate_trades_nb(
+                    close_arr, low_arr, high_arr, atr_arr, signals == 'BUY', 50,
+                    float(initial_balance), float(risk_percent),
+                    entry_idx, exit_idx, entry_prices, exit_prices, position_values,
+                    pnl, exit_codes)
+            else:
+                # Only BUY bars can open a trade, and a trade lasts until its first
+                # stop loss or take profit bar, so jump from entry to exit to entry
+                # instead of stepping through every bar
+                entry_candidates = np.flatnonzero(signals == 'BUY')
+                i = 50
+                while True:
+                    # Next BUY signal while flat; a trade may open on the bar another one closed
+                    c = np.searchsorted(entry_candidates, i)
+                    if c == len(entry_candidates):
+                        break
+                    j = entry_candidates[c]
                     
-                    # Generate signal
-                    signal = self.generate_signal(data_slice)
+                    entry_price = close_arr[j]
                     
-                    if signal == 'BUY':
-                        entry_price = price
-                        entry_date = current_date
-                        
-                        # Calculate stop loss and take profit
-                        atr = indicators['atr'].iloc[i]
-                        stop_loss = entry_price - (atr * 1.5)
-                        take_profit = entry_price + (atr * 1.5 * 2.0)
-                        
-                        # Calculate position size
-                        position_value = self.calculate_position_size(
-                            balance, risk_percent, entry_price, stop_loss)
-                        
-                        # Enter position
-                        balance -= position_value
-                        position = 1
-            
-            # Close any open position at the end
-            if position == 1:
-                exit_price = df['close'].iloc[-1]
-                profit_loss = (exit_price / entry_price - 1) * position_value
-                balance += position_value + profit_loss
-                
-                trades.append({
-                    'entry_date': entry_date,
-                    'exit_date': df.index[-1],
-                    'entry_price': entry_price,
-                    'exit_price': exit_price,
-                    'position_value': position_value,
-                    'profit_loss': profit_loss,
-                    'exit_type': 'end_of_data'
-                })
-            
-            # Calculate performance metrics
-            total_return = balance - initial_balance
-            total_return_pct = (balance / initial_balance - 1) * 100
-            
-            # Win rate
-            winning_trades = [t for t in trades if t['profit_loss'] > 0]
-            win_rate = len(winning_trades) / len(trades) if trades else 0
-            
-            # Calculate Sharpe ratio (simplified)
-            if trades:
-                returns = [t['profit_loss'] / t['position_value'] for t in trades]
-                sharpe_ratio = np.mean(returns) / (np.std(returns) if np.std(returns) > 0 else 1) * np.sqrt(252)
-            else:
-                sharpe_ratio = 0
-                
-            # Calculate max drawdown
-            # This is simplified - ideally would track equity curve
-            if trades:
-                cumulative_returns = np.cumsum([t['profit_loss'] for t in trades])
-                max_dd = 0
-                peak = cumulative_returns[0]
-                
-                for ret in cumulative_returns:
-                    if ret > peak:
-                        peak = ret
-                    dd = (peak - ret) / peak if peak > 0 else 0
-                    max_dd = max(max_dd, dd)
-            else:
-                max_dd = 0
+                    # Calculate stop loss and take profit
+                    atr = atr_arr[j]
+                    stop_loss = entry_price - (atr * 1.5)
+                    take_profit = entry_price + (atr * 1.5 * 2.0)
+                    
+                    # Calculate position size
+                    position_value = self.calculate_position_size(
+                        balance, risk_percent, entry_price, stop_loss)
+                    
+                    # Enter position
+                    balance -= position_value
+                    position = 1
+                    
+                    k, exit_code = _first_exit_bar(low_arr, high_arr, j + 1, stop_loss, take_profit)
+                    if exit_code == _EXIT_END_OF_DATA:
+                        break  # Still open at the end of the data
+                    exit_price = stop_loss if exit_code == _EXIT_STOP_LOSS else take_profit
+                    
+                    profit_loss = (exit_price / entry_price - 1) * position_value
+                    balance += position_value + profit_loss
+                    
+                    entry_idx[n_trades] = j
+                    exit_idx[n_trades] = k
+                    entry_prices[n_trades] = entry_price
+                    exit_prices[n_trades] = exit_price
+                    position_values[n_trades] = position_value
+                    pnl[n_trades] = profit_loss
+                    exit_codes[n_trades] = exit_code
+                    n_trades += 1
+                    position = 0
+                    i = k
                 
-            return {
-                'final_balance': balance,
-                'total_return': total_return,
-                'total_return_pct': total_return_pct,
-                'sharpe_ratio': sharpe_ratio,
-                'max_drawdown': max_dd * 100,  # Convert to percentage
-                'win_rate': win_rate * 100,  # Convert to percentage
-                'trades': trades,
-                'num_trades': len(trades)
-            }
+                # Close any open position at the end
+                if position == 1:
+                    exit_price = close_arr[-1]
+                    profit_loss = (exit_price / entry_price - 1) * position_value
+                    balance += position_value + profit_loss
+                    
+                    entry_idx[n_trades] = j
+                    exit_idx[n_trades] = n_bars - 1
+                    entry_prices[n_trades] = entry_price
+                    exit_prices[n_trades] = exit_price
+                    position_values[n_trades] = position_value
+                    pnl[n_trades] = profit_loss
+                    exit_codes[n_trades] = _EXIT_END_OF_DATA
+                    n_trades += 1
+            
+            pnl = pnl[:n_trades]
+            result = _backtest_metrics(pnl, position_values[:n_trades], balance, initial_balance)
+            
+            # Trade records in the list-of-dicts form callers expect
+            result['trades'] = [
+                {
+                    'entry_date': dates[entry_idx[t]],
+                    'exit_date': dates[exit_idx[t]],
+                    'entry_price': entry_prices[t],
+                    'exit_price': exit_prices[t],
+                    'position_value': position_values[t],
+                    'profit_loss': pnl[t],
+                    'exit_type': _EXIT_TYPES[exit_codes[t]]
+                }
+                for t in range(n_trades)
+            ]
+            result['num_trades'] = n_trades
+            return result
                 
         except Exception as e:
             logger.error(f"Error in backtest: {e}")
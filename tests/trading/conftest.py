@@ -0,0 +1,49 @@
+"""
+Test Configuration for Trading Components
+Provides synthetic market data and shared fixtures for the trading tests
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+def make_ohlcv(n_bars: int, seed: int = 0, start: str = '2024-01-01') -> pd.DataFrame:
+    """Random-walk hourly OHLCV bars with a realistic high/low spread"""
+    rng = np.random.default_rng(seed)
+    base = 100 + np.cumsum(rng.normal(0, 1, n_bars))
+    return pd.DataFrame({
+        'open': base,
+        'high': base + rng.uniform(0, 2, n_bars),
+        'low': base - rng.uniform(0, 2, n_bars),
+        'close': base + rng.normal(0, 0.3, n_bars),
+        'volume': rng.uniform(1, 10, n_bars)
+    }, index=pd.date_range(start, periods=n_bars, freq='h'))
+
+@pytest.fixture
+def ohlcv():
+    """Factory for synthetic OHLCV frames"""
+    return make_ohlcv
+
+def make_market(n_days: int = 60, symbols=('BTC/USDT', 'ETH/USDT'), seed: int = 0) -> pd.DataFrame:
+    """Daily bars for several symbols in the bot's long format, one random walk per symbol"""
+    frames = []
+    for offset, symbol in enumerate(symbols):
+        bars = make_ohlcv(n_days, seed + offset)
+        bars.index = pd.date_range('2024-01-01', periods=n_days, freq='D')
+        frames.append(bars.rename_axis('timestamp').reset_index().assign(symbol=symbol))
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def market():
+    """Factory for synthetic multi-symbol market data"""
+    return make_market
+
+@pytest.fixture
+def bot_config():
+    """Default bot configuration, built without reading config files or the environment"""
+    from src.config.config_loader import BotConfig
+    return BotConfig()
@@ -0,0 +1,394 @@
+"""
+Unit Tests for the FinRL trading environment and data processor
+Checks the compiled trade and reward kernels against their plain-Python
+definitions, and the environment's state and portfolio bookkeeping
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("gymnasium")
+pytest.importorskip("stable_baselines3")
+pytest.importorskip("pandas_ta")
+
+from src.trading.rl import finrl_environment as fe
+
+def make_env(market: pd.DataFrame, **kwargs) -> 'fe.CryptoTradingEnv':
+    """Environment over the processed market data"""
+    return fe.CryptoTradingEnv(fe.FinRLDataProcessor().process_data(market), **kwargs)
+
+def reference_trades(actions, prices, stocks_owned, balance, transaction_cost_pct):
+    """The original per-symbol trade loop"""
+    stocks_owned = stocks_owned.astype(np.float64)
+    fees = 0.0
+    for i, action in enumerate(actions):
+        if action > 0:
+            quantity = action * balance / prices[i]
+            cost = quantity * prices[i]
+            if quantity > 0 and cost * (1 + transaction_cost_pct) <= balance:
+                balance -= cost * (1 + transaction_cost_pct)
+                fees += cost * transaction_cost_pct
+                stocks_owned[i] += quantity
+        elif action < 0 and stocks_owned[i] > 0:
+            quantity = -action * stocks_owned[i]
+            balance += quantity * prices[i] * (1 - transaction_cost_pct)
+            fees += quantity * prices[i] * transaction_cost_pct
+            stocks_owned[i] -= quantity
+    return balance, fees, stocks_owned
+
+class TestTradeKernel:
+    """The compiled trade and reward kernels"""
+    
+    def test_trades_match_reference(self):
+        """Balance, positions and fees match the per-symbol loop for random actions"""
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            actions = rng.uniform(-1, 1, 4).astype(np.float32)
+            prices = rng.uniform(10, 200, 4).astype(np.float32)
+            stocks_owned = rng.uniform(0, 5, 4).astype(np.float32)
+            
+            expected_balance, fees, expected_stocks = reference_trades(
+                actions, prices, stocks_owned, 5000.0, 0.001)
+            balance, value, action_l1 = fe._execute_trades_nb(
+                actions, prices, stocks_owned, 5000.0, 8000.0, 0.001)
+            
+            assert balance == pytest.approx(expected_balance, rel=1e-6)
+            assert value == pytest.approx(8000.0 - fees, rel=1e-9)
+            np.testing.assert_allclose(stocks_owned, expected_stocks, rtol=1e-5)
+            assert action_l1 == pytest.approx(np.abs(actions).sum(), rel=1e-6)
+    
+    def test_unaffordable_buy_is_skipped(self):
+        """Buying with all the cash cannot cover the fee, so nothing is bought"""
+        stocks_owned = np.zeros(1, dtype=np.float32)
+        
+        balance, value, _ = fe._execute_trades_nb(
+            np.ones(1, dtype=np.float32), np.full(1, 100.0, dtype=np.float32),
+            stocks_owned, 1000.0, 1000.0, 0.001)
+        
+        assert (balance, value) == (1000.0, 1000.0)
+        assert stocks_owned[0] == 0.0
+    
+    def test_reward_is_sharpe_ratio(self):
+        """The reward term is the mean over the standard deviation of the returns"""
+        returns = np.random.default_rng(1).normal(0.001, 0.01, 30)
+        
+        ratio = fe._reward_nb(returns.sum(), (returns ** 2).sum(), len(returns))
+        
+        assert ratio == pytest.approx(returns.mean() / returns.std(), rel=1e-6)
+    
+    def test_reward_of_short_or_flat_window(self):
+        """Five returns or fewer, or a constant return, give no Sharpe term"""
+        assert fe._reward_nb(0.05, 0.0005, 5) == 0.0
+        assert fe._reward_nb(30 * 0.01, 30 * 0.01 ** 2, 30) == 0.0
+
+class TestRewardWindow:
+    """The reward's rolling return window"""
+    
+    def test_running_moments_track_last_returns(self, market):
+        """The running sums cover exactly the last 30 returns pushed"""
+        env = make_env(market(60))
+        returns = np.random.default_rng(2).normal(0, 0.01, 100)
+        
+        for value in returns:
+            env._push_return(value)
+        
+        window = returns[-30:]
+        assert env._ret_count == 30
+        assert env._ret_sum == pytest.approx(window.sum(), abs=1e-6)
+        assert env._ret_sq == pytest.approx((window ** 2).sum(), rel=1e-5)
+    
+    def test_reset_clears_window(self, market):
+        """A reset starts the window over from the single zero return"""
+        env = make_env(market(60))
+        env.reset()
+        for _ in range(10):
+            env.step(np.full(2, 0.3))
+        
+        env.reset()
+        
+        assert (env._ret_count, env._ret_sum, env._ret_sq) == (1, 0.0, 0.0)
+
+class TestEpisodeMemory:
+    """Preallocated episode memory"""
+    
+    def test_memory_records_every_step(self, market):
+        """Account values and actions of each step come back from the save methods"""
+        env = make_env(market(60))
+        env.reset()
+        rng = np.random.default_rng(3)
+        values, actions = [env.initial_amount], []
+        
+        done = False
+        while not done:
+            action = rng.uniform(-1.5, 1.5, 2)
+            _, _, done, _, info = env.step(action)
+            values.append(info['portfolio_value'])
+            actions.append(np.clip(action, -1, 1))
+        
+        account = env.save_asset_memory()
+        assert len(account) == len(values) == len(env.trade_dates)
+        np.testing.assert_allclose(account['account_value'], values, rtol=1e-6)
+        assert list(account['date']) == env.trade_dates[:len(values)]
+        np.testing.assert_allclose(env.save_action_memory()[['BTC/USDT_action', 'ETH/USDT_action']],
+                                   actions, rtol=1e-6)
+
+class TestObservation:
+    """The observation vector: balance, positions, prices, then each indicator for every symbol"""
+    
+    def test_state_layout(self, market):
+        """Each section of the state holds the current day's data"""
+        env = make_env(market(60))
+        env.reset()
+        env.step(np.array([0.5, 0.2]))
+        state = env.state
+        
+        day = env.df[env.df['date'] == env.trade_dates[env.day]]
+        tech = day[env.tech_indicator_list].to_numpy(dtype=np.float32).T.ravel()
+        assert 0 < state[0] < env.initial_amount
+        np.testing.assert_allclose(state[1:3], env.stocks_owned, rtol=1e-6)
+        np.testing.assert_allclose(state[3:5], day['close'], rtol=1e-6)
+        np.testing.assert_array_equal(state[5:], tech)
+        assert state.shape == env.observation_space.shape
+
+class TestDataProcessor:
+    """Indicators, turbulence and VIX from the bot's market data"""
+    
+    def test_indicators_per_symbol(self, market):
+        """Each symbol's indicators depend on its own bars only"""
+        data = market(80)
+        processor = fe.FinRLDataProcessor(use_turbulence=False)
+        
+        combined = processor.process_data(data)
+        
+        for symbol, bars in data.groupby('symbol'):
+            alone = processor.process_data(bars.reset_index(drop=True))
+            rows = combined[combined['tic'] == symbol].reset_index(drop=True)
+            for column in processor.tech_indicator_list:
+                np.testing.assert_allclose(rows[column], alone[column], rtol=1e-6, err_msg=column)
+    
+    def test_indicator_values(self, market):
+        """The indicator columns are pandas-ta's indicators of the symbol's bars"""
+        import pandas_ta as ta
+        data = market(80, symbols=('BTC/USDT',))
+        
+        processed = fe.FinRLDataProcessor(use_turbulence=False).process_data(data)
+        
+        np.testing.assert_allclose(processed['rsi'].iloc[20:], ta.rsi(data['close'], length=14).iloc[20:], rtol=1e-5)
+        np.testing.assert_allclose(processed['ema_21'].iloc[20:], ta.ema(data['close'], length=21).iloc[20:], rtol=1e-5)
+    
+    def test_vix_averages_symbol_volatility(self, market):
+        """VIX is the mean across symbols of their own rolling return volatility"""
+        data = market(60)
+        
+        processed = fe.FinRLDataProcessor().process_data(data)
+        
+        volatility = [
+            bars['close'].pct_change().rolling(19, min_periods=5).std().to_numpy() * np.sqrt(252) * 100
+            for _, bars in data.groupby('symbol')
+        ]
+        expected = pd.DataFrame(volatility).mean().fillna(20.0).to_numpy()
+        np.testing.assert_allclose(processed['vix'].to_numpy()[::2], expected, rtol=1e-9)
+
+class TestPortfolioValue:
+    """The incrementally maintained portfolio value"""
+    
+    def test_value_is_cash_plus_holdings(self, market):
+        """After every step the value equals the cash plus the holdings at the current prices"""
+        env = make_env(market(60), transaction_cost_pct=0.002)
+        env.reset()
+        rng = np.random.default_rng(4)
+        
+        done = False
+        while not done:
+            _, _, done, _, _ = env.step(rng.uniform(-1, 1, 2))
+            holdings = np.dot(env.stocks_owned.astype(np.float64), env.stocks_price.astype(np.float64))
+            assert env.portfolio_value == pytest.approx(float(env.state[0]) + holdings, rel=1e-6)
+
+class TestPanels:
+    """Day-indexed NumPy panels built from the long frame"""
+    
+    def test_panels_follow_frame(self, market):
+        """Row day, column symbol of the close panel is that symbol's close on that day"""
+        env = make_env(market(60))
+        
+        closes = env.df.pivot(index='date', columns='tic', values='close')[env.tic_list]
+        np.testing.assert_allclose(env._close_panel, closes.to_numpy(), rtol=1e-6)
+        assert env._tech_panel.shape == (60, 2 * len(env.tech_indicator_list))
+    
+    def test_missing_rows_are_rejected(self, market):
+        """The panels need one row per symbol for every date"""
+        df = fe.FinRLDataProcessor().process_data(market(60))
+        
+        with pytest.raises(ValueError, match="one row per symbol"):
+            fe.CryptoTradingEnv(df.drop(index=5))
+
+class TestFloat32Buffers:
+    """float32 observations and memory, float64 portfolio value"""
+    
+    def test_buffer_dtypes(self, market):
+        """Observation and memory buffers stay float32 through an episode"""
+        env = make_env(market(60))
+        state, _ = env.reset()
+        state, *_ = env.step([0.5, -0.5])
+        
+        assert state.dtype == np.float32
+        assert env.observation_space.dtype == np.float32
+        assert env.asset_memory.dtype == env.actions_memory.dtype == np.float32
+    
+    def test_value_does_not_drift(self, market):
+        """Marking holdings to market over a long episode adds no rounding drift"""
+        env = make_env(market(400))
+        env.reset()
+        env.step([0.5, 0.5])
+        
+        def offset():
+            holdings = np.dot(env.stocks_owned.astype(np.float64), env.stocks_price.astype(np.float64))
+            return env.portfolio_value - (float(env.state[0]) + holdings)
+        
+        start = offset()
+        done = False
+        while not done:
+            _, _, done, _, _ = env.step([0.0, 0.0])
+            assert offset() == pytest.approx(start, abs=1e-8)
+
+class TestSeeding:
+    """reset(seed) per the Gymnasium contract"""
+    
+    def test_seeded_random_start_is_reproducible(self, market):
+        """The same seed draws the same start day; other seeds vary it"""
+        data = market(120)
+        env = make_env(data, env_config={'random_start': True})
+        other = make_env(data, env_config={'random_start': True})
+        
+        starts = []
+        for seed in range(10):
+            env.reset(seed=seed)
+            other.reset(seed=seed)
+            assert env.day == other.day
+            starts.append(env.day)
+        
+        assert len(set(starts)) > 1
+        assert all(0 <= day < len(env.trade_dates) - 1 for day in starts)
+    
+    def test_fixed_start_by_default(self, market):
+        """Without random_start every episode starts on the first day"""
+        env = make_env(market(60))
+        env.reset(seed=3)
+        
+        assert env.day == 0
+
+class TestTurbulence:
+    """The turbulence risk indicator"""
+    
+    def test_turbulence_per_symbol(self, market):
+        """Turbulence is each symbol's own annualized rolling return volatility"""
+        data = market(60)
+        
+        processed = fe.FinRLDataProcessor().process_data(data)
+        
+        for symbol, bars in data.groupby('symbol'):
+            expected = bars['close'].pct_change().fillna(0).rolling(20).std().fillna(0) * np.sqrt(252)
+            rows = processed[processed['tic'] == symbol]
+            np.testing.assert_allclose(rows['turbulence'], expected, rtol=1e-9, atol=1e-12)
+
+class TestTradingPenalty:
+    """The reward's penalty on action size"""
+    
+    def test_trading_penalty(self, market):
+        """The reward is the scaled return less 0.001 per unit of total action size"""
+        env = make_env(market(60))
+        env.reset()
+        value = env.portfolio_value
+        
+        _, reward, _, _, _ = env.step([0.4, -0.6])
+        
+        portfolio_return = (env.portfolio_value - value) / value
+        assert reward == pytest.approx(portfolio_return * env.reward_scaling - 0.001 * 1.0, rel=1e-6)
+
+class TestPrecomputedIndicators:
+    """Indicator columns the input already carries"""
+    
+    def test_existing_columns_are_kept(self, market):
+        """A column the frame already has is neither recomputed nor overwritten"""
+        data = market(60).assign(rsi=55.0)
+        
+        processed = fe.FinRLDataProcessor(use_turbulence=False).process_data(data)
+        
+        assert (processed['rsi'] == 55.0).all()
+        assert processed['macd'].abs().sum() > 0
+    
+    def test_nothing_to_compute(self, market):
+        """With every indicator present the frame passes through unchanged"""
+        processor = fe.FinRLDataProcessor(tech_indicator_list=['volume_ratio'], use_turbulence=False)
+        data = market(60).assign(volume_ratio=1.5)
+        
+        processed = processor.process_data(data)
+        
+        assert (processed['volume_ratio'] == 1.5).all()
+
+class TestProcessedDataCache:
+    """The opt-in Parquet cache of processed frames"""
+    
+    def test_cache_is_opt_in(self, market, tmp_path):
+        """Without use_cache nothing is written to the cache directory"""
+        fe.FinRLDataProcessor(cache_dir=str(tmp_path)).process_data(market(60))
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_cached_frame_is_reused(self, market, tmp_path):
+        """A second run on the same input reads the first run's result back"""
+        pytest.importorskip("pyarrow")
+        processor = fe.FinRLDataProcessor(use_cache=True, cache_dir=str(tmp_path))
+        data = market(60)
+        
+        first = processor.process_data(data)
+        second = processor.process_data(data)
+        
+        pd.testing.assert_frame_equal(first, second)
+        assert fe.FinRLDataProcessor.clear_cache(str(tmp_path)) == 1
+    
+    def test_key_covers_settings_and_version(self, market, tmp_path, monkeypatch):
+        """Other data, indicators or processing version map to another cache file"""
+        data = market(60)
+        processor = fe.FinRLDataProcessor(cache_dir=str(tmp_path))
+        path = processor._cache_path(data)
+        
+        assert fe.FinRLDataProcessor(cache_dir=str(tmp_path))._cache_path(data) == path
+        assert processor._cache_path(market(40, seed=1)) != path
+        assert fe.FinRLDataProcessor(tech_indicator_list=['rsi'], cache_dir=str(tmp_path))._cache_path(data) != path
+        monkeypatch.setattr(fe, '_PROCESSING_VERSION', fe._PROCESSING_VERSION + 1)
+        assert processor._cache_path(data) != path
+
+class TestIndicatorFill:
+    """Filling indicator warm-up gaps"""
+    
+    def test_fill_stays_within_symbol(self, market):
+        """A symbol's warm-up rows are zero-filled, never filled from another symbol"""
+        data = market(90)
+        data = data[(data['symbol'] == 'BTC/USDT') | (data['timestamp'] >= data['timestamp'].iloc[30])]
+        
+        processed = fe.FinRLDataProcessor(use_turbulence=False).process_data(data)
+        
+        late = processed[processed['tic'] == 'ETH/USDT']
+        assert (late['rsi'].iloc[:14] == 0).all()
+        assert (late['ema_50'].iloc[:49] == 0).all()
+        assert (late['ema_50'].iloc[49:] != 0).all()
+    
+    def test_indicators_are_float32(self, market):
+        """Computed indicator columns are stored as float32"""
+        processed = fe.FinRLDataProcessor().process_data(market(60))
+        
+        assert (processed[fe.FinRLDataProcessor().tech_indicator_list].dtypes == np.float32).all()
+
+class TestSpaces:
+    """Action and observation spaces sized from the symbol count"""
+    
+    @pytest.mark.parametrize("symbols", [('BTC/USDT',), ('BTC/USDT', 'ETH/USDT', 'SOL/USDT')])
+    def test_space_shapes(self, market, symbols):
+        """One action per symbol; balance, positions, prices and indicators per symbol observed"""
+        env = make_env(market(40, symbols=symbols))
+        n = len(symbols)
+        
+        assert env.action_space.shape == (n,)
+        assert env.observation_space.shape == (1 + 2 * n + n * len(env.tech_indicator_list),)
+        assert env.reset()[0].shape == env.observation_space.shape
@@ -0,0 +1,424 @@
+"""
+Unit Tests for GeneticOptimizer
+Checks the fitness cache, parallel and batched evaluation, and that the
+vectorized simple GA and the DEAP path still optimize correctly
+"""
+import logging
+import numpy as np
+import pytest
+
+# Importing goes through the optimization package, which loads the strategies and their dependencies
+go = pytest.importorskip("src.trading.optimization.genetic_optimizer")
+GeneticOptimizer = go.GeneticOptimizer
+
+RANGES = {'period': (2, 30), 'ratio': (0.0, 4.0)}
+
+def quadratic(params):
+    """Fitness with its maximum 0 at period 12, ratio 1.5; module-level so it pickles"""
+    return -(params['period'] - 12) ** 2 - (params['ratio'] - 1.5) ** 2
+
+def counting(fitness):
+    """Wrap a fitness function in a closure that records its calls (and so never pickles)"""
+    calls = []
+    def wrapped(params):
+        calls.append(dict(params))
+        return fitness(params)
+    wrapped.calls = calls
+    return wrapped
+
+class TestFitnessCache:
+    """Memoized fitness evaluations"""
+    
+    def test_repeated_genotypes_are_evaluated_once(self):
+        """Each distinct genotype reaches the fitness function once, repeats hit the cache"""
+        fitness = counting(quadratic)
+        optimizer = GeneticOptimizer(population_size=20, generations=15, parameter_ranges=RANGES,
+                                     fitness_function=fitness)
+        
+        optimizer.optimize()
+        
+        genotypes = {optimizer._cache_key(list(params.values())) for params in fitness.calls}
+        assert len(genotypes) == len(fitness.calls) == optimizer.cache_misses
+        assert optimizer.cache_hits > 0
+    
+    def test_new_fitness_function_clears_cache(self):
+        """Cached values of an old fitness function are not reused"""
+        optimizer = GeneticOptimizer(population_size=10, generations=3, parameter_ranges=RANGES,
+                                     fitness_function=counting(quadratic))
+        optimizer.optimize()
+        
+        optimizer.set_fitness_function(counting(lambda params: -quadratic(params)))
+        
+        assert optimizer.cache_misses == optimizer.cache_hits == 0
+        assert len(optimizer._fitness_cache) == 0
+
+class TestParallelEvaluation:
+    """Fitness evaluation in worker processes"""
+    
+    def test_pool_scores_match_fitness(self):
+        """Scores computed by the workers belong to the individuals they were sent for"""
+        optimizer = GeneticOptimizer(population_size=16, generations=5, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=2)
+        
+        result = optimizer.optimize()
+        
+        assert result['best_fitness'] == pytest.approx(quadratic(result['best_params']))
+        assert optimizer.cache_misses > 0
+    
+    def test_unpicklable_fitness_runs_serially(self, caplog):
+        """A closure cannot be sent to the workers, so it is evaluated in this process"""
+        fitness = counting(quadratic)
+        optimizer = GeneticOptimizer(population_size=10, generations=3, parameter_ranges=RANGES,
+                                     fitness_function=fitness, n_workers=2)
+        
+        with caplog.at_level(logging.WARNING):
+            optimizer.optimize()
+        
+        assert "evaluating serially" in caplog.text
+        assert len(fitness.calls) == optimizer.cache_misses
+    
+    def test_manager_fitness_pickles(self, ohlcv):
+        """The optimization manager's fitness function can be sent to the workers"""
+        import functools
+        import pickle
+        manager = pytest.importorskip("src.trading.optimization.optimization_manager")
+        
+        fitness = pickle.loads(pickle.dumps(functools.partial(manager._strategy_fitness, data=ohlcv(100))))
+        
+        assert fitness.func is manager._strategy_fitness
+
+class TestPopulation:
+    """Batched random individuals"""
+    
+    def test_random_population_covers_ranges(self):
+        """Integer genes are whole numbers over [min, max], float genes stay in range"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES)
+        
+        population = optimizer._random_population(2000)
+        
+        assert population.shape == (2000, 2)
+        periods, ratios = population[:, 0], population[:, 1]
+        assert set(periods) == set(range(2, 31))
+        assert ratios.min() >= 0.0 and ratios.max() <= 4.0
+
+class TestSimpleAlgorithm:
+    """The NumPy/Numba GA used when DEAP is not installed"""
+    
+    @pytest.fixture(autouse=True)
+    def without_deap(self, monkeypatch):
+        """Run the simple GA even where DEAP is installed"""
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', False)
+    
+    def test_finds_optimum(self):
+        """The simple GA converges near the fitness maximum"""
+        optimizer = GeneticOptimizer(population_size=30, generations=40, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=1)
+        
+        result = optimizer.optimize()
+        
+        assert abs(result['best_params']['period'] - 12) <= 1
+        assert isinstance(result['best_params']['period'], int)
+        assert result['best_fitness'] > -1.5
+        assert result['best_fitness'] == pytest.approx(quadratic(result['best_params']))
+    
+    def test_history_tracks_best(self):
+        """Each generation's recorded best never falls below the elite's"""
+        optimizer = GeneticOptimizer(population_size=20, generations=15, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=1)
+        optimizer.optimize()
+        
+        best = [entry['best_fitness'] for entry in optimizer.history]
+        assert len(best) == 15
+        assert all(later >= earlier for earlier, later in zip(best, best[1:]))
+
+class TestFloatGrid:
+    """Float genes on a fixed grid, so near-identical genotypes share a cache entry"""
+    
+    def test_float_genes_on_grid(self):
+        """Random float genes are whole multiples of the range over float_resolution"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, float_resolution=8)
+        
+        steps = optimizer._random_population(500)[:, 1] / 0.5
+        
+        np.testing.assert_allclose(steps, np.round(steps), atol=1e-9)
+        assert set(np.round(steps)) <= set(range(9))
+    
+    def test_cache_key_is_grid_position(self):
+        """Genes snapped to the same grid point share one cache key"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, float_resolution=8)
+        
+        assert optimizer._cache_key([5, 1.49]) == optimizer._cache_key([5, 1.51]) == (3, 3)
+        assert optimizer._cache_key([5, 1.49]) != optimizer._cache_key([5, 1.0])
+
+class TestSeeding:
+    """Reproducible runs from one seeded generator"""
+    
+    @pytest.mark.parametrize("use_deap", [True, False], ids=['deap', 'simple'])
+    def test_same_seed_same_run(self, monkeypatch, use_deap):
+        """Two runs with one seed evolve the same populations"""
+        if use_deap and not go.DEAP_AVAILABLE:
+            pytest.skip("DEAP is not installed")
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', use_deap)
+        
+        runs = []
+        for _ in range(2):
+            optimizer = GeneticOptimizer(population_size=12, generations=8, parameter_ranges=RANGES,
+                                         fitness_function=quadratic, n_workers=1, seed=7)
+            runs.append((optimizer.optimize()['best_params'], optimizer.history))
+        
+        assert runs[0][0] == runs[1][0]
+        assert [entry['best_fitness'] for entry in runs[0][1]] == [entry['best_fitness'] for entry in runs[1][1]]
+
+class TestSelection:
+    """Vectorized tournament selection"""
+    
+    def test_tournament_winner_distribution(self):
+        """Winners of 3-way tournaments over fitness 0..9 average E[max of 3 draws] = 6.975"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, tournament_size=3, seed=0)
+        fitness = np.arange(10, dtype=np.float64)
+        
+        winners = optimizer._select_parents(fitness, 20000)
+        
+        assert fitness[winners].mean() == pytest.approx(6.975, abs=0.1)
+    
+    def test_winner_is_best_of_its_tournament(self):
+        """Tournaments much larger than the population pick its fittest individual"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, tournament_size=50, seed=1)
+        fitness = np.random.default_rng(2).normal(size=4)
+        
+        winners = optimizer._select_parents(fitness, 200)
+        
+        assert (winners == np.argmax(fitness)).all()
+
+def constant(params):
+    """Fitness that never improves"""
+    return 1.0
+
+def shifted(params):
+    """quadratic moved down by 100"""
+    return quadratic(params) - 100.0
+
+class TestEarlyStopping:
+    """Stopping once the best fitness plateaus"""
+    
+    @pytest.mark.parametrize("use_deap", [True, False], ids=['deap', 'simple'])
+    def test_stops_after_patience(self, monkeypatch, use_deap):
+        """A flat fitness stops the run patience generations after the first"""
+        if use_deap and not go.DEAP_AVAILABLE:
+            pytest.skip("DEAP is not installed")
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', use_deap)
+        optimizer = GeneticOptimizer(population_size=10, generations=50, parameter_ranges=RANGES,
+                                     fitness_function=constant, n_workers=1, patience=4)
+        
+        result = optimizer.optimize()
+        
+        assert result['generations_run'] == 5
+        assert result['generations'] == 50
+    
+    def test_runs_every_generation_by_default(self, monkeypatch):
+        """Without patience every generation runs"""
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', False)
+        optimizer = GeneticOptimizer(population_size=10, generations=12, parameter_ranges=RANGES,
+                                     fitness_function=constant, n_workers=1)
+        
+        assert optimizer.optimize()['generations_run'] == 12
+    
+    def test_best_is_reset_between_runs(self):
+        """A second run reports its own best, not the better one of an earlier run"""
+        optimizer = GeneticOptimizer(population_size=10, generations=5, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=1, patience=2)
+        optimizer.optimize()
+        
+        optimizer.set_fitness_function(shifted)
+        result = optimizer.optimize()
+        
+        assert result['best_fitness'] == pytest.approx(shifted(result['best_params']))
+        assert result['best_fitness'] <= -100.0
+
+# Set in each worker process by set_offset
+WORKER_STATE = {'offset': 0.0}
+
+def set_offset(offset):
+    """Worker initializer"""
+    WORKER_STATE['offset'] = offset
+
+def offset_quadratic(params):
+    """quadratic plus the offset installed by the worker initializer"""
+    return quadratic(params) + WORKER_STATE['offset']
+
+class TestWorkerInitializer:
+    """Per-worker setup for the fitness function"""
+    
+    @pytest.fixture(autouse=True)
+    def restore_state(self, monkeypatch):
+        """Undo the initializer's effect on this process"""
+        monkeypatch.setitem(WORKER_STATE, 'offset', 0.0)
+    
+    def test_initializer_runs_in_workers(self):
+        """Workers evaluate with the state their initializer set up"""
+        optimizer = GeneticOptimizer(population_size=12, generations=3, parameter_ranges=RANGES,
+                                     fitness_function=offset_quadratic, n_workers=2,
+                                     worker_init=set_offset, worker_init_args=(100.0,))
+        
+        result = optimizer.optimize()
+        
+        assert result['best_fitness'] == pytest.approx(quadratic(result['best_params']) + 100.0)
+    
+    def test_initializer_runs_here_when_serial(self):
+        """Without workers the initializer prepares this process instead"""
+        optimizer = GeneticOptimizer(population_size=12, generations=3, parameter_ranges=RANGES,
+                                     fitness_function=offset_quadratic, n_workers=1,
+                                     worker_init=set_offset, worker_init_args=(50.0,))
+        
+        result = optimizer.optimize()
+        
+        assert result['best_fitness'] == pytest.approx(quadratic(result['best_params']) + 50.0)
+
+def batched_quadratic(batch, names):
+    """quadratic of every row of a (n, n_genes) batch"""
+    period = batch[:, names.index('period')]
+    ratio = batch[:, names.index('ratio')]
+    return -(period - 12) ** 2 - (ratio - 1.5) ** 2
+
+class TestBatchedFitness:
+    """A fitness function that scores a whole population per call"""
+    
+    @pytest.mark.parametrize("use_deap", [True, False], ids=['deap', 'simple'])
+    def test_one_call_per_generation(self, monkeypatch, use_deap):
+        """Each generation's new genotypes go to the batched function in one call"""
+        if use_deap and not go.DEAP_AVAILABLE:
+            pytest.skip("DEAP is not installed")
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', use_deap)
+        batches = []
+        def recording(batch, names):
+            batches.append(batch.shape)
+            return batched_quadratic(batch, names)
+        
+        optimizer = GeneticOptimizer(population_size=16, generations=6, parameter_ranges=RANGES,
+                                     batched_fitness_function=recording)
+        result = optimizer.optimize()
+        
+        assert len(batches) <= 7
+        assert sum(rows for rows, _ in batches) == optimizer.cache_misses
+        assert all(genes == 2 for _, genes in batches)
+        assert result['best_fitness'] == pytest.approx(quadratic(result['best_params']))
+    
+    def test_matches_per_individual_fitness(self):
+        """Batched and per-individual scoring give the same fitness for each individual"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, batched_fitness_function=batched_quadratic)
+        population = optimizer._random_population(40)
+        
+        scores = optimizer._evaluate_population(population)
+        
+        expected = [quadratic(optimizer._to_params(row)) for row in population]
+        np.testing.assert_allclose(scores, expected)
+
+class TestCacheBound:
+    """LRU eviction from the fitness cache"""
+    
+    def test_cache_is_bounded(self):
+        """The cache keeps at most cache_max entries, dropping the least recently used"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, fitness_function=quadratic,
+                                     n_workers=1, cache_max=8, seed=0)
+        population = optimizer._random_population(30)
+        
+        optimizer._evaluate_population(population)
+        optimizer._evaluate_population(population[:3])
+        
+        assert len(optimizer._fitness_cache) == 8
+        assert list(optimizer._fitness_cache)[-3:] == [optimizer._cache_key(row) for row in population[:3]]
+    
+    def test_unbounded_cache(self):
+        """cache_max=None keeps every genotype"""
+        optimizer = GeneticOptimizer(parameter_ranges=RANGES, fitness_function=quadratic,
+                                     n_workers=1, cache_max=None, seed=0)
+        population = optimizer._random_population(30)
+        
+        optimizer._evaluate_population(population)
+        
+        assert len(optimizer._fitness_cache) == len({optimizer._cache_key(row) for row in population})
+
+class TestDeapAlgorithm:
+    """The DEAP path"""
+    
+    @pytest.fixture(autouse=True)
+    def with_deap(self):
+        """Skip where DEAP is not installed"""
+        if not go.DEAP_AVAILABLE:
+            pytest.skip("DEAP is not installed")
+    
+    def test_statistics_in_history(self):
+        """Every generation records the best, average and spread of the population's fitness"""
+        optimizer = GeneticOptimizer(population_size=16, generations=6, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=2, seed=3)
+        
+        result = optimizer.optimize()
+        
+        assert len(optimizer.history) == 7
+        for entry in optimizer.history:
+            assert entry['best_fitness'] >= entry['avg_fitness']
+            assert entry['std_fitness'] >= 0
+        assert result['best_fitness'] == max(entry['best_fitness'] for entry in optimizer.history)
+    
+    def test_new_ranges_replace_gene_generators(self):
+        """Changing the ranges swaps the per-parameter generators and evolves the new parameters"""
+        def spread(params):
+            return -(params['slow'] - 3 * params['fast']) ** 2
+        
+        optimizer = GeneticOptimizer(population_size=12, generations=4, parameter_ranges=RANGES,
+                                     n_workers=1)
+        
+        optimizer.set_parameter_ranges({'fast': (2, 10), 'slow': (10, 40)})
+        optimizer.set_fitness_function(spread)
+        result = optimizer.optimize()
+        
+        assert hasattr(optimizer.toolbox, 'fast') and hasattr(optimizer.toolbox, 'slow')
+        assert not hasattr(optimizer.toolbox, 'period')
+        assert set(result['best_params']) == {'fast', 'slow'}
+        assert result['best_fitness'] == pytest.approx(spread(result['best_params']))
+
+class TestHistory:
+    """Per-generation history of a run"""
+    
+    @pytest.mark.parametrize("use_deap", [True, False], ids=['deap', 'simple'])
+    def test_history_covers_generations_run(self, monkeypatch, use_deap):
+        """One entry per generation actually run, with that generation's best parameters"""
+        if use_deap and not go.DEAP_AVAILABLE:
+            pytest.skip("DEAP is not installed")
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', use_deap)
+        optimizer = GeneticOptimizer(population_size=10, generations=30, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=1, patience=3, seed=5)
+        
+        result = optimizer.optimize()
+        
+        history = optimizer.history
+        assert len(history) == result['generations_run']
+        assert [entry['generation'] for entry in history] == list(range(len(history)))
+        for entry in history:
+            assert entry['best_fitness'] == pytest.approx(quadratic(entry['best_params']))
+    
+    def test_new_ranges_drop_history(self):
+        """History rows of the old gene layout are discarded with the old ranges"""
+        optimizer = GeneticOptimizer(population_size=10, generations=3, parameter_ranges=RANGES,
+                                     fitness_function=quadratic, n_workers=1)
+        optimizer.optimize()
+        
+        optimizer.set_parameter_ranges({'fast': (2, 10)})
+        
+        assert optimizer.history == []
+
+class TestCarriedFitness:
+    """Individuals whose genes did not change keep their fitness without a lookup"""
+    
+    def test_unchanged_children_are_not_rescored(self, monkeypatch):
+        """Without crossover or mutation only the first generation is scored"""
+        monkeypatch.setattr(go, 'DEAP_AVAILABLE', False)
+        fitness = counting(quadratic)
+        optimizer = GeneticOptimizer(population_size=12, generations=10, parameter_ranges=RANGES,
+                                     fitness_function=fitness, n_workers=1, seed=0,
+                                     crossover_probability=0.0, mutation_probability=0.0)
+        
+        optimizer.optimize()
+        
+        assert len(fitness.calls) == optimizer.cache_misses == 12
+        assert optimizer.cache_hits == 0
@@ -0,0 +1,173 @@
+"""
+Unit Tests for TechnicalIndicators
+Checks the array kernels against the pandas-ta indicators they replace, and the
+result cache and indicator selection of the comprehensive analysis
+"""
+import numpy as np
+import pytest
+
+ta = pytest.importorskip("pandas_ta")
+
+from src.trading.indicators import indicators as ind
+from src.trading.indicators.indicators import TechnicalIndicators
+
+def assert_matches(actual, expected):
+    """Same values and NaN warm-up, within the precision of float32 prices"""
+    np.testing.assert_allclose(np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64),
+                               rtol=1e-4, atol=1e-3)
+
+class TestKernels:
+    """RSI, MACD and EMA kernels give pandas-ta's values"""
+    
+    @pytest.mark.parametrize("period", [7, 14])
+    def test_rsi_matches_pandas_ta(self, bot_config, ohlcv, period):
+        """RMA-smoothed RSI, NaN for the first period bars like ta.rsi"""
+        df = ohlcv(300, 3)
+        
+        rsi = TechnicalIndicators(bot_config).calculate_rsi(df, period).value
+        
+        assert_matches(rsi, ta.rsi(df['close'], length=period))
+    
+    def test_macd_matches_pandas_ta(self, bot_config, ohlcv):
+        """MACD, histogram and signal columns equal ta.macd past the warm-up"""
+        df = ohlcv(300, 3)
+        
+        macd = TechnicalIndicators(bot_config).calculate_macd(df).value
+        expected = ta.macd(df['close'], fast=12, slow=26, signal=9)
+        
+        for column in expected.columns:
+            assert_matches(macd[column].iloc[40:], expected[column].iloc[40:])
+    
+    def test_ema_matches_pandas_ta(self, bot_config, ohlcv):
+        """Each EMA's latest value equals the SMA-seeded ta.ema"""
+        df = ohlcv(300, 3)
+        
+        emas = TechnicalIndicators(bot_config).calculate_ema(df, [20, 50])
+        
+        for period in (20, 50):
+            expected = ta.ema(df['close'], length=period).iloc[-1]
+            assert emas[f'EMA_{period}'].metadata['current_value'] == pytest.approx(expected, rel=1e-5)
+
+class TestTrendStrength:
+    """The fused ATR/ADX kernel smooths like pandas-ta's rma"""
+    
+    def test_atr_matches_pandas_ta(self, bot_config, ohlcv):
+        """ATR series equals ta.atr, including its warm-up"""
+        df = ohlcv(300, 3)
+        
+        atr = TechnicalIndicators(bot_config).calculate_atr(df, 14).value
+        
+        assert_matches(atr, ta.atr(df['high'], df['low'], df['close'], length=14))
+    
+    def test_adx_matches_pandas_ta(self, bot_config, ohlcv):
+        """ADX, +DI and -DI columns equal ta.adx, including their warm-ups"""
+        df = ohlcv(300, 3)
+        
+        adx = TechnicalIndicators(bot_config).calculate_adx(df, 14).value
+        expected = ta.adx(df['high'], df['low'], df['close'], length=14)
+        
+        for column in expected.columns:
+            assert_matches(adx[column], expected[column])
+
+class TestBands:
+    """Bollinger Bands signal from the latest window, with the band DataFrame built on demand"""
+    
+    def test_value_is_band_frame(self, bot_config, ohlcv):
+        """The value is ta.bbands' DataFrame, the metadata's middle band its last SMA"""
+        df = ohlcv(300, 4)
+        
+        bb = TechnicalIndicators(bot_config).calculate_bollinger_bands(df, 20, 2.0)
+        expected = ta.bbands(df['close'], length=20, std=2.0)
+        
+        assert list(bb.value.columns) == list(expected.columns)
+        assert_matches(bb.value, expected)
+        assert bb.metadata['middle_band'] == pytest.approx(expected.iloc[-1, 1], rel=1e-5)
+
+class TestStochastic:
+    """Stochastic signal from the latest windows, with the %K/%D DataFrame built on demand"""
+    
+    def test_value_is_stoch_frame(self, bot_config, ohlcv):
+        """The value is ta.stoch's DataFrame and the metadata its last %K and %D"""
+        df = ohlcv(300, 4)
+        
+        stoch = TechnicalIndicators(bot_config).calculate_stochastic(df, 14, 3)
+        expected = ta.stoch(df['high'], df['low'], df['close'], k=14, d=3)
+        
+        assert list(stoch.value.columns) == list(expected.columns)
+        assert_matches(stoch.value, expected)
+        assert stoch.metadata['current_k'] == pytest.approx(expected.iloc[-1, 0], rel=1e-3)
+        assert stoch.metadata['current_d'] == pytest.approx(expected.iloc[-1, 1], rel=1e-3)
+
+class TestResultCache:
+    """Results are reused for unchanged data and parameters only"""
+    
+    def test_unchanged_data_reuses_result(self, bot_config, ohlcv):
+        """A second call on the same bars returns the stored result"""
+        df = ohlcv(200, 4)
+        indicators = TechnicalIndicators(bot_config)
+        
+        first = indicators.calculate_rsi(df)
+        
+        assert indicators.calculate_rsi(df.copy()) is first
+        assert indicators.calculate_rsi(df, 7) is not first
+    
+    def test_forming_bar_update_is_recomputed(self, bot_config, ohlcv):
+        """A revised last bar gets a fresh result equal to a new instance's"""
+        df = ohlcv(200, 4)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.calculate_rsi(df)
+        
+        revised = df.copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] += 3.0
+        result = indicators.calculate_rsi(revised)
+        
+        expected = TechnicalIndicators(bot_config).calculate_rsi(revised)
+        assert result.metadata['current_value'] == pytest.approx(expected.metadata['current_value'])
+    
+    def test_clear_cache(self, bot_config, ohlcv):
+        """clear_cache drops the stored results"""
+        df = ohlcv(200, 4)
+        indicators = TechnicalIndicators(bot_config)
+        first = indicators.calculate_atr(df)
+        
+        indicators.clear_cache()
+        
+        assert indicators.calculate_atr(df) is not first
+
+class TestPandasFallback:
+    """Without Numba, RSI comes from pandas ewm with the same smoothing"""
+    
+    def test_ewm_rsi_matches_pandas_ta(self, bot_config, ohlcv, monkeypatch):
+        """The ewm path gives ta.rsi, warm-up included"""
+        monkeypatch.setattr(ind, 'NUMBA_AVAILABLE', False)
+        df = ohlcv(300, 6)
+        
+        rsi = TechnicalIndicators(bot_config).calculate_rsi(df, 14).value
+        
+        assert_matches(rsi, ta.rsi(df['close'], length=14))
+    
+    def test_flat_prices(self):
+        """No moves at all read 50 past the warm-up"""
+        rsi = ind._rsi_ewm(np.full(30, 100.0), 14)
+        
+        assert np.isnan(rsi[:14]).all()
+        assert (rsi[14:] == 50.0).all()
+
+class TestRequiredIndicators:
+    """A comprehensive analysis computes only the requested indicators"""
+    
+    def test_defaults_to_composite_indicators(self, bot_config, ohlcv):
+        """Without a request, only the indicators the composite signal weighs"""
+        indicators = TechnicalIndicators(bot_config)
+        
+        analysis = indicators.get_comprehensive_analysis(ohlcv(300, 2))
+        
+        assert {'RSI', 'MACD', 'BB'} <= set(analysis) <= set(indicators._composite_names)
+        assert 'ATR' not in analysis
+    
+    def test_requested_subset(self, bot_config, ohlcv):
+        """Only the named indicators, including single EMAs and volume results"""
+        analysis = TechnicalIndicators(bot_config).get_comprehensive_analysis(
+            ohlcv(300, 2), {'ATR', 'EMA_50', 'OBV'})
+        
+        assert set(analysis) == {'ATR', 'EMA_50', 'OBV'}
@@ -0,0 +1,218 @@
+"""
+Unit Tests for the legacy indicators
+Checks the cached, fused and batched computations against pandas-ta and the
+higher-timeframe filter of DualMACD_RSI_Strategy
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+ta = pytest.importorskip("pandas_ta")
+
+from src.trading.indicators import legacy_indicators as lg
+from src.trading.indicators.legacy_indicators import (
+    DualMACD_RSI_Strategy, EMAIndicator, IndicatorFactory, MACDIndicator, RSIIndicator
+)
+
+def higher_tf_bullish(prices, fast=12, slow=26, signal=9):
+    """Trend of the whole higher timeframe history: MACD above its signal line on the last bar"""
+    macd = ta.macd(prices, fast=fast, slow=slow, signal=signal)
+    return bool(macd.iloc[-1, 0] > macd.iloc[-1, 2])
+
+class TestHigherTimeframeFilter:
+    """Counter-trend signals are dropped according to the higher timeframe"""
+    
+    @pytest.mark.parametrize("seed", range(4))
+    def test_filter_follows_trend(self, ohlcv, seed):
+        """A bullish higher timeframe keeps buys and drops sells, a bearish one the reverse"""
+        data = ohlcv(1000, 17)
+        higher_tf = ohlcv(120, seed)
+        strategy = DualMACD_RSI_Strategy()
+        
+        base = strategy.get_signal(data)['signal'].to_numpy()
+        assert (base == 1.0).any() and (base == -1.0).any()
+        result = strategy.get_signal(data, higher_tf)
+        
+        bullish = higher_tf_bullish(higher_tf['close'])
+        assert bool(result['higher_tf_bullish'].iloc[-1]) == bullish
+        expected = np.where(base == (-1.0 if bullish else 1.0), 0.0, base)
+        np.testing.assert_array_equal(result['signal'].to_numpy(), expected)
+    
+    def test_short_higher_timeframe_is_ignored(self, ohlcv):
+        """Too little higher timeframe history leaves the signals unfiltered"""
+        data = ohlcv(1000, 17)
+        strategy = DualMACD_RSI_Strategy()
+        
+        result = strategy.get_signal(data, ohlcv(20, 1))
+        
+        np.testing.assert_array_equal(result['signal'].to_numpy(), strategy.get_signal(data)['signal'].to_numpy())
+
+class TestIndicatorCache:
+    """Cached indicator arrays are keyed on the price values"""
+    
+    def test_same_sum_prices_do_not_collide(self, ohlcv):
+        """Two series with the same length and sum, differing by two swapped bars, get their own RSI"""
+        prices = ohlcv(200, 5)['close']
+        swapped = prices.copy()
+        swapped.iloc[[50, 51]] = prices.iloc[[51, 50]].to_numpy()
+        assert swapped.sum() == pytest.approx(prices.sum())
+        
+        rsi = lg._rsi(prices, 14).to_numpy()
+        rsi_swapped = lg._rsi(swapped, 14).to_numpy()
+        
+        np.testing.assert_allclose(rsi_swapped, ta.rsi(swapped, length=14).to_numpy())
+        assert not np.allclose(rsi[60:], rsi_swapped[60:])
+    
+    def test_same_bars_share_arrays(self, ohlcv):
+        """A fresh frame with the same bars reuses the stored, read-only array"""
+        calls = []
+        def compute(values):
+            calls.append(values.size)
+            return values * 2
+        
+        first = lg._cached(('test_double',), ohlcv(100, 5)['close'], compute)
+        second = lg._cached(('test_double',), ohlcv(100, 5)['close'], compute)
+        
+        assert second is first
+        assert calls == [100]
+        assert not first.flags.writeable
+    
+    @pytest.mark.parametrize("indicator", [EMAIndicator(20), RSIIndicator(14)], ids=['ema', 'rsi'])
+    def test_calculate_result_is_writable(self, ohlcv, indicator):
+        """Editing a calculate() result in place leaves the cached values of later calls alone"""
+        prices = ohlcv(200, 6)['close']
+        
+        first = indicator.calculate(prices)
+        expected = first.to_numpy().copy()
+        first.iloc[-1] = -1.0
+        first.fillna(0.0, inplace=True)
+        
+        np.testing.assert_array_equal(indicator.calculate(prices).to_numpy(), expected)
+
+class TestReadOnlyParameters:
+    """Parameters cannot be reassigned after construction, so derived state and cache keys stay in step"""
+    
+    @pytest.mark.parametrize("indicator, attr", [
+        (RSIIndicator(), 'oversold'),
+        (RSIIndicator(), 'overbought'),
+        (MACDIndicator(), 'slow_period'),
+        (DualMACD_RSI_Strategy(), 'rsi_period'),
+    ])
+    def test_assignment_raises(self, indicator, attr):
+        """Assigning a parameter fails instead of being silently ignored"""
+        with pytest.raises(AttributeError):
+            setattr(indicator, attr, 5)
+    
+    def test_other_periods_do_not_share_cache(self, ohlcv):
+        """An RSI-5 strategy does not hand its arrays to a default RSI-14 one"""
+        prices = ohlcv(300, 9)['close']
+        
+        DualMACD_RSI_Strategy(rsi_period=5).calculate(prices)
+        result = DualMACD_RSI_Strategy().calculate(prices)
+        
+        np.testing.assert_allclose(result['rsi'], ta.rsi(prices, length=14), rtol=1e-9)
+    
+    def test_shared_factory_instance_is_immutable(self):
+        """Callers get the same cached instance, and none of them can change it for the others"""
+        first = IndicatorFactory.get_indicator('rsi', period=14, oversold=30)
+        second = IndicatorFactory.get_indicator('rsi', oversold=30, period=14)
+        assert second is first
+        
+        for attr in ('name', 'period', 'oversold', 'overbought'):
+            with pytest.raises(AttributeError):
+                setattr(first, attr, 5)
+        assert first.oversold == 30
+
+class TestFusedKernel:
+    """The fused MACD/RSI pass gives the same columns as pandas-ta"""
+    
+    @pytest.fixture(params=[True, False], ids=['numba', 'pandas_ta'])
+    def numba_path(self, request, monkeypatch):
+        """Run through the fused kernel and through the separate pandas-ta indicators"""
+        if request.param and not lg.NUMBA_AVAILABLE:
+            pytest.skip("numba is not installed")
+        monkeypatch.setattr(lg, 'NUMBA_AVAILABLE', request.param)
+    
+    def test_matches_pandas_ta(self, numba_path, ohlcv):
+        """RSI, MACD, signal line and histogram equal ta.rsi and ta.macd"""
+        prices = ohlcv(300, 8)['close']
+        
+        result = DualMACD_RSI_Strategy(rsi_period=10, fast_period=8, slow_period=21, signal_period=5).calculate(prices)
+        macd = ta.macd(prices, fast=8, slow=21, signal=5)
+        
+        np.testing.assert_allclose(result['rsi'], ta.rsi(prices, length=10), rtol=1e-9)
+        np.testing.assert_allclose(result['macd'], macd.iloc[:, 0], rtol=1e-9)
+        np.testing.assert_allclose(result['signal_line'], macd.iloc[:, 2], rtol=1e-9)
+        np.testing.assert_allclose(result['histogram'], macd.iloc[:, 1], rtol=1e-9, atol=1e-12)
+
+class TestEmaConvolution:
+    """Short EMAs as one convolution equal pandas-ta's recurrence"""
+    
+    @pytest.mark.parametrize("length", [5, 20, 50])
+    def test_matches_pandas_ta(self, ohlcv, length):
+        """Same SMA seed, warm-up and values as ta.ema"""
+        prices = ohlcv(300, 2)['close']
+        
+        ema = lg._ema_convolve(prices.to_numpy(), length)
+        
+        np.testing.assert_allclose(ema, ta.ema(prices, length=length).to_numpy(), rtol=1e-9)
+    
+    def test_too_short(self):
+        """Fewer bars than the period are all NaN"""
+        assert np.isnan(lg._ema_convolve(np.arange(4.0), 5)).all()
+
+class TestBatch:
+    """Parameter sweeps give the same arrays as one indicator per parameter set"""
+    
+    def test_ema_batch_matches_calculate(self, ohlcv):
+        """Each period's row, for 1-D and per row of 2-D prices"""
+        prices = np.vstack([ohlcv(200, seed)['close'].to_numpy() for seed in (1, 2)])
+        periods = [5, 12, 30]
+        
+        batch = EMAIndicator().calculate_batch(prices, periods)
+        single = EMAIndicator().calculate_batch(prices[1], periods)
+        
+        assert batch.shape == (2, 3, 200)
+        np.testing.assert_allclose(single, batch[1])
+        for row, series in enumerate(prices):
+            for j, period in enumerate(periods):
+                expected = EMAIndicator(period).calculate(pd.Series(series)).to_numpy()
+                np.testing.assert_allclose(batch[row, j], expected, rtol=1e-9)
+    
+    def test_macd_batch_matches_calculate(self, ohlcv):
+        """Each (fast, slow) pair equals a MACDIndicator with those periods"""
+        prices = ohlcv(200, 3)['close']
+        pairs = [(8, 21), (12, 26), (12, 30)]
+        
+        batch = MACDIndicator(signal_period=9).calculate_batch(
+            prices.to_numpy(), [fast for fast, _ in pairs], [slow for _, slow in pairs])
+        
+        for i, (fast, slow) in enumerate(pairs):
+            expected = MACDIndicator(fast, slow, 9).calculate(prices)
+            for column in ('macd', 'signal_line', 'histogram'):
+                np.testing.assert_allclose(batch[column][i], expected[column].to_numpy(), rtol=1e-9, atol=1e-12)
+
+class TestHigherTimeframeTail:
+    """The trend from a bounded tail of a long higher timeframe equals the full history's"""
+    
+    @pytest.mark.parametrize("seed", range(8))
+    def test_tail_trend_matches_full_history(self, ohlcv, seed):
+        """Same bullish flag as MACD over every higher timeframe bar"""
+        data = ohlcv(200, 21)
+        higher_tf = ohlcv(3000, seed)
+        strategy = DualMACD_RSI_Strategy()
+        
+        result = strategy.get_signal(data, higher_tf)
+        
+        assert bool(result['higher_tf_bullish'].iloc[-1]) == higher_tf_bullish(higher_tf['close'])
+    
+    @pytest.mark.parametrize("seed", range(8))
+    def test_tail_histogram_matches_full_history(self, ohlcv, seed):
+        """The tail's last MACD histogram is within 1e-3 of the full history's, so only such close crossovers can flip"""
+        prices = ohlcv(3000, seed)['close']
+        lookback = DualMACD_RSI_Strategy()._trend_lookback
+        
+        _, _, full = lg._macd(prices, 12, 26, 9)
+        _, _, tail = lg._macd(prices.iloc[-lookback:], 12, 26, 9)
+        
+        assert abs(tail[-1] - full[-1]) < 1e-3
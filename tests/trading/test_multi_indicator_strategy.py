@@ -0,0 +1,330 @@
+"""
+Unit Tests for MultiIndicatorStrategy
+Checks the vectorized backtest and the live incremental signals against the
+per-bar recomputation they replace
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pandas_ta")
+
+from src.trading.strategies import multi_indicator_strategy as mis
+from src.trading.strategies.multi_indicator_strategy import MultiIndicatorStrategy
+
+def reference_backtest(strategy, df, initial_balance=10000, risk_percent=2.0):
+    """The original backtest: regenerate the signal from df.iloc[:i+1] on every flat bar"""
+    atr_arr = np.asarray(strategy.calculate_indicators(df)['atr'], dtype=np.float64)
+    balance = initial_balance
+    position = 0
+    trades = []
+    
+    for i in range(50, len(df)):
+        if position == 1:
+            if df['low'].iloc[i] <= stop_loss:
+                exit_price, exit_type = stop_loss, 'stop_loss'
+            elif df['high'].iloc[i] >= take_profit:
+                exit_price, exit_type = take_profit, 'take_profit'
+            else:
+                exit_type = None
+            if exit_type:
+                profit_loss = (exit_price / entry_price - 1) * position_value
+                balance += position_value + profit_loss
+                trades.append((entry_date, df.index[i], entry_price, exit_price, profit_loss, exit_type))
+                position = 0
+        
+        if position == 0 and strategy.generate_signal(df.iloc[:i + 1]) == 'BUY':
+            entry_price = df['close'].iloc[i]
+            entry_date = df.index[i]
+            stop_loss = entry_price - atr_arr[i] * 1.5
+            take_profit = entry_price + atr_arr[i] * 1.5 * 2.0
+            position_value = strategy.calculate_position_size(balance, risk_percent, entry_price, stop_loss)
+            balance -= position_value
+            position = 1
+    
+    if position == 1:
+        exit_price = df['close'].iloc[-1]
+        profit_loss = (exit_price / entry_price - 1) * position_value
+        balance += position_value + profit_loss
+        trades.append((entry_date, df.index[-1], entry_price, exit_price, profit_loss, 'end_of_data'))
+    
+    return balance, trades
+
+class TestBacktest:
+    """The single-pass backtest must trade exactly like the per-bar slice loop"""
+    
+    @pytest.mark.parametrize("seed", [3, 9, 14])
+    @pytest.mark.parametrize("params", [{}, {'rsi_period': 7, 'macd_fast': 8, 'atr_period': 10}])
+    def test_trades_match_slice_loop(self, ohlcv, seed, params):
+        """Same entries, exits and balance as regenerating the signal on every bar"""
+        df = ohlcv(400, seed)
+        strategy = MultiIndicatorStrategy(**params)
+        
+        balance, expected = reference_backtest(MultiIndicatorStrategy(**params), df, risk_percent=3)
+        result = strategy.backtest(df, risk_percent=3)
+        
+        assert result['num_trades'] == len(expected)
+        for trade, (entry_date, exit_date, entry_price, exit_price, profit_loss, exit_type) in zip(result['trades'], expected):
+            assert trade['entry_date'] == entry_date
+            assert trade['exit_date'] == exit_date
+            assert trade['exit_type'] == exit_type
+            assert trade['entry_price'] == pytest.approx(entry_price, rel=1e-12)
+            assert trade['exit_price'] == pytest.approx(exit_price, rel=1e-12)
+            assert trade['profit_loss'] == pytest.approx(profit_loss, rel=1e-9, abs=1e-9)
+        assert result['final_balance'] == pytest.approx(balance, rel=1e-12)
+    
+    def test_short_history(self, ohlcv):
+        """Fewer than 50 bars backtest to the initial balance without trades"""
+        result = MultiIndicatorStrategy().backtest(ohlcv(40), initial_balance=5000)
+        
+        assert result['final_balance'] == 5000
+        assert result['trades'] == []
+
+class TestBacktestMany:
+    """Backtesting several symbols at once gives each symbol's own backtest"""
+    
+    def test_matches_backtest_per_symbol(self, ohlcv):
+        """Same trades and metrics as backtest() for symbols of different lengths, one too short to trade"""
+        strategy = MultiIndicatorStrategy()
+        dfs = [ohlcv(400, 3), ohlcv(40, 5), ohlcv(250, 9), ohlcv(120, 14)]
+        
+        results = mis.backtest_many(strategy, dfs, initial_balance=5000, risk_percent=3)
+        
+        assert len(results) == len(dfs)
+        for df, result in zip(dfs, results):
+            expected = MultiIndicatorStrategy().backtest(df, initial_balance=5000, risk_percent=3)
+            assert result.keys() == expected.keys()
+            for key, value in expected.items():
+                if key == 'trades':
+                    continue
+                assert result[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+            assert len(result['trades']) == len(expected['trades'])
+            for trade, expected_trade in zip(result['trades'], expected['trades']):
+                assert trade['entry_date'] == expected_trade['entry_date']
+                assert trade['exit_date'] == expected_trade['exit_date']
+                assert trade['exit_type'] == expected_trade['exit_type']
+                assert trade['profit_loss'] == pytest.approx(expected_trade['profit_loss'], rel=1e-9, abs=1e-9)
+        assert results[1]['final_balance'] == 5000 and results[1]['trades'] == []
+    
+    def test_no_symbols(self):
+        """An empty batch has no results"""
+        assert mis.backtest_many(MultiIndicatorStrategy(), []) == []
+
+@pytest.fixture(params=[True, False], ids=['numba', 'numpy'])
+def numba_path(request, monkeypatch):
+    """Run a test through the compiled kernels and through the NumPy fallbacks"""
+    if request.param and not mis.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(mis, 'NUMBA_AVAILABLE', request.param)
+    return request.param
+
+class TestMovingAverages:
+    """The moving-average kernels give pandas' ewm and rolling means"""
+    
+    @pytest.mark.parametrize("span", [5, 26])
+    def test_ewm_mean(self, numba_path, ohlcv, span):
+        """Matches pandas' ewm(span=span).mean(), which the strategy used"""
+        close = ohlcv(200, 4)['close']
+        
+        ema = mis._ewm_mean(close.to_numpy(), span)
+        
+        np.testing.assert_allclose(ema, close.ewm(span=span).mean().to_numpy(), rtol=1e-5)
+    
+    @pytest.mark.parametrize("window", [1, 14])
+    def test_rolling_mean(self, numba_path, ohlcv, window):
+        """Matches pandas' rolling mean, NaN until the window fills"""
+        volume = ohlcv(200, 4)['volume']
+        
+        mean = mis._rolling_mean(volume.to_numpy(), window)
+        
+        np.testing.assert_allclose(mean, volume.rolling(window).mean().to_numpy(), rtol=1e-5)
+
+class TestIndicatorMemo:
+    """Indicators are reused only for the very same bars"""
+    
+    def assert_same_indicators(self, indicators, expected):
+        for name, values in expected.items():
+            np.testing.assert_allclose(np.asarray(indicators[name], dtype=np.float64),
+                                       np.asarray(values, dtype=np.float64), rtol=1e-6, err_msg=name)
+    
+    @pytest.mark.parametrize("column", ['high', 'low', 'volume'])
+    def test_revised_bar_is_recomputed(self, ohlcv, column):
+        """A forming bar revised in a column other than close gets fresh indicators"""
+        df = ohlcv(200, 6)
+        strategy = MultiIndicatorStrategy()
+        strategy.calculate_indicators(df)
+        
+        revised = df.copy()
+        revised.iloc[-1, revised.columns.get_loc(column)] *= 1.5
+        
+        self.assert_same_indicators(strategy.calculate_indicators(revised),
+                                    MultiIndicatorStrategy().calculate_indicators(revised))
+    
+    def test_returned_indicators_can_be_edited(self, ohlcv):
+        """Editing a returned indicator in place works and does not change later results"""
+        df = ohlcv(200, 6)
+        strategy = MultiIndicatorStrategy()
+        
+        indicators = strategy.calculate_indicators(df)
+        indicators['rsi'].iloc[-1] = 0.0
+        indicators['rsi'].fillna(50, inplace=True)
+        assert indicators['rsi'].iloc[-1] == 0.0
+        
+        self.assert_same_indicators(strategy.calculate_indicators(df),
+                                    MultiIndicatorStrategy().calculate_indicators(df))
+
+def wilder_rsi(close, period):
+    """RSI straight from Wilder's definition, one bar at a time"""
+    delta = np.diff(close)
+    gains, losses = np.maximum(delta, 0), np.maximum(-delta, 0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    out = np.full(len(close), np.nan)
+    for i in range(period, len(close)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        if avg_gain + avg_loss == 0:
+            out[i] = 50.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss) if avg_loss > 0 else 100.0
+    return out
+
+class TestRSI:
+    """RSI uses Wilder smoothing seeded with the mean of the first period changes"""
+    
+    @pytest.mark.parametrize("period", [7, 14])
+    def test_matches_wilder_definition(self, numba_path, ohlcv, period):
+        """Matches a bar-by-bar Wilder RSI, including the NaN warm-up"""
+        close = ohlcv(300, 1)['close'].to_numpy()
+        
+        rsi = mis._rsi_wilder(close, period)
+        expected = wilder_rsi(close, period)
+        
+        assert np.isnan(rsi[:period]).all()
+        np.testing.assert_allclose(rsi[period:], expected[period:], rtol=1e-10)
+    
+    def test_differs_from_simple_average(self, ohlcv):
+        """Wilder smoothing replaced the old rolling mean of gains and losses"""
+        close = pd.Series(ohlcv(300, 2)['close'].to_numpy())
+        delta = close.diff()
+        gain = delta.clip(lower=0).rolling(14).mean()
+        loss = (-delta).clip(lower=0).rolling(14).mean()
+        simple = (100 - 100 / (1 + gain / loss)).to_numpy()
+        
+        rsi = mis._rsi_wilder(close.to_numpy(), 14)
+        
+        assert np.nanmax(np.abs(rsi[30:] - simple[30:])) > 1.0
+    
+    def test_edge_cases(self, numba_path):
+        """Flat prices read 50 and only-rising prices 100, without division warnings"""
+        flat = np.full(40, 100.0)
+        rising = np.arange(40, dtype=np.float64)
+        
+        with np.errstate(all='raise'):
+            assert (mis._rsi_wilder(flat, 14)[14:] == 50.0).all()
+            assert (mis._rsi_wilder(rising, 14)[14:] == 100.0).all()
+    
+    def test_strategy_uses_wilder_rsi(self, ohlcv):
+        """The strategy's RSI indicator is the Wilder RSI, within the float32 storage precision"""
+        df = ohlcv(300, 4)
+        
+        rsi = MultiIndicatorStrategy(rsi_period=14).calculate_indicators(df)['rsi'].to_numpy()
+        expected = wilder_rsi(df['close'].to_numpy(), 14)
+        
+        np.testing.assert_allclose(rsi[14:], expected[14:], rtol=1e-5)
+
+def live_bar(df, i, **changes):
+    """Bar i of df as a live feed message, with optional replaced fields"""
+    row = df.iloc[i]
+    bar = {'open': row['open'], 'high': row['high'], 'low': row['low'],
+           'close': row['close'], 'volume': row['volume'], 'timestamp': df.index[i]}
+    bar.update(changes)
+    return bar
+
+def assert_same_details(live, expected):
+    """Same signal and, within the float32 precision, the same indicator details"""
+    assert live['signal'] == expected['signal']
+    assert live['timestamp'] == expected['timestamp']
+    for key in ('rsi', 'macd', 'atr', 'volume_ratio', 'stop_loss'):
+        assert live[key] == pytest.approx(expected[key], rel=1e-4, abs=1e-4), key
+
+class TestLiveSignals:
+    """Incremental live signals must agree with a full recompute on every bar"""
+    
+    def test_live_matches_full_recompute(self, ohlcv):
+        """Streaming bars one at a time gives the same signal and indicators as get_signal_with_details"""
+        df = ohlcv(450, 5)
+        strategy = MultiIndicatorStrategy()
+        strategy.get_signal_with_details(df.iloc[:300])
+        
+        for i in range(300, len(df)):
+            live = strategy.get_signal_with_details_live(live_bar(df, i))
+            expected = MultiIndicatorStrategy().get_signal_with_details(df.iloc[:i + 1])
+            
+            assert_same_details(live, expected)
+    
+    def test_live_seeds_lazily(self, ohlcv):
+        """A full analysis does not build the live state until a live bar arrives"""
+        df = ohlcv(200)
+        strategy = MultiIndicatorStrategy()
+        strategy.get_signal_with_details(df.iloc[:-1])
+        
+        assert strategy._live is None
+        
+        strategy.get_signal_with_details_live(live_bar(df, -1))
+        
+        assert strategy._live is not None
+        assert strategy._live.n_bars == len(df)
+    
+    def test_live_without_history(self):
+        """A live bar with nothing to seed from holds"""
+        result = MultiIndicatorStrategy().get_signal_with_details_live(
+            {'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0})
+        
+        assert result['signal'] == 'HOLD'
+    
+    def test_resent_bar_is_not_counted_twice(self, ohlcv):
+        """The same bar sent again gives the same details and leaves the state one bar on"""
+        df = ohlcv(340, 5)
+        strategy = MultiIndicatorStrategy()
+        strategy.get_signal_with_details(df.iloc[:300])
+        for i in range(300, 320):
+            strategy.get_signal_with_details_live(live_bar(df, i))
+        
+        live = strategy.get_signal_with_details_live(live_bar(df, 319))
+        
+        assert_same_details(live, MultiIndicatorStrategy().get_signal_with_details(df.iloc[:320]))
+        assert strategy._live.n_bars == 320
+        nxt = strategy.get_signal_with_details_live(live_bar(df, 320))
+        assert_same_details(nxt, MultiIndicatorStrategy().get_signal_with_details(df.iloc[:321]))
+    
+    def test_revised_bar_replaces_the_last(self, ohlcv):
+        """A bar revised under the last timestamp gives the details of the revised history"""
+        df = ohlcv(340, 5)
+        strategy = MultiIndicatorStrategy()
+        strategy.get_signal_with_details(df.iloc[:300])
+        for i in range(300, 320):
+            strategy.get_signal_with_details_live(live_bar(df, i))
+        
+        revised = df.iloc[:320].copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] += 2.0
+        revised.iloc[-1, revised.columns.get_loc('high')] += 3.0
+        revised.iloc[-1, revised.columns.get_loc('volume')] *= 2.0
+        live = strategy.get_signal_with_details_live(live_bar(revised, -1))
+        
+        assert_same_details(live, MultiIndicatorStrategy().get_signal_with_details(revised))
+    
+    def test_out_of_order_bar_is_dropped(self, ohlcv):
+        """A bar older than the last one holds and does not move the indicators"""
+        df = ohlcv(340, 5)
+        strategy = MultiIndicatorStrategy()
+        strategy.get_signal_with_details(df.iloc[:300])
+        for i in range(300, 320):
+            strategy.get_signal_with_details_live(live_bar(df, i))
+        
+        stale = strategy.get_signal_with_details_live(live_bar(df, 310))
+        
+        assert stale['signal'] == 'HOLD'
+        assert strategy._live.n_bars == 320
+        nxt = strategy.get_signal_with_details_live(live_bar(df, 320))
+        assert_same_details(nxt, MultiIndicatorStrategy().get_signal_with_details(df.iloc[:321]))
@@ -0,0 +1,125 @@
+"""
+Unit Tests for the streaming path of TechnicalIndicators
+Checks that bars appended one at a time give the same analysis as a full
+recompute, and that data which does not continue the last analysis is
+recomputed in full
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("pandas_ta")
+
+from src.trading.indicators.indicators import TechnicalIndicators
+
+def assert_same_analysis(analysis, expected):
+    """Same indicators and signals, and numeric metadata within the float32 precision"""
+    assert analysis.keys() == expected.keys()
+    for name, result in expected.items():
+        assert analysis[name].signal == result.signal, name
+        for key, value in (result.metadata or {}).items():
+            if isinstance(value, (float, np.floating)) and np.isfinite(value):
+                assert float(analysis[name].metadata[key]) == pytest.approx(float(value), rel=1e-4, abs=1e-4), (name, key)
+
+class TestStreamingAnalysis:
+    """Incremental analysis of appended bars"""
+    
+    def test_appended_bars_match_full_recompute(self, bot_config, ohlcv):
+        """Each frame one bar longer than the last is streamed, with the full analysis' results"""
+        df = ohlcv(500, 7)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400])
+        
+        # Seeded only when the first continuing frame arrives
+        assert indicators._stream is None
+        
+        for i in range(401, len(df) + 1):
+            analysis = indicators.get_comprehensive_analysis(df.iloc[:i], incremental=True)
+            expected = TechnicalIndicators(bot_config).get_comprehensive_analysis(df.iloc[:i])
+            assert_same_analysis(analysis, expected)
+        
+        assert indicators._stream is not None
+    
+    def test_other_series_is_recomputed(self, bot_config, ohlcv):
+        """A different symbol on the same timestamps does not advance the streaming state"""
+        df = ohlcv(450, 7)
+        other = ohlcv(450, 8)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400])
+        indicators.get_comprehensive_analysis(df.iloc[:401], incremental=True)
+        
+        analysis = indicators.get_comprehensive_analysis(other.iloc[:402], incremental=True)
+        expected = TechnicalIndicators(bot_config).get_comprehensive_analysis(other.iloc[:402])
+        
+        assert_same_analysis(analysis, expected)
+        assert indicators._stream is None
+    
+    def test_revised_bar_is_recomputed(self, bot_config, ohlcv):
+        """A revised previous bar forces a full analysis instead of a stale incremental one"""
+        df = ohlcv(450, 7)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400])
+        indicators.get_comprehensive_analysis(df.iloc[:401], incremental=True)
+        
+        revised = df.iloc[:402].copy()
+        revised.iloc[-2, revised.columns.get_loc('high')] += 5.0
+        analysis = indicators.get_comprehensive_analysis(revised, incremental=True)
+        expected = TechnicalIndicators(bot_config).get_comprehensive_analysis(revised)
+        
+        assert_same_analysis(analysis, expected)
+    
+    def test_update_matches_full_recompute(self, bot_config, ohlcv):
+        """update() with each new bar gives the signals of a full analysis through that bar"""
+        df = ohlcv(480, 11)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400])
+        
+        for i in range(400, len(df)):
+            row = df.iloc[i]
+            analysis = indicators.update(row['open'], row['high'], row['low'], row['close'],
+                                         row['volume'], timestamp=df.index[i])
+            expected = TechnicalIndicators(bot_config).get_comprehensive_analysis(df.iloc[:i + 1])
+            for name, result in expected.items():
+                assert analysis[name].signal == result.signal, (i, name)
+    
+    def test_full_recompute_by_default(self, bot_config, ohlcv):
+        """Without incremental, a continuing frame gets series values like any other"""
+        df = ohlcv(420, 7)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400])
+        
+        analysis = indicators.get_comprehensive_analysis(df.iloc[:401])
+        
+        assert indicators._stream is None
+        assert len(analysis['RSI'].value) == 401
+        assert_same_analysis(analysis, TechnicalIndicators(bot_config).get_comprehensive_analysis(df.iloc[:401]))
+    
+    def test_update_without_history(self, bot_config):
+        """update() before any full analysis has nothing to advance"""
+        assert TechnicalIndicators(bot_config).update(1.0, 1.0, 1.0, 1.0, 1.0) == {}
+
+class TestStreamingRequired:
+    """Streamed analyses honour the requested indicators"""
+    
+    ALL_INDICATORS = {'RSI', 'MACD', 'BB', 'ATR', 'STOCH', 'ADX', 'EMA_20', 'EMA_50', 'EMA_200', 'VOLUME', 'OBV'}
+    
+    def test_all_indicators_stream(self, bot_config, ohlcv):
+        """Every indicator, not just the composite ones, streams to the full analysis' results"""
+        df = ohlcv(440, 9)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400], self.ALL_INDICATORS)
+        
+        for i in range(401, len(df) + 1):
+            analysis = indicators.get_comprehensive_analysis(df.iloc[:i], self.ALL_INDICATORS, incremental=True)
+            expected = TechnicalIndicators(bot_config).get_comprehensive_analysis(df.iloc[:i], self.ALL_INDICATORS)
+            assert_same_analysis(analysis, expected)
+    
+    def test_subset_streams(self, bot_config, ohlcv):
+        """A streamed bar returns only the requested indicators"""
+        df = ohlcv(420, 9)
+        indicators = TechnicalIndicators(bot_config)
+        indicators.get_comprehensive_analysis(df.iloc[:400], {'RSI', 'ATR'})
+        
+        analysis = indicators.get_comprehensive_analysis(df.iloc[:401], {'RSI', 'ATR'}, incremental=True)
+        
+        assert set(analysis) == {'RSI', 'ATR'}
+        assert indicators._stream is not None